@@ -18,6 +18,7 @@ Lightweight SOAP Python client providing a Web Service proxy.
 
 """
 
+import os
 import sys
 
 
@@ -69,6 +70,13 @@ class WebFault(Exception):
 # Logging
 #
 
+# Debug logging done for each XML node or schema type in hot code paths, i.e.
+# schema type resolution, marshalling & unmarshalling, may be removed by
+# setting the SUDS_DEBUG_LOGGING environment variable to '0' before importing
+# suds. This avoids the logging call & argument construction overhead, even
+# when debug logging is not enabled.
+DEBUG_LOGGING = os.environ.get("SUDS_DEBUG_LOGGING", "1") != "0"
+
 class Repr:
     def __init__(self, x):
         self.x = x
@@ -22,17 +22,21 @@ from suds import *
 from suds.sax import Namespace
 from suds.sax.document import Document
 from suds.sax.element import Element
-from suds.sudsobject import Factory
 from suds.mx import Content
 from suds.mx.literal import Literal as MxLiteral
+from suds.umx.columnar import Columnar
+from suds.umx.core import projection
+from suds.umx.lazy import LazyTyped
 from suds.umx.typed import Typed as UmxTyped
+import suds.umx.model
 from suds.bindings.multiref import MultiRef
 from suds.xsd.query import TypeQuery, ElementQuery
 from suds.xsd.sxbasic import Element as SchemaElement
 from suds.options import Options
 from suds.plugin import PluginContainer
+import suds.metrics as metrics
 
-from copy import deepcopy
+from copy import copy, deepcopy
 
 
 envns = ("SOAP-ENV", "http://schemas.xmlsoap.org/soap/envelope/")
@@ -50,9 +54,21 @@ class Binding(object):
     @type schema: L{xsd.schema.Schema}
     @ivar options: A dictionary options.
     @type options: L{Options}
+    @ivar snapshot: The options snapshot used instead of the WSDL's options,
+        if any.
+    @type snapshot: L{suds.properties.Snapshot}
+    @ivar measurement: The measurement of the web service operation
+        invocation being processed, if it is being measured.
+    @type measurement: L{suds.metrics.Measurement}
+    @ivar engines: Marshallers & unmarshallers shared by all the messages
+        processed using this binding and its L{using()} copies.
+    @type engines: L{Engines}
 
     """
 
+    snapshot = None
+    measurement = None
+
     def __init__(self, wsdl):
         """
         @param wsdl: A WSDL.
@@ -60,23 +76,78 @@ class Binding(object):
 
         """
         self.wsdl = wsdl
-        self.multiref = MultiRef()
+        self.engines = Engines()
 
     def schema(self):
         return self.wsdl.schema
 
     def options(self):
+        if self.snapshot is not None:
+            return self.snapshot
         return self.wsdl.options
 
+    def using(self, options, measurement=None):
+        """
+        Get a copy of this binding for processing a single web service
+        operation invocation using the given options.
+
+        @param options: The invocation's options snapshot.
+        @type options: L{suds.properties.Snapshot}
+        @param measurement: The invocation's measurement, if it is being
+            measured.
+        @type measurement: L{suds.metrics.Measurement}
+        @return: The binding copy.
+        @rtype: L{Binding}
+
+        """
+        binding = copy(self)
+        binding.snapshot = options
+        binding.measurement = measurement
+        return binding
+
     def unmarshaller(self):
         """
         Get the appropriate schema based XML decoder.
 
-        @return: Typed unmarshaller.
+        @return: Typed unmarshaller, a lazy one for the I{lazy} reply model.
         @rtype: L{UmxTyped}
 
         """
-        return UmxTyped(self.schema())
+        if self.options().reply_model == "lazy":
+            return self.engine(LazyTyped, self.model())
+        return self.engine(UmxTyped, self.model())
+
+    def engine(self, cls, *args):
+        """
+        Get a shared marshaller or unmarshaller, constructing it on first
+        use.
+
+        Marshallers & unmarshallers are reentrant and keep no per message
+        state of their own, so a single instance is reused for all messages
+        processed using the same schema and construction parameters.
+
+        @param cls: The marshaller or unmarshaller class.
+        @type cls: class
+        @param args: Construction parameters following the schema.
+        @type args: tuple
+        @return: The marshaller or unmarshaller.
+
+        """
+        key = (cls,) + args
+        engine = self.engines.get(key)
+        if engine is None:
+            engine = self.engines.setdefault(key, cls(self.schema(), *args))
+        return engine
+
+    def model(self):
+        """
+        Get the reply model selected using the I{reply_model} option.
+
+        @return: The reply model.
+        @rtype: L{suds.umx.model.ObjectModel}
+
+        """
+        return suds.umx.model.get(self.options().reply_model)
 
     def marshaller(self):
         """
@@ -86,7 +157,7 @@ class Binding(object):
         @rtype: L{MxLiteral}
 
         """
-        return MxLiteral(self.schema(), self.options().xstq)
+        return self.engine(MxLiteral, self.options().xstq)
 
     def param_defs(self, method):
         """
@@ -118,6 +189,9 @@ class Binding(object):
         @rtype: L{Document}
 
         """
+        codec = self.options().codecs.get(method.name)
+        if codec is not None:
+            args, kwargs = codec.marshal(self.schema(), args, kwargs)
         content = self.headercontent(method)
         header = self.header(content)
         content = self.bodycontent(method, args, kwargs)
@@ -130,16 +204,22 @@ class Binding(object):
             env.refitPrefixes()
         return Document(env)
 
-    def get_reply(self, method, replyroot):
+    def get_reply(self, method, replyroot, fields=None):
         """
         Process the I{reply} for the specified I{method} by unmarshalling it
         into into Python object(s).
 
+        Only the reply content selected by the field projection gets
+        unmarshalled. The projection defaults to the one configured for the
+        method using the I{projections} option.
+
         @param method: The name of the invoked method.
         @type method: str
         @param replyroot: The reply XML root node received after invoking the
             specified method.
         @type replyroot: L{Element}
+        @param fields: Dotted field paths to unmarshal, all if None.
+        @type fields: [str,...]
         @return: The unmarshalled reply. The returned value is an L{Object} or
             a I{list} depending on whether the service returns a single object
             or a collection.
@@ -153,20 +233,26 @@ class Binding(object):
         soapbody = soapenv.getChild("Body", envns)
         if soapbody is None:
             soapbody = soapenv.getChild("Body", envns12)
-        soapbody = self.multiref.process(soapbody)
+        soapbody = MultiRef().process(soapbody)
         nodes = self.replycontent(method, soapbody)
+        codec = self.options().codecs.get(method.name)
+        if codec is not None and codec.unmarshal is not None:
+            return codec.unmarshal(nodes)
+        if fields is None:
+            fields = self.options().projections.get(method.name)
+        fields = projection(fields)
         rtypes = self.returned_types(method)
         if len(rtypes) > 1:
-            return self.replycomposite(rtypes, nodes)
+            return self.replycomposite(rtypes, nodes, fields)
         if len(rtypes) == 0:
             return
         if rtypes[0].multi_occurrence():
-            return self.replylist(rtypes[0], nodes)
+            return self.replylist(rtypes[0], nodes, fields)
         if len(nodes):
             resolved = rtypes[0].resolve(nobuiltin=True)
-            return self.unmarshaller().process(nodes[0], resolved)
+            return self.unmarshaller().process(nodes[0], resolved, fields)
 
-    def replylist(self, rt, nodes):
+    def replylist(self, rt, nodes, fields=None):
         """
         Construct a I{list} reply.
 
@@ -176,15 +262,22 @@ class Binding(object):
         @type rt: L{suds.xsd.sxbase.SchemaObject}
         @param nodes: A collection of XML nodes.
         @type nodes: [L{Element},...]
-        @return: A list of I{unmarshalled} objects.
-        @rtype: [L{Object},...]
+        @param fields: The projected fields tree, all fields if None.
+        @type fields: dict
+        @return: A list of I{unmarshalled} objects, or columns by field name
+            for flat records with the I{columns} reply model.
+        @rtype: [L{Object},...]|dict
 
         """
         resolved = rt.resolve(nobuiltin=True)
+        if self.options().reply_model == "columns" and \
+                Columnar.flat(resolved):
+            return Columnar(resolved, fields).process(nodes)
         unmarshaller = self.unmarshaller()
-        return [unmarshaller.process(node, resolved) for node in nodes]
+        return [unmarshaller.process(node, resolved, fields) for node in
+            nodes]
 
-    def replycomposite(self, rtypes, nodes):
+    def replycomposite(self, rtypes, nodes, fields=None):
         """
         Construct a I{composite} reply.
 
@@ -194,6 +287,8 @@ class Binding(object):
         @type rtypes: [L{suds.xsd.sxbase.SchemaObject},...]
         @param nodes: A collection of XML nodes.
         @type nodes: [L{Element},...]
+        @param fields: The projected fields tree, all fields if None.
+        @type fields: dict
         @return: The I{unmarshalled} composite object.
         @rtype: L{Object},...
 
@@ -202,7 +297,8 @@ class Binding(object):
         for rt in rtypes:
             dictionary[rt.name] = rt
         unmarshaller = self.unmarshaller()
-        composite = Factory.object("reply")
+        model = unmarshaller.model
+        composite = model.object("reply")
         for node in nodes:
             tag = node.name
             rt = dictionary.get(tag)
@@ -211,20 +307,27 @@ class Binding(object):
                     message = "<%s/> not mapped to message part" % (tag,)
                     raise Exception(message)
                 continue
+            subfields = None
+            if fields is not None:
+                if tag not in fields:
+                    continue
+                subfields = fields[tag]
             resolved = rt.resolve(nobuiltin=True)
-            sobject = unmarshaller.process(node, resolved)
-            value = getattr(composite, tag, None)
+            sobject = unmarshaller.process(node, resolved, subfields)
+            value = None
+            if model.contains(composite, tag):
+                value = model.get(composite, tag)
             if value is None:
                 if rt.multi_occurrence():
                     value = []
-                    setattr(composite, tag, value)
+                    model.set(composite, tag, value)
                     value.append(sobject)
                 else:
-                    setattr(composite, tag, sobject)
+                    model.set(composite, tag, sobject)
             else:
                 if not isinstance(value, list):
                     value = [value,]
-                    setattr(composite, tag, value)
+                    model.set(composite, tag, value)
                 value.append(sobject)
         return composite
 
@@ -246,7 +349,8 @@ class Binding(object):
         marshaller = self.marshaller()
         content = Content(tag=pdef[0], value=object, type=pdef[1],
             real=pdef[1].resolve())
-        return marshaller.process(content)
+        return metrics.measured(self.measurement, "marshal",
+            marshaller.process, content)
 
     def mkheader(self, method, hdef, object):
         """
@@ -267,7 +371,8 @@ class Binding(object):
         if isinstance(object, (list, tuple)):
             return [self.mkheader(method, hdef, item) for item in object]
         content = Content(tag=hdef[0], value=object, type=hdef[1])
-        return marshaller.process(content)
+        return metrics.measured(self.measurement, "marshal",
+            marshaller.process, content)
 
     def envelope(self, header, body):
         """
@@ -513,3 +618,16 @@ class PartElement(SchemaElement):
         if nobuiltin and self.__resolved.builtin():
             return self
         return self.__resolved
+
+
+class Engines(dict):
+    """
+    Shared marshallers & unmarshallers by construction parameters.
+
+    Holds per process state only, so it always gets pickled & copied as an
+    empty dictionary.
+
+    """
+
+    def __reduce__(self):
+        return self.__class__, ()
@@ -21,6 +21,7 @@ Classes for the (WS) SOAP I{rpc/literal} and I{rpc/encoded} bindings.
 from suds import *
 from suds.mx.encoded import Encoded as MxEncoded
 from suds.umx.encoded import Encoded as UmxEncoded
+from suds.umx.lazy import LazyEncoded
 from suds.bindings.binding import Binding, envns
 from suds.sax.element import Element
 
@@ -78,14 +79,17 @@ class Encoded(RPC):
     """RPC/Encoded (section 5) binding style."""
 
     def marshaller(self):
-        return MxEncoded(self.schema())
+        return self.engine(MxEncoded)
 
     def unmarshaller(self):
         """
         Get the appropriate schema based XML decoder.
 
-        @return: Typed unmarshaller.
-        @rtype: L{UmxTyped}
+        @return: Encoded unmarshaller, a lazy one for the I{lazy} reply
+            model.
+        @rtype: L{UmxEncoded}
 
         """
-        return UmxEncoded(self.schema())
+        if self.options().reply_model == "lazy":
+            return self.engine(LazyEncoded, self.model())
+        return self.engine(UmxEncoded, self.model())
@@ -19,8 +19,8 @@ Basic caching classes.
 """
 
 import suds
+import suds.sax.document
 import suds.sax.element
-import suds.sax.parser
 
 import datetime
 import os
@@ -29,7 +29,7 @@ try:
 except Exception:
     import pickle
 import shutil
-import tempfile
+import threading
 
 from logging import getLogger
 log = getLogger(__name__)
@@ -77,6 +77,20 @@ class Cache(object):
         raise Exception("not-implemented")
 
 
+    def expiring(self, id):
+        """
+        Get whether a cached object is due for a background refresh.
+
+        @param id: The object id.
+        @type id: str
+        @return: True if the object should be rebuilt and put back into the
+            cache while its current (possibly stale) value is still used.
+        @rtype: bool
+
+        """
+        return False
+
+
 class NoCache(Cache):
     """The pass-through object cache."""
 
@@ -87,6 +101,41 @@ class NoCache(Cache):
         pass
 
 
+class RefreshPolicy(object):
+    """
+    Stale-while-revalidate policy for expiring L{FileCache} entries.
+
+    Without a refresh policy, an expired cache entry is removed and whoever
+    needs it next must wait for it to be rebuilt. With one, the entry is kept
+    past its expiration for up to I{stale} and is reported as I{expiring}
+    starting I{ahead} before its expiration, allowing its reader to keep using
+    the stale value while a fresh one gets rebuilt in the background.
+
+    @ivar stale: How long past its expiration an entry may still be used.
+    @type stale: datetime.timedelta
+    @ivar ahead: How long before its expiration an entry should be refreshed.
+    @type ahead: datetime.timedelta
+
+    """
+
+    def __init__(self, stale=None, ahead=None):
+        """
+        @param stale: How long past its expiration an entry may still be used
+            (default: no time at all).
+        @type stale: datetime.timedelta
+        @param ahead: How long before its expiration an entry should be
+            refreshed (default: no time at all).
+        @type ahead: datetime.timedelta
+
+        """
+        if stale is None:
+            stale = datetime.timedelta()
+        if ahead is None:
+            ahead = datetime.timedelta()
+        self.stale = stale
+        self.ahead = ahead
+
+
 class FileCache(Cache):
     """
     A file-based URL cache.
@@ -100,13 +149,15 @@ class FileCache(Cache):
     @type duration: datetime.timedelta
     @ivar location: The cached file folder.
     @type location: str
+    @ivar refresh: The expiring entry refresh policy (None=no refresh).
+    @type refresh: L{RefreshPolicy}
 
     """
     fnprefix = "suds"
     __default_location = None
     remove_default_location_on_exit = True
 
-    def __init__(self, location=None, **duration):
+    def __init__(self, location=None, refresh=None, **duration):
         """
         Initialized a new FileCache instance.
 
@@ -119,6 +170,9 @@ class FileCache(Cache):
 
         @param location: The cached file folder.
         @type location: str
+        @param refresh: The expiring entry refresh policy (default: None=no
+            refresh, expired entries get removed immediately).
+        @type refresh: L{RefreshPolicy}
         @param duration: The duration after which cached entries expire
             (default: 0=never).
         @type duration: keyword arguments for datetime.timedelta constructor
@@ -127,6 +181,7 @@ class FileCache(Cache):
         if location is None:
             location = self.__get_default_location()
         self.location = location
+        self.refresh = refresh
         self.duration = datetime.timedelta(**duration)
         self.__check_version()
 
@@ -139,6 +194,16 @@ class FileCache(Cache):
                 os.remove(path)
                 log.debug("deleted: %s", path)
 
+    def expiring(self, id):
+        if not self.duration or self.refresh is None:
+            return False
+        try:
+            created = self.__created(self.__filename(id))
+        except Exception:
+            return False
+        due = created + self.duration - self.refresh.ahead
+        return due <= datetime.datetime.now()
+
     def fnsuffix(self):
         """
         Get the file name suffix.
@@ -169,11 +234,20 @@ class FileCache(Cache):
     def put(self, id, data):
         try:
             filename = self.__filename(id)
-            f = self.__open(filename, "wb")
+            # Write into a temporary file first and then move it in place so
+            # readers never see a partially written entry, e.g. while it is
+            # being refreshed in the background.
+            tmp = "%s.%d-%d" % (filename, os.getpid(), threading.get_ident())
             try:
-                f.write(data)
+                f = self.__open(tmp, "wb")
+                try:
+                    f.write(data)
+                finally:
+                    f.close()
+                os.replace(tmp, filename)
             finally:
-                f.close()
+                if os.path.exists(tmp):
+                    os.remove(tmp)
             return data
         except Exception:
             log.debug(id, exc_info=1)
@@ -206,6 +280,11 @@ class FileCache(Cache):
             finally:
                 f.close()
 
+    @staticmethod
+    def __created(filename):
+        """Return the creation time of a cache file."""
+        return datetime.datetime.fromtimestamp(os.path.getctime(filename))
+
     def __filename(self, id):
         """Return the cache file name for an entry with a given id."""
         suffix = self.fnsuffix()
@@ -221,6 +300,7 @@ class FileCache(Cache):
 
         """
         if not FileCache.__default_location:
+            import tempfile
             tmp = tempfile.mkdtemp("suds-default-cache")
             FileCache.__default_location = tmp
             import atexit
@@ -268,8 +348,9 @@ class FileCache(Cache):
         """
         if not self.duration:
             return
-        created = datetime.datetime.fromtimestamp(os.path.getctime(filename))
-        expired = created + self.duration
+        expired = self.__created(filename) + self.duration
+        if self.refresh is not None:
+            expired += self.refresh.stale
         if expired < datetime.datetime.now():
             os.remove(filename)
             log.debug("%s expired, deleted", filename)
@@ -286,6 +367,7 @@ class DocumentCache(FileCache):
         try:
             fp = self._getf(id)
             if fp is not None:
+                import suds.sax.parser
                 p = suds.sax.parser.Parser()
                 cached = p.parse(fp)
                 fp.close()
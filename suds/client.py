@@ -20,27 +20,17 @@ Service proxy implementation providing access to web services.
 
 import suds
 from suds import *
-import suds.bindings.binding
-from suds.builder import Builder
-import suds.cache
 import suds.metrics as metrics
+import suds.tracing as tracing
 from suds.options import Options
 from suds.plugin import PluginContainer
 from suds.properties import Unskin
-from suds.reader import DefinitionsReader
-from suds.resolver import PathResolver
-from suds.sax.document import Document
-import suds.sax.parser
-from suds.servicedefinition import ServiceDefinition
 import suds.transport
-import suds.transport.https
-from suds.umx.basic import Basic as UmxBasic
-from suds.wsdl import Definitions
 from . import sudsobject
 
-from http.cookiejar import CookieJar
-from copy import deepcopy
-import http.client
+import collections
+from http import HTTPStatus
+import threading
 
 from logging import getLogger
 log = getLogger(__name__)
@@ -58,11 +48,24 @@ class Client(UnicodeMixin):
     @type factory: L{Factory}
     @ivar sd: The service definition
     @type sd: L{ServiceDefinition}
-    @ivar messages: The last sent/received messages.
-    @type messages: str[2]
+    @ivar messages: The last sent/received messages of the current thread,
+        retained as selected using the I{retention} option.
+    @type messages: dict
+
+    The I{service}, I{factory} & I{sd} attributes are constructed on first
+    access.
+
+    A client may be shared between threads invoking web service operations
+    concurrently, as long as its options are not modified meanwhile. All the
+    state of a single invocation is kept by the per-call L{_SoapClient}, and
+    the last sent & received messages are tracked per thread.
 
     """
 
+    __factory = None
+    __service = None
+    __sd = None
+
     @classmethod
     def items(cls, sobject):
         """
@@ -89,6 +92,9 @@ class Client(UnicodeMixin):
         @rtype: dict
 
         """
+        materialize = getattr(sobject.__class__, "__materialize__", None)
+        if materialize is not None:
+            materialize(sobject)
         return sudsobject.asdict(sobject)
 
     @classmethod
@@ -112,24 +118,106 @@ class Client(UnicodeMixin):
         @see: L{Options}
 
         """
+        from suds.reader import DefinitionsReader
+        from suds.wsdl import Definitions
+        self.__init_options(kwargs)
+        reader = DefinitionsReader(self.options, Definitions)
+        self.__init_wsdl(reader.open(url))
+
+    @classmethod
+    def from_compiled(cls, path, **kwargs):
+        """
+        Construct a client using a precompiled WSDL artifact.
+
+        Such artifacts are prepared using L{suds.compile.compile_wsdl()} and
+        contain the fully loaded WSDL, so constructing a client this way
+        requires neither accessing any external documents nor parsing any
+        XML.
+
+        @param path: The compiled WSDL artifact file path.
+        @type path: str
+        @param kwargs: keyword arguments.
+        @see: L{Options}
+        @return: A new client.
+        @rtype: L{Client}
+
+        """
+        import suds.compile
+        client = cls.__new__(cls)
+        client.__init_options(kwargs)
+        client.__init_wsdl(suds.compile.load(path, client.options))
+        return client
+
+    def __init_options(self, kwargs):
+        """Initialize client options based on the given keyword arguments."""
+        import suds.cache
+        import suds.transport.https
         options = Options()
         options.transport = suds.transport.https.HttpAuthenticated()
         self.options = options
         if "cache" not in kwargs:
             kwargs["cache"] = suds.cache.ObjectCache(days=1)
         self.set_options(**kwargs)
-        reader = DefinitionsReader(options, Definitions)
-        self.wsdl = reader.open(url)
-        plugins = PluginContainer(options.plugins)
+
+    def __init_wsdl(self, wsdl):
+        """Initialize the client to use the given loaded WSDL object."""
+        self.wsdl = wsdl
+        plugins = PluginContainer(self.options.plugins)
         plugins.init.initialized(wsdl=self.wsdl)
-        self.factory = Factory(self.wsdl)
-        self.service = ServiceSelector(self, self.wsdl.services)
-        self.sd = []
-        for s in self.wsdl.services:
-            sd = ServiceDefinition(self.wsdl, s)
-            self.sd.append(sd)
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
         self.messages = dict(tx=None, rx=None)
 
+    @property
+    def messages(self):
+        local = self.__local
+        messages = getattr(local, "messages", None)
+        if messages is None:
+            messages = local.messages = dict(tx=None, rx=None)
+        return messages
+
+    @messages.setter
+    def messages(self, messages):
+        self.__local.messages = messages
+
+    @property
+    def factory(self):
+        if self.__factory is None:
+            with self.__lock:
+                if self.__factory is None:
+                    self.__factory = Factory(self.wsdl)
+        return self.__factory
+
+    @factory.setter
+    def factory(self, factory):
+        self.__factory = factory
+
+    @property
+    def service(self):
+        if self.__service is None:
+            with self.__lock:
+                if self.__service is None:
+                    self.__service = ServiceSelector(self, self.wsdl.services)
+        return self.__service
+
+    @service.setter
+    def service(self, service):
+        self.__service = service
+
+    @property
+    def sd(self):
+        if self.__sd is None:
+            from suds.servicedefinition import ServiceDefinition
+            with self.__lock:
+                if self.__sd is None:
+                    self.__sd = [ServiceDefinition(self.wsdl, s) for s in
+                        self.wsdl.services]
+        return self.__sd
+
+    @sd.setter
+    def sd(self, sd):
+        self.__sd = sd
+
     def set_options(self, **kwargs):
         """
         Set options.
@@ -166,25 +254,65 @@ class Client(UnicodeMixin):
     def last_sent(self):
         """
         Get last sent I{soap} message.
+
+        Messages retained as raw XML content, see the I{retention} option,
+        get parsed again on each call.
+
         @return: The last sent I{soap} message.
         @rtype: L{Document}
+
         """
-        return self.messages.get('tx')
+        return _retained(self.messages.get('tx'))
 
     def last_received(self):
         """
         Get last received I{soap} message.
+
+        Messages retained as raw XML content, see the I{retention} option,
+        get parsed again on each call.
+
         @return: The last received I{soap} message.
         @rtype: L{Document}
+
+        """
+        return _retained(self.messages.get('rx'))
+
+    def exchanges(self):
+        """
+        Get the calling thread's last SOAP message exchanges, retained when
+        the I{retention} option is set to their number.
+        @return: (sent, received) raw XML content pairs, oldest first, with
+            None for a message not sent or received.
+        @rtype: [(I{bytes}, I{bytes}),...]
+        """
+        return [tuple(x) for x in self.messages.get('exchanges', ())]
+
+    def memory_report(self):
         """
-        return self.messages.get('rx')
+        Get an approximate account of the memory used by this client.
+
+        Accounts for the loaded WSDL, including its schema objects, raw XML
+        element trees & caches, the constructed service definitions, if any,
+        and the calling thread's last sent & received messages. Note that a
+        WSDL & its service definitions are shared with the client's clones.
+
+        @return: The memory usage report.
+        @rtype: L{suds.diagnostics.Report}
+
+        """
+        import suds.diagnostics
+        return suds.diagnostics.memory(self.wsdl, self.__sd, self.messages)
 
     def clone(self):
         """
         Get a shallow clone of this object.
 
-        The clone only shares the WSDL. All other attributes are unique to the
-        cloned object including options.
+        The clone shares the WSDL. Its options are a copy-on-write overlay of
+        this client's options, storing only the options set on the clone and
+        reading all the others from this client. Option values, including
+        the transport, are shared until replaced on the clone, and setting a
+        transport option on the clone first gives it a private copy of the
+        transport.
 
         @return: A shallow clone.
         @rtype: L{Client}
@@ -194,14 +322,13 @@ class Client(UnicodeMixin):
             def __init__(self):
                 pass
         clone = Uninitialized()
-        clone.options = Options()
-        cp = Unskin(clone.options)
-        mp = Unskin(self.options)
-        cp.update(deepcopy(mp))
+        clone.options = Options.__new__(Options)
+        clone.options.__pts__ = Unskin(self.options).overlay()
         clone.wsdl = self.wsdl
-        clone.factory = self.factory
-        clone.service = ServiceSelector(clone, self.wsdl.services)
-        clone.sd = self.sd
+        clone.factory = self.__factory
+        clone.sd = self.__sd
+        clone.__lock = threading.Lock()
+        clone.__local = threading.local()
         clone.messages = dict(tx=None, rx=None)
         return clone
 
@@ -233,6 +360,8 @@ class Factory:
         @type wsdl: L{wsdl.Definitions}
 
         """
+        from suds.builder import Builder
+        from suds.resolver import PathResolver
         self.wsdl = wsdl
         self.resolver = PathResolver(wsdl)
         self.builder = Builder(self.resolver)
@@ -274,6 +403,7 @@ class Factory:
         @type ps: char
 
         """
+        from suds.resolver import PathResolver
         self.resolver = PathResolver(self.wsdl, ps)
 
 
@@ -582,12 +712,20 @@ class Method:
         """Invoke the method."""
         clientclass = self.clientclass(kwargs)
         client = clientclass(self.client, self.method)
+        profiler = client.profiler(kwargs)
         try:
-            return client.invoke(args, kwargs)
+            with client.trace("suds.invoke"):
+                if profiler is None:
+                    return client.invoke(args, kwargs)
+                return profiler.run(client.invoke, args, kwargs)
         except WebFault as e:
             if self.faults():
                 raise
-            return http.client.INTERNAL_SERVER_ERROR, e
+            return HTTPStatus.INTERNAL_SERVER_ERROR, e
+        finally:
+            client.record()
+            if profiler is not None:
+                profiler.deliver()
 
     def faults(self):
         """Get faults option."""
@@ -665,14 +803,22 @@ class _SoapClient:
     @type service: L{Service}
     @ivar method: A target method.
     @type method: L{Method}
-    @ivar options: A dictonary of options.
-    @type options: dict
+    @ivar options: A snapshot of the client's options, taken when the
+        operation invocation starts and used throughout its processing.
+    @type options: L{suds.properties.Snapshot}
+    @ivar measurement: The invocation's measurement, None unless metric sinks
+        have been registered using the I{metrics} option.
+    @type measurement: L{metrics.Measurement}
+    @ivar tracer: The tracer registered using the I{tracer} option, if any.
+    @type tracer: L{tracing.Tracer}
     @ivar cookiejar: A cookie jar.
     @type cookiejar: libcookie.CookieJar
 
     """
 
     TIMEOUT_ARGUMENT = "__timeout"
+    FIELDS_ARGUMENT = "__fields"
+    PROFILE_ARGUMENT = "__profile"
 
     def __init__(self, client, method):
         """
@@ -684,7 +830,11 @@ class _SoapClient:
         """
         self.client = client
         self.method = method
-        self.options = client.options
+        self.fields = None
+        from http.cookiejar import CookieJar
+        self.options = Unskin(client.options).snapshot()
+        self.measurement = self.measure()
+        self.tracer = self.options.tracer
         self.cookiejar = CookieJar()
 
     def invoke(self, args, kwargs):
@@ -716,19 +866,99 @@ class _SoapClient:
             I{None}
 
         """
-        timer = metrics.Timer()
-        timer.start()
-        binding = self.method.binding.input
         timeout = kwargs.pop(_SoapClient.TIMEOUT_ARGUMENT, None)
-        soapenv = binding.get_message(self.method, args, kwargs)
-        timer.stop()
-        method_name = self.method.name
-        metrics.log.debug("message for '%s' created: %s", method_name, timer)
-        timer.start()
-        result = self.send(soapenv, timeout=timeout)
-        timer.stop()
-        metrics.log.debug("method '%s' invoked: %s", method_name, timer)
-        return result
+        self.fields = kwargs.pop(_SoapClient.FIELDS_ARGUMENT, None)
+        soapenv = self.get_message(args, kwargs)
+        return self.send(soapenv, timeout=timeout)
+
+    def get_message(self, args, kwargs):
+        """
+        Construct the SOAP request envelope for the given arguments.
+
+        @param args: A list of args for the method invoked.
+        @type args: list|tuple
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The SOAP request envelope.
+        @rtype: L{Document}
+
+        """
+        measurement = self.measurement
+        binding = self.method.binding.input.using(self.options, measurement)
+        with tracing.span(self.tracer, "suds.get_message"):
+            if measurement is None:
+                return binding.get_message(self.method, args, kwargs)
+            started = metrics.clock()
+            marshalled = measurement.phases.get("marshal", 0)
+            soapenv = binding.get_message(self.method, args, kwargs)
+        measurement.add("arguments", started)
+        marshalled = measurement.phases.get("marshal", 0) - marshalled
+        measurement.phases["arguments"] -= marshalled
+        return soapenv
+
+    def trace(self, name):
+        """
+        Get a context manager tracing the invocation as a span, attributed
+        with the operation name & endpoint.
+
+        @param name: The span name.
+        @type name: str
+        @return: The context manager.
+
+        """
+        tracer = self.tracer
+        if tracer is None:
+            return tracing.span(None, name)
+        return tracing.span(tracer, name, {"operation": self.method.name,
+            "endpoint": self.__location()})
+
+    def measure(self):
+        """
+        Start measuring an invocation, if any metric sinks are registered.
+
+        @return: The invocation's measurement, None if not measured.
+        @rtype: L{metrics.Measurement}
+
+        """
+        if self.options.metrics:
+            return metrics.Measurement(self.method.name, self.__location())
+
+    def profiler(self, kwargs):
+        """
+        Get the invocation's profiler, if it is to be profiled as requested
+        by the I{__profile} keyword argument, removed from the given keyword
+        arguments, or else by the I{profile} option.
+
+        A profiled invocation always gets measured, even if no metric sinks
+        have been registered.
+
+        @param kwargs: Keyword arguments for the method invoked.
+        @type kwargs: dict
+        @return: The profiler, None if not profiling.
+        @rtype: L{metrics.Profiler}
+
+        """
+        profile = kwargs.pop(_SoapClient.PROFILE_ARGUMENT, None)
+        if profile is None:
+            profile = self.options.profile
+        if not profile:
+            return
+        if self.measurement is None:
+            self.measurement = metrics.Measurement(self.method.name,
+                self.__location())
+        return metrics.Profiler(self.measurement, None if profile is True
+            else profile)
+
+    def record(self):
+        """
+        Pass the invocation's measurement, if any, to the registered metric
+        sinks.
+
+        """
+        measurement = self.measurement
+        if measurement is not None:
+            self.measurement = None
+            measurement.record(self.options.metrics)
 
     def send(self, soapenv, timeout=None):
         """
@@ -751,26 +981,35 @@ class _SoapClient:
         """
         location = self.__location()
         log.debug("sending to (%s)\nmessage:\n%s", location, soapenv)
-        self.last_sent(soapenv)
-        plugins = PluginContainer(self.options.plugins)
-        plugins.message.marshalled(envelope=soapenv.root())
+        document = soapenv
+        measurement = self.measurement
+        tracer = self.tracer
+        plugins = PluginContainer.compiled(self.options.plugins).message
+        if plugins.marshalled:
+            with tracing.span(tracer, "suds.plugin.marshalled"):
+                metrics.measured(measurement, "plugins", plugins.marshalled,
+                    envelope=soapenv.root())
         if self.options.prettyxml:
-            soapenv = soapenv.str()
+            soapenv = metrics.measured(measurement, "serialize", soapenv.str)
         else:
-            soapenv = soapenv.plain()
+            soapenv = metrics.measured(measurement, "serialize",
+                soapenv.plain)
         soapenv = soapenv.encode("utf-8")
-        ctx = plugins.message.sending(envelope=soapenv)
-        soapenv = ctx.envelope
+        if plugins.sending:
+            with tracing.span(tracer, "suds.plugin.sending"):
+                soapenv = metrics.measured(measurement, "plugins",
+                    plugins.sending, envelope=soapenv).envelope
+        self.last_sent(document, soapenv)
         if self.options.nosend:
-            return RequestContext(self.process_reply, soapenv)
+            return RequestContext(self.__process_user_reply, soapenv)
         request = suds.transport.Request(location, soapenv, timeout)
         request.headers = self.__headers()
+        if measurement is not None:
+            measurement.request_bytes = len(soapenv)
         try:
-            timer = metrics.Timer()
-            timer.start()
-            reply = self.options.transport.send(request)
-            timer.stop()
-            metrics.log.debug("waited %s on server reply", timer)
+            with tracing.span(tracer, "suds.transport.send"):
+                reply = metrics.measured(measurement, "network",
+                    self.options.transport.send, request)
         except suds.transport.TransportError as e:
             content = e.fp and e.fp.read() or ""
             return self.process_reply(content, e.httpcode, tostr(e))
@@ -795,22 +1034,28 @@ class _SoapClient:
 
         """
         if status is None:
-            status = http.client.OK
+            status = HTTPStatus.OK
         debug_message = "Reply HTTP status - %d" % (status,)
-        if status in (http.client.ACCEPTED, http.client.NO_CONTENT):
+        if status in (HTTPStatus.ACCEPTED, HTTPStatus.NO_CONTENT):
             log.debug(debug_message)
             return
         #TODO: Consider whether and how to allow plugins to handle error,
         # httplib.ACCEPTED & httplib.NO_CONTENT replies as well as successful
         # ones.
-        if status == http.client.OK:
+        if status == HTTPStatus.OK:
             log.debug("%s\n%s", debug_message, reply)
         else:
             log.debug("%s - %s\n%s", debug_message, description, reply)
 
-        plugins = PluginContainer(self.options.plugins)
-        ctx = plugins.message.received(reply=reply)
-        reply = ctx.reply
+        measurement = self.measurement
+        tracer = self.tracer
+        if measurement is not None and reply is not None:
+            measurement.reply_bytes = len(reply)
+        plugins = PluginContainer.compiled(self.options.plugins).message
+        if plugins.received:
+            with tracing.span(tracer, "suds.plugin.received"):
+                reply = metrics.measured(measurement, "plugins",
+                    plugins.received, reply=reply).reply
 
         # SOAP standard states that SOAP errors must be accompanied by HTTP
         # status code 500 - internal server error:
@@ -825,21 +1070,27 @@ class _SoapClient:
         #   An INSTANCE MUST use a "500 Internal Server Error" HTTP status code
         # if the response message is a SOAP Fault.
         replyroot = None
-        if status in (http.client.OK, http.client.INTERNAL_SERVER_ERROR):
-            replyroot = _parse(reply)
+        if status in (HTTPStatus.OK, HTTPStatus.INTERNAL_SERVER_ERROR):
+            with tracing.span(tracer, "suds.parse"):
+                replyroot = metrics.measured(measurement, "parse", _parse,
+                    reply)
             if len(reply) > 0:
-                self.last_received(replyroot)
-            plugins.message.parsed(reply=replyroot)
-            fault = self.__get_fault(replyroot)
+                self.last_received(replyroot, reply)
+            if plugins.parsed:
+                with tracing.span(tracer, "suds.plugin.parsed"):
+                    metrics.measured(measurement, "plugins", plugins.parsed,
+                        reply=replyroot)
+            fault = metrics.measured(measurement, "faults", self.__get_fault,
+                replyroot)
             if fault:
-                if status != http.client.INTERNAL_SERVER_ERROR:
+                if status != HTTPStatus.INTERNAL_SERVER_ERROR:
                     log.warning("Web service reported a SOAP processing fault "
                         "using an unexpected HTTP status code %d. Reporting "
                         "as an internal server error.", status)
                 if self.options.faults:
                     raise WebFault(fault, replyroot)
-                return http.client.INTERNAL_SERVER_ERROR, fault
-        if status != http.client.OK:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, fault
+        if status != HTTPStatus.OK:
             if self.options.faults:
                 #TODO: Use a more specific exception class here.
                 raise Exception((status, description))
@@ -848,13 +1099,36 @@ class _SoapClient:
         if self.options.retxml:
             return reply
 
-        result = replyroot and self.method.binding.output.get_reply(
-            self.method, replyroot)
-        ctx = plugins.message.unmarshalled(reply=result)
-        result = ctx.reply
+        if replyroot:
+            binding = self.method.binding.output.using(self.options,
+                measurement)
+            with tracing.span(tracer, "suds.get_reply"):
+                result = metrics.measured(measurement, "unmarshal",
+                    binding.get_reply, self.method, replyroot, self.fields)
+        else:
+            result = replyroot
+        if plugins.unmarshalled:
+            with tracing.span(tracer, "suds.plugin.unmarshalled"):
+                result = metrics.measured(measurement, "plugins",
+                    plugins.unmarshalled, reply=result).reply
         if self.options.faults:
             return result
-        return http.client.OK, result
+        return HTTPStatus.OK, result
+
+    def __process_user_reply(self, reply, status, description):
+        """
+        Process a web service operation SOAP reply acquired by the user for a
+        request constructed with the I{nosend} option enabled.
+
+        Measured separately from the request construction.
+
+        """
+        self.measurement = self.measure()
+        try:
+            with self.trace("suds.process_reply"):
+                return self.process_reply(reply, status, description)
+        finally:
+            self.record()
 
     def __get_fault(self, replyroot):
         """
@@ -874,7 +1148,9 @@ class _SoapClient:
             soapbody = soapenv and soapenv.getChild("Body", envns)
             return soapbody and soapbody.getChild("Fault", envns)
 
-        fault = get_fault(suds.bindings.binding.envns) or get_fault(suds.bindings.binding.envns12)
+        from suds.bindings.binding import envns, envns12
+        from suds.umx.basic import Basic as UmxBasic
+        fault = get_fault(envns) or get_fault(envns12)
         return fault is not None and UmxBasic().process(fault)
 
     def __headers(self):
@@ -897,47 +1173,80 @@ class _SoapClient:
 
     def __location(self):
         """Returns the SOAP request's target location URL."""
-        return Unskin(self.options).get("location", self.method.location)
+        location = self.options.location
+        if location is None:
+            return self.method.location
+        return location
 
-    def last_sent(self, d=None):
+    def last_sent(self, d=None, content=None):
         """
         Get or set last SOAP sent messages document
 
         To get the last sent document call the function without parameter.
         To set the last sent message, pass the document as parameter.
 
-        @param d: A SOAP reply dict message key
-        @type string: I{bytes}
+        @param d: The sent SOAP request document.
+        @type d: L{Document}
+        @param content: The sent SOAP request raw XML content.
+        @type content: I{bytes}
         @return: The last sent I{soap} message.
         @rtype: L{Document}
 
         """
-        key = 'tx'
-        messages = self.client.messages
         if d is None:
-            return messages.get(key)
-        else:
-            messages[key] = d
+            return self.client.last_sent()
+        self.__retain('tx', d, content)
 
-    def last_received(self, d=None):
+    def last_received(self, d=None, content=None):
         """
         Get or set last SOAP received messages document
 
         To get the last received document call the function without parameter.
         To set the last sent message, pass the document as parameter.
 
-        @param d: A SOAP reply dict message key
-        @type string: I{bytes}
+        @param d: The parsed SOAP reply document.
+        @type d: L{Document}
+        @param content: The received SOAP reply raw XML content.
+        @type content: I{bytes}
         @return: The last received I{soap} message.
         @rtype: L{Document}
 
         """
-        key = 'rx'
-        messages = self.client.messages
         if d is None:
-            return messages.get(key)
-        else:
+            return self.client.last_received()
+        self.__retain('rx', d, content)
+
+    def __retain(self, key, d, content):
+        """
+        Retain a sent or received SOAP message as selected using the
+        I{retention} option.
+
+        @param key: The message key, 'tx' or 'rx'.
+        @type key: str
+        @param d: The message document.
+        @type d: L{Document}
+        @param content: The message raw XML content, None to retain the
+            document regardless of the I{retention} option.
+        @type content: I{bytes}
+
+        """
+        retention = self.options.retention
+        messages = self.client.messages
+        if retention == 'last' or content is None:
             messages[key] = d
+        elif retention == 'bytes':
+            messages[key] = content
+        elif retention == 'off':
+            messages[key] = None
+        else:
+            messages[key] = content
+            exchanges = messages.get('exchanges')
+            if exchanges is None or exchanges.maxlen != retention:
+                exchanges = messages['exchanges'] = collections.deque(
+                    exchanges or (), retention)
+            if key == 'tx' or not exchanges or exchanges[-1][1] is not None:
+                exchanges.append([None, None])
+            exchanges[-1][key == 'rx'] = content
 
 
 class _SimClient(_SoapClient):
@@ -981,11 +1290,12 @@ class _SimClient(_SoapClient):
 
         """
         simulation = kwargs.pop(self.__injkey)
+        self.fields = kwargs.pop(_SoapClient.FIELDS_ARGUMENT, None)
         msg = simulation.get("msg")
         if msg is not None:
             assert msg.__class__ is suds.byte_str_class
             return self.send(_parse(msg))
-        msg = self.method.binding.input.get_message(self.method, args, kwargs)
+        msg = self.get_message(args, kwargs)
         log.debug("inject (simulated) send message:\n%s", msg)
         reply = simulation.get("reply")
         if reply is not None:
@@ -998,6 +1308,22 @@ class _SimClient(_SoapClient):
         raise Exception("reply or msg injection parameter expected")
 
 
+def _retained(message):
+    """
+    Get a retained SOAP message's document, parsing it if retained as raw
+    XML content.
+
+    @param message: The retained message.
+    @type message: L{Document}|I{bytes}|I{None}
+    @return: The message document.
+    @rtype: L{Document}|I{None}
+
+    """
+    if message.__class__ is suds.byte_str_class:
+        return _parse(message)
+    return message
+
+
 def _parse(string):
     """
     Parses given XML document content.
@@ -1012,4 +1338,5 @@ def _parse(string):
 
     """
     if string:
-        return suds.sax.parser.Parser().parse(string=string)
+        from suds.sax.parser import Parser
+        return Parser().parse(string=string)
@@ -0,0 +1,657 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Static Python code generation for WSDL defined types & operations.
+
+Generates a Python module containing:
+  - A I{__slots__} based class for each complex type.
+  - A class holding constants for each enumeration type.
+  - Per-type unmarshalling functions constructing instances of the generated
+    classes directly from reply XML elements.
+  - An I{OPERATIONS} dictionary mapping operation names to L{Codec} objects
+    that may be registered with a client using its I{codecs} option.
+
+Instances of the generated classes may be passed as web service operation
+arguments. They get marshalled by the regular literal marshaller so the
+constructed SOAP requests match those constructed using suds objects exactly.
+
+Usage::
+
+    python -m suds.codegen <wsdl-url> -o <module.py>
+
+This module also holds the runtime support used by the generated code.
+
+"""
+
+from suds import *
+from suds.sax import Namespace
+from suds.sax.text import Text
+from suds.sudsobject import Factory
+from suds.umx.core import reserved
+from suds.xsd import qualify
+from suds.xsd.sxbasic import Complex, Element as SchemaElement, Extension
+import suds.xsd.sxbuiltin
+
+import keyword
+import re
+import sys
+
+from logging import getLogger
+log = getLogger(__name__)
+
+
+class Struct(object):
+    """
+    Base class for generated complex type classes.
+
+    @cvar __fields__: All the field names, including inherited ones.
+    @type __fields__: (str,...)
+    @cvar __sxtype__: The qualified name of the represented XSD type, None
+        for anonymous types.
+    @type __sxtype__: (name, I{namespace-uri})
+    @cvar __sxname__: The represented XSD type or element name.
+    @type __sxname__: str
+    @cvar __choice__: Names of fields left out when marshalling a None value,
+        the same as in suds objects constructed by L{suds.client.Factory}.
+    @type __choice__: (str,...)
+    @cvar __names__: The suds object keys of fields not named the same as
+        their XML element or attribute, e.g. reserved words like I{class} or
+        names that are not valid Python identifiers.
+    @type __names__: {str: str}
+
+    """
+
+    __slots__ = ()
+    __fields__ = ()
+    __sxtype__ = None
+    __sxname__ = None
+    __choice__ = ()
+    __names__ = {}
+
+    def __iter__(self):
+        for name in self.__fields__:
+            yield name, getattr(self, name)
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(
+            "%s=%r" % item for item in self))
+
+
+class Codec(object):
+    """
+    Per-operation marshalling & unmarshalling used instead of the generic
+    engine.
+
+    @ivar unmarshal: Constructs the reply value from the reply content
+        nodes, None to use the generic unmarshaller.
+    @type unmarshal: I{callable}
+
+    """
+
+    def __init__(self, unmarshal=None):
+        """
+        @param unmarshal: Constructs the reply value from the reply content
+            nodes, None to use the generic unmarshaller.
+        @type unmarshal: I{callable}
+
+        """
+        self.unmarshal = unmarshal
+
+    def marshal(self, schema, args, kwargs):
+        """
+        Prepare operation arguments for the literal marshaller.
+
+        @param schema: The WSDL schema.
+        @type schema: L{suds.xsd.schema.Schema}
+        @param args: Positional operation arguments.
+        @type args: list|tuple
+        @param kwargs: Keyword operation arguments.
+        @type kwargs: dict
+        @return: The prepared (args, kwargs).
+        @rtype: tuple
+
+        """
+        args = [tosuds(a, schema) for a in args]
+        kwargs = dict((k, tosuds(v, schema)) for k, v in kwargs.items())
+        return args, kwargs
+
+
+def tosuds(value, schema):
+    """
+    Convert generated class instances into suds objects.
+
+    @param value: A value to convert.
+    @type value: I{any}
+    @param schema: The WSDL schema.
+    @type schema: L{suds.xsd.schema.Schema}
+    @return: The converted value.
+    @rtype: I{any}
+
+    """
+    if isinstance(value, Struct):
+        cls = value.__class__
+        result = Factory.object(cls.__sxname__)
+        if cls.__sxtype__ is not None:
+            sxtype = schema.types.get(cls.__sxtype__)
+            if sxtype is not None:
+                result.__metadata__.sxtype = sxtype
+        names = cls.__names__
+        for name, v in value:
+            if v is None and name in cls.__choice__:
+                continue
+            setattr(result, names.get(name, name), tosuds(v, schema))
+        return result
+    if isinstance(value, (list, tuple)):
+        return [tosuds(v, schema) for v in value]
+    return value
+
+
+def builtin(tag):
+    """
+    Get the function translating XML text into a builtin XSD type value.
+
+    @param tag: The builtin XSD type name.
+    @type tag: str
+    @return: The translating function.
+    @rtype: I{callable}
+
+    """
+    fn = suds.xsd.sxbuiltin.Factory.tags.get(tag)
+    if fn is None or "translate" not in vars(fn):
+        return _unchanged
+    return fn.translate
+
+
+def _unchanged(value):
+    return value
+
+
+def text(node, translate, nillable):
+    """
+    Unmarshal a simple content XML element.
+
+    @param node: The XML element.
+    @type node: L{Element}
+    @param translate: Translates the element text into a Python value.
+    @type translate: I{callable}
+    @param nillable: Whether an empty element represents None.
+    @type nillable: bool
+    @return: The element value.
+    @rtype: I{any}
+
+    """
+    if node.isnil():
+        return None
+    value = node.getText()
+    if value is None:
+        if nillable:
+            return None
+        return Text("")
+    return translate(value)
+
+
+def typed(node, default, types):
+    """
+    Unmarshal a complex content XML element.
+
+    Uses the unmarshalling function for the type referenced by the element's
+    I{xsi:type} attribute if there is one.
+
+    @param node: The XML element.
+    @type node: L{Element}
+    @param default: Unmarshalling function for the expected type.
+    @type default: I{callable}
+    @param types: Unmarshalling functions by qualified type name.
+    @type types: dict
+    @return: The unmarshalled value.
+    @rtype: L{Struct}
+
+    """
+    if node.isnil():
+        return None
+    ref = node.get("type", Namespace.xsins)
+    if ref is not None:
+        fn = types.get(qualify(ref, node, node.namespace()))
+        if fn is not None:
+            return fn(node)
+    return default(node)
+
+
+def unknown(node, any):
+    """
+    Handle an unexpected XML element.
+
+    @param node: The XML element.
+    @type node: L{Element}
+    @param any: Whether the containing type allows any content.
+    @type any: bool
+    @raise TypeNotFound: When no content is allowed.
+
+    """
+    if not any:
+        raise TypeNotFound(node.qname())
+    log.debug("ignoring <%s/>", node.qname())
+
+
+class Generator:
+    """
+    Generates Python source code for the types & operations defined by a
+    WSDL.
+
+    @ivar wsdl: The WSDL.
+    @type wsdl: L{suds.wsdl.Definitions}
+
+    """
+
+    def __init__(self, wsdl):
+        """
+        @param wsdl: The WSDL.
+        @type wsdl: L{suds.wsdl.Definitions}
+
+        """
+        self.wsdl = wsdl
+        self.schema = wsdl.schema
+        self.__named = set(id(sx) for sx in self.schema.types.values())
+        self.__names = set()
+        self.__classes = {}
+        self.__enums = {}
+        self.__builtins = {}
+        self.__pending = []
+        self.__emitted = set()
+        self.__generated = []
+
+    def generate(self):
+        """
+        Generate the module source code.
+
+        @return: Python source code.
+        @rtype: str
+
+        """
+        types = sorted(self.schema.types.items(), key=self.__sortkey)
+        for qname, sx in types:
+            if sx.enum():
+                self.__enum(sx)
+        for qname, sx in types:
+            if self.__complex(sx):
+                self.__class(sx, sx.name)
+        elements = sorted(self.schema.elements.items(), key=self.__sortkey)
+        for qname, sx in elements:
+            if sx.resolve() is sx and self.__complex(sx):
+                self.__class(sx, sx.name)
+        while self.__pending:
+            self.__emit(self.__pending.pop(0))
+        operations = self.__operations()
+        s = []
+        s.append('"""\nGenerated by suds.codegen from: %s\n\nDo not edit.\n\n'
+            '"""' % (self.wsdl.url,))
+        s.append("")
+        s.append("from suds.codegen import (Codec, Struct, builtin, text, "
+            "typed, unknown)")
+        s.append("")
+        for tag, name in sorted(self.__builtins.items()):
+            s.append("%s = builtin(%r)" % (name, tag))
+        s.append("")
+        s.append("TYPES = {}")
+        for enum in sorted(self.__enums.values(), key=lambda e: e[0]):
+            s.append("")
+            s.append(enum[1])
+        for code in self.__generated:
+            s.append("")
+            s.append(code)
+        s.append("")
+        s.append("")
+        s.append(operations)
+        return "\n".join(s) + "\n"
+
+    def __operations(self):
+        """Generate the operation unmarshalling functions & codecs."""
+        s = []
+        codecs = []
+        done = set()
+        for service in self.wsdl.services:
+            for port in service.ports:
+                for name, method in sorted(port.methods.items()):
+                    if name in done:
+                        continue
+                    done.add(name)
+                    fn = self.__unmarshaller(method)
+                    if fn is None:
+                        codecs.append("    %r: Codec()," % (str(name),))
+                        continue
+                    s.append(fn)
+                    s.append("")
+                    s.append("")
+                    codecs.append("    %r: Codec(unmarshal=%s)," % (str(name),
+                        self.__fn_name(method.name, "reply")))
+        s.append("OPERATIONS = {")
+        s.extend(codecs)
+        s.append("}")
+        return "\n".join(s)
+
+    def __unmarshaller(self, method):
+        """Generate an operation's reply unmarshalling function if possible."""
+        binding = method.binding.output
+        if method.soap.output.body.use != "literal":
+            return
+        rtypes = binding.returned_types(method)
+        if len(rtypes) != 1:
+            return
+        rt = rtypes[0]
+        resolved = rt.resolve(nobuiltin=True)
+        cls = self.__class_for(resolved)
+        if cls is None:
+            return
+        s = []
+        s.append("def %s(nodes):" % (self.__fn_name(method.name, "reply"),))
+        call = "typed(node, _u_%s, TYPES)" % (cls,)
+        if rt.multi_occurrence():
+            s.append("    return [%s for node in nodes]" % (call,))
+        else:
+            s.append("    for node in nodes:")
+            s.append("        return %s" % (call,))
+        return "\n".join(s)
+
+    def __class_for(self, sx):
+        """Get the generated class name for a complex type, if any."""
+        if not self.__complex(sx):
+            return
+        key = id(sx)
+        if key not in self.__classes:
+            if sx.name is None:
+                return
+            self.__class(sx, sx.name)
+        return self.__classes[key][0]
+
+    def __class(self, sx, name):
+        """Register a class for a complex type, generated later."""
+        key = id(sx)
+        if key in self.__classes:
+            return self.__classes[key][0]
+        cls = self.__unique(name)
+        self.__classes[key] = (cls, sx)
+        self.__pending.append(key)
+        return cls
+
+    def __emit(self, key):
+        """Generate a registered class, after the class it derives from."""
+        if key in self.__emitted:
+            return
+        self.__emitted.add(key)
+        cls, sx = self.__classes[key]
+        self.__generated.append(self.__class_code(sx, cls))
+
+    def __class_code(self, sx, cls):
+        """Generate a complex type class & its unmarshalling function."""
+        named = id(sx) in self.__named
+        base = self.__base(sx)
+        basecls = "Struct"
+        inherited = ()
+        if base is not None:
+            basecls = self.__class(base, base.name)
+            self.__emit(id(base))
+            inherited = [f[0] for f in self.__fields(base)]
+        fields = self.__fields(sx)
+        own = [f[0] for f in fields if f[0] not in inherited]
+        choice = [f[0] for f in fields if f[3]]
+        any = False
+        for child, ancestry in sx.resolve():
+            if child.any():
+                any = True
+        s = []
+        s.append("")
+        s.append("class %s(%s):" % (cls, basecls))
+        if named:
+            s.append('    """Complex type {%s}%s."""' % (sx.namespace()[1],
+                sx.name))
+        else:
+            s.append('    """Anonymous complex type of element <%s/>."""' % (
+                sx.name,))
+        s.append("")
+        s.append("    __slots__ = %s" % (self.__tuple(own),))
+        s.append("    __fields__ = %s" % (self.__tuple([f[0] for f in
+            fields]),))
+        if named:
+            s.append("    __sxtype__ = %r" % (self.__qname(sx),))
+        s.append("    __sxname__ = %r" % (str(sx.name),))
+        if choice:
+            s.append("    __choice__ = %s" % (self.__tuple(choice),))
+        names = [(f[0], self.__key(f[1])) for f in fields]
+        names = [(name, key) for name, key in names if name != key]
+        if names:
+            s.append("    __names__ = {%s}" % (", ".join("%r: %r" % x for x
+                in names),))
+        if fields:
+            s.append("")
+            params = ", ".join("%s=None" % (f[0],) for f in fields)
+            s.append("    def __init__(self, %s):" % (params,))
+            for f in fields:
+                if f[2]:
+                    s.append("        self.%s = [] if %s is None else %s" % (
+                        f[0], f[0], f[0]))
+                else:
+                    s.append("        self.%s = %s" % (f[0], f[0]))
+        s.append("")
+        s.append("")
+        s.append("def _u_%s(node):" % (cls,))
+        s.append("    obj = %s()" % (cls,))
+        attributes = [f for f in fields if f[1].isattr()]
+        elements = [f for f in fields if not f[1].isattr()]
+        for f in attributes:
+            s.append("    value = node.get(%r)" % (str(f[1].name),))
+            s.append("    if value is not None:")
+            s.append("        obj.%s = %s" % (f[0], self.__attribute(f[1])))
+        s.append("    for child in node.children:")
+        s.append("        name = child.name")
+        keyword = "if"
+        for f in elements:
+            s.append("        %s name == %r:" % (keyword, str(f[1].name)))
+            value = self.__element(f[1], cls)
+            if f[2]:
+                s.append("            obj.%s.append(%s)" % (f[0], value))
+            else:
+                s.append("            obj.%s = %s" % (f[0], value))
+            keyword = "elif"
+        if elements:
+            s.append("        else:")
+            s.append("            unknown(child, %r)" % (any,))
+        else:
+            s.append("        unknown(child, %r)" % (any,))
+        s.append("    return obj")
+        if named:
+            s.append("")
+            s.append("")
+            s.append("TYPES[%r] = _u_%s" % (self.__qname(sx), cls))
+        return "\n".join(s)
+
+    def __fields(self, sx):
+        """
+        Get the fields of a complex type.
+
+        Each field is a (name, schema object, multi occurrence, choice) tuple.
+
+        """
+        result = []
+        names = set()
+        for child, ancestry in sx.resolve():
+            if child.name is None or child.any():
+                continue
+            if child.isattr():
+                name = "_%s" % (child.name,)
+            else:
+                name = reserved.get(child.name, child.name)
+            name = self.__identifier(name)
+            if name in names:
+                continue
+            names.add(name)
+            choice = any(a.choice() for a in ancestry)
+            result.append((name, child, child.multi_occurrence(), choice))
+        return result
+
+    @staticmethod
+    def __key(sx):
+        """Get the suds object key of a complex type's child."""
+        if sx.isattr():
+            return "_%s" % (sx.name,)
+        return str(sx.name)
+
+    def __base(self, sx):
+        """Get the complex base type a complex type extends, if any."""
+        if not sx.extension():
+            return
+        for content in sx.rawchildren:
+            for x in content.rawchildren:
+                if isinstance(x, Extension) and x.ref is not None:
+                    base = self.schema.types.get(x.ref)
+                    if base is not None and self.__complex(base):
+                        return base
+
+    def __attribute(self, sx):
+        """Generate code translating an attribute value."""
+        resolved = sx.resolve()
+        if resolved.builtin():
+            return "%s(value)" % (self.__builtin(resolved.name),)
+        return "value"
+
+    def __element(self, sx, parent):
+        """Generate code unmarshalling a child element."""
+        resolved = sx.resolve()
+        if resolved.builtin():
+            return "text(child, %s, True)" % (self.__builtin(resolved.name),)
+        if self.__complex(resolved):
+            cls = self.__class_for(resolved)
+            if cls is None:
+                cls = self.__class(resolved, "%s_%s" % (parent, sx.name))
+            return "typed(child, _u_%s, TYPES)" % (cls,)
+        return "text(child, str, %r)" % (bool(sx.nillable),)
+
+    def __enum(self, sx):
+        """Generate a class holding enumeration constants."""
+        cls = self.__unique(sx.name)
+        s = []
+        s.append("")
+        s.append("class %s:" % (cls,))
+        s.append('    """Enumeration type {%s}%s."""' % (sx.namespace()[1],
+            sx.name))
+        s.append("")
+        names = set()
+        for e, a in sx.children():
+            name = self.__identifier(e.name)
+            while name in names:
+                name += "_"
+            names.add(name)
+            s.append("    %s = %r" % (name, str(e.name)))
+        self.__enums[id(sx)] = (cls, "\n".join(s))
+
+    def __builtin(self, tag):
+        """Get the name of the generated builtin translation function."""
+        name = self.__builtins.get(tag)
+        if name is None:
+            name = "_%s" % (self.__identifier(tag),)
+            self.__builtins[tag] = name
+        return name
+
+    @staticmethod
+    def __complex(sx):
+        """Get whether a schema object represents a complex type."""
+        if sx.builtin() or sx.enum():
+            return False
+        if isinstance(sx, SchemaElement):
+            return sx.resolve() is sx and len(sx) > 0
+        return isinstance(sx, Complex) and not sx.mixed()
+
+    def __fn_name(self, name, suffix):
+        return "_%s_%s" % (self.__identifier(name), suffix)
+
+    def __unique(self, name):
+        """Get a unique valid class name based on the given name."""
+        name = self.__identifier(name)
+        if name[0].islower():
+            name = name[0].upper() + name[1:]
+        result = name
+        n = 1
+        while result in self.__names:
+            n += 1
+            result = "%s%d" % (name, n)
+        self.__names.add(result)
+        return result
+
+    @staticmethod
+    def __identifier(name):
+        """Convert a name into a valid Python identifier."""
+        result = re.sub(r"\W", "_", str(name))
+        if not result or result[0].isdigit():
+            result = "_" + result
+        if keyword.iskeyword(result):
+            result += "_"
+        return result
+
+    @staticmethod
+    def __qname(sx):
+        return str(sx.name), str(sx.namespace()[1])
+
+    @staticmethod
+    def __sortkey(item):
+        qname = item[0]
+        return (qname[0] or "", qname[1] or "")
+
+    @staticmethod
+    def __tuple(names):
+        if len(names) == 1:
+            return "(%r,)" % (names[0],)
+        return "(%s)" % (", ".join(repr(n) for n in names),)
+
+
+def generate(wsdl):
+    """
+    Generate Python source code for the types & operations defined by a WSDL.
+
+    @param wsdl: The WSDL.
+    @type wsdl: L{suds.wsdl.Definitions}
+    @return: Python source code.
+    @rtype: str
+
+    """
+    return Generator(wsdl).generate()
+
+
+def main(argv=None):
+    import argparse
+    from suds.client import Client
+    parser = argparse.ArgumentParser(prog="python -m suds.codegen",
+        description="Generate a Python module with classes & codecs for the "
+        "types & operations defined by a WSDL.")
+    parser.add_argument("url", help="WSDL URL")
+    parser.add_argument("-o", "--output", required=True, help="module file")
+    args = parser.parse_args(argv)
+    client = Client(args.url, cache=None)
+    f = open(args.output, "w")
+    try:
+        f.write(generate(client.wsdl))
+    finally:
+        f.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
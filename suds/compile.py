@@ -0,0 +1,153 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Offline WSDL precompilation.
+
+Loads a WSDL together with all of its imported WSDL & XSD documents, builds
+its fully dereferenced & merged schema and stores the resulting WSDL object in
+a self-contained artifact file. Such an artifact may later be loaded using
+L{suds.client.Client.from_compiled()} without accessing any external documents
+and without any XML parsing.
+
+Usage::
+
+    python -m suds.compile <wsdl-url> -o <artifact>
+
+"""
+
+import suds
+from suds.options import Options
+from suds.properties import Unskin
+from suds.wsdl import Definitions
+
+import pickle
+import sys
+
+from logging import getLogger
+log = getLogger(__name__)
+
+
+# Identifies the artifact content format, bumped on incompatible changes.
+FORMAT = 1
+
+
+class CompiledError(Exception):
+    def __init__(self, path, reason):
+        Exception.__init__(self, "Can not load compiled WSDL '%s': %s" % (path,
+            reason))
+
+
+def compile_wsdl(url, path, **kwargs):
+    """
+    Compile the WSDL at the given URL into an artifact file.
+
+    @param url: The WSDL URL.
+    @type url: str
+    @param path: The artifact file path.
+    @type path: str
+    @param kwargs: Options used for loading the WSDL, e.g. I{documentStore},
+        I{transport}, I{doctor} or I{plugins}.
+    @see: L{Options}
+    @return: The compiled WSDL object.
+    @rtype: L{Definitions}
+
+    """
+    options = Options()
+    if "transport" not in kwargs:
+        import suds.transport.https
+        options.transport = suds.transport.https.HttpAuthenticated()
+    Unskin(options).update(kwargs)
+    wsdl = Definitions(url, options)
+    save(wsdl, path)
+    return wsdl
+
+
+def save(wsdl, path):
+    """
+    Store a loaded WSDL object into an artifact file.
+
+    Options the WSDL object was loaded with are not stored, see
+    L{Definitions.__getstate__()}, as they may refer to environment specific
+    objects, e.g. transports or caches.
+
+    @param wsdl: The WSDL object.
+    @type wsdl: L{Definitions}
+    @param path: The artifact file path.
+    @type path: str
+
+    """
+    artifact = dict(format=FORMAT, version=suds.__version__, url=wsdl.url,
+        wsdl=wsdl)
+    f = open(path, "wb")
+    try:
+        pickle.dump(artifact, f, pickle.HIGHEST_PROTOCOL)
+    finally:
+        f.close()
+    log.debug("WSDL at '%s' compiled into: %s", wsdl.url, path)
+
+
+def load(path, options):
+    """
+    Load a WSDL object from an artifact file.
+
+    @param path: The artifact file path.
+    @type path: str
+    @param options: Options to be used by the loaded WSDL object.
+    @type options: L{Options}
+    @return: The loaded WSDL object.
+    @rtype: L{Definitions}
+    @raise CompiledError: The artifact can not be used.
+
+    """
+    f = open(path, "rb")
+    try:
+        artifact = pickle.load(f)
+    finally:
+        f.close()
+    if not isinstance(artifact, dict) or artifact.get("format") != FORMAT:
+        raise CompiledError(path, "unsupported artifact format")
+    if artifact.get("version") != suds.__version__:
+        raise CompiledError(path, "compiled using suds %s" % (
+            artifact.get("version"),))
+    wsdl = artifact["wsdl"]
+    for d in _definitions(wsdl):
+        d.options = options
+    return wsdl
+
+
+def _definitions(wsdl):
+    """Return the given WSDL object and all of its imported WSDL objects."""
+    result = [wsdl]
+    for d in result:
+        for imp in d.imports:
+            if imp.imported is not None and imp.imported not in result:
+                result.append(imp.imported)
+    return result
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m suds.compile",
+        description="Compile a WSDL into a self-contained artifact loadable "
+        "using suds.client.Client.from_compiled().")
+    parser.add_argument("url", help="WSDL URL")
+    parser.add_argument("-o", "--output", required=True, help="artifact file")
+    args = parser.parse_args(argv)
+    compile_wsdl(args.url, args.output, cache=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+The I{diagnostics} module provides memory usage accounting & WSDL loading
+profiling.
+
+L{memory()} walks the object graph reachable from the given objects, e.g. a
+loaded client's WSDL or an unmarshalled reply, and reports object counts and
+approximate sizes per L{CATEGORIES} category. Each object is counted once,
+under its own category or, for plain containers & values, under the category
+of the object it was first reached from. Sizes are as reported by
+I{sys.getsizeof()} and so do not include allocator overhead.
+
+L{LoadProfiler} is a L{suds.tracing.Tracer}, registered using the I{tracer}
+option, accounting for the time & memory spent in each WSDL loading stage
+and reporting the most expensive documents, schema types & WSDL objects.
+"""
+
+from suds import *
+from suds.tracing import Tracer
+
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+
+# Memory usage categories, see L{category()}.
+CATEGORIES = (
+    "wsdl",     # WSDL definitions, bindings & service definitions
+    "schema",   # XSD schema objects
+    "xml",      # raw XML elements, attributes, documents & text
+    "objects",  # suds objects, e.g. unmarshalled replies
+    "caches",   # objects held by lookup & processing caches
+    "other")
+
+# Attributes holding caches, their content counted as L{CATEGORIES} 'caches'.
+CACHES = frozenset(("engines", "resolved_cache"))
+
+# Objects never walked into: shared Python objects & code.
+_skipped = (type, types.ModuleType, types.FunctionType, types.MethodType,
+    types.BuiltinFunctionType, types.CodeType, types.FrameType,
+    types.GetSetDescriptorType, types.MemberDescriptorType, bool, type(None))
+
+_classes = []
+
+
+def classes():
+    """
+    Get the classes determining the L{CATEGORIES} of objects.
+    @return: (class tuple, category) pairs, in lookup order.
+    @rtype: list
+    """
+    if not _classes:
+        from suds.bindings.binding import Binding
+        from suds.sax.attribute import Attribute
+        from suds.sax.document import Document
+        from suds.sax.element import Element
+        from suds.sax.text import Text
+        from suds.servicedefinition import ServiceDefinition
+        from suds.sudsobject import Facade, Metadata, Object
+        from suds.wsdl import WObject
+        from suds.xsd.schema import Schema, SchemaCollection
+        from suds.xsd.sxbase import SchemaObject
+        _classes.extend((
+            ((Element, Attribute, Document, Text), "xml"),
+            ((SchemaObject, Schema, SchemaCollection), "schema"),
+            ((WObject, Binding, ServiceDefinition), "wsdl"),
+            ((Metadata, Facade), None),
+            ((Object,), "objects")))
+    return _classes
+
+
+def category(object):
+    """
+    Get the category of an object.
+    @param object: An object.
+    @return: The object's L{CATEGORIES} category, None for objects counted
+        under the category of the object referencing them.
+    @rtype: str
+    """
+    for cls, name in classes():
+        if isinstance(object, cls):
+            return name
+
+
+class Report:
+    """
+    A memory usage report.
+    @ivar categories: Object count & total size [bytes] by category.
+    @type categories: {str: [int, int]}
+    @ivar types: Object count & total size [bytes] by type name.
+    @type types: {str: [int, int]}
+    """
+
+    def __init__(self):
+        self.categories = dict((name, [0, 0]) for name in CATEGORIES)
+        self.types = {}
+
+    def add(self, category, object, size):
+        """
+        Count an object.
+        @param category: The object's category.
+        @type category: str
+        @param object: The object.
+        @param size: The object's size [bytes].
+        @type size: int
+        """
+        counts = self.categories[category]
+        counts[0] += 1
+        counts[1] += size
+        name = type(object).__name__
+        counts = self.types.get(name)
+        if counts is None:
+            counts = self.types[name] = [0, 0]
+        counts[0] += 1
+        counts[1] += size
+
+    def total(self):
+        """
+        Get the total object count & size.
+        @return: (count, size [bytes]) pair.
+        @rtype: tuple
+        """
+        return (sum(c for c, s in self.categories.values()),
+            sum(s for c, s in self.categories.values()))
+
+    def top(self, n=10):
+        """
+        Get the types taking up the most memory.
+        @param n: The number of types to get.
+        @type n: int
+        @return: (type name, count, size [bytes]) tuples, largest first.
+        @rtype: list
+        """
+        items = sorted(self.types.items(), key=lambda x: (-x[1][1], x[0]))
+        return [(name, c, s) for name, (c, s) in items[:n]]
+
+    def __str__(self):
+        s = ["%-12s %10s %12s" % ("category", "objects", "bytes")]
+        for name in CATEGORIES:
+            count, size = self.categories[name]
+            s.append("%-12s %10d %12d" % (name, count, size))
+        s.append("%-12s %10d %12d" % (("total",) + self.total()))
+        s.append("")
+        s.append("%-24s %10s %12s" % ("type", "objects", "bytes"))
+        for name, count, size in self.top():
+            s.append("%-24s %10d %12d" % (name, count, size))
+        return "\n".join(s)
+
+
+def memory(*roots, exclude=()):
+    """
+    Account for the memory used by the objects reachable from the given
+    root objects.
+
+    Classes, modules, functions & code are not walked into, so objects
+    referenced only from those, e.g. module level caches, are not counted.
+
+    @param roots: The root objects.
+    @param exclude: Objects not to account for, together with all the
+        objects reachable from them, e.g. the WSDL referenced from suds
+        objects unmarshalled from a reply.
+    @type exclude: list
+    @return: The memory usage report.
+    @rtype: L{Report}
+    """
+    report = Report()
+    seen = set()
+    for x in _walk(exclude, seen):
+        pass
+    for object, name, size in _walk(roots, seen):
+        report.add(name, object, size)
+    return report
+
+
+def _walk(roots, seen):
+    """
+    Walk the object graph reachable from the given root objects, depth
+    first, skipping objects already seen.
+    @return: Generator yielding (object, category, size [bytes]) tuples.
+    @rtype: generator
+    """
+    stack = [(root, "other") for root in reversed(roots)]
+    while stack:
+        object, owner = stack.pop()
+        if id(object) in seen or isinstance(object, _skipped):
+            continue
+        seen.add(id(object))
+        name = category(object) or owner
+        size = sys.getsizeof(object)
+        children = []
+        d = getattr(object, "__dict__", None)
+        if type(d) is dict:
+            seen.add(id(d))
+            size += sys.getsizeof(d)
+            for key, value in d.items():
+                children.append((value, "caches" if key in CACHES and name !=
+                    "objects" else name))
+        if isinstance(object, dict):
+            for key, value in object.items():
+                children.append((key, name))
+                children.append((value, name))
+        else:
+            children.extend((x, name) for x in gc.get_referents(object))
+        yield object, name, size
+        stack.extend(reversed(children))
+
+
+class Cost:
+    """
+    The time & memory spent loading a WSDL document, schema type or WSDL
+    object, or in a WSDL loading stage.
+    @ivar count: The number of traced spans accounted for.
+    @type count: int
+    @ivar time: The time spent [ns].
+    @type time: int
+    @ivar memory: The memory allocated & not yet released [bytes], 0 unless
+        tracing memory allocations.
+    @type memory: int
+    @ivar phases: Time [ns] & memory [bytes] spent by span name.
+    @type phases: {str: [int, int]}
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0
+        self.memory = 0
+        self.phases = {}
+
+    def add(self, name, time, memory):
+        """
+        Account for a traced span's own cost, excluding its enclosed spans.
+        @param name: The span name.
+        @type name: str
+        @param time: The time spent [ns].
+        @type time: int
+        @param memory: The memory allocated [bytes].
+        @type memory: int
+        """
+        self.count += 1
+        self.time += time
+        self.memory += memory
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = [0, 0]
+        phase[0] += time
+        phase[1] += memory
+
+
+class LoadProfiler(Tracer):
+    """
+    A tracer profiling WSDL loading, see L{suds.tracing}.
+
+    Each traced span's own time & memory, i.e. excluding its enclosed spans,
+    gets accounted for under its span name, under the document being loaded,
+    i.e. the URL of the nearest enclosing span with one, and under the schema
+    type or WSDL object being processed, if any.
+
+    @ivar phases: Cost by span name.
+    @type phases: {str: L{Cost}}
+    @ivar documents: Cost by document URL.
+    @type documents: {str: L{Cost}}
+    @ivar types: Cost by top level schema type.
+    @type types: {str: L{Cost}}
+    @ivar objects: Cost by WSDL object, e.g. binding or port type.
+    @type objects: {str: L{Cost}}
+    """
+
+    def __init__(self, memory=False):
+        """
+        @param memory: Whether to trace memory allocations using
+            I{tracemalloc}, started & stopped around each outermost traced
+            span unless already tracing.
+        @type memory: bool
+        """
+        self.memory = memory
+        self.phases = {}
+        self.documents = {}
+        self.types = {}
+        self.objects = {}
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    def start(self, name, attributes):
+        stack = self.__stack()
+        url = attributes and attributes.get("url")
+        if url is None and stack:
+            url = stack[-1][2]
+        if not stack:
+            self.__local.tracing = self.memory and not tracemalloc.is_tracing()
+            if self.__local.tracing:
+                tracemalloc.start()
+        span = [name, attributes, url, time.perf_counter_ns(),
+            self.__allocated(), 0, 0]
+        stack.append(span)
+        return span
+
+    def end(self, span, error):
+        ended = time.perf_counter_ns()
+        allocated = self.__allocated()
+        stack = self.__stack()
+        if not stack or stack[-1] is not span:
+            return
+        stack.pop()
+        name, attributes, url, started, before, children, children_memory = (
+            span)
+        elapsed = ended - started
+        memory = allocated - before
+        if stack:
+            stack[-1][5] += elapsed
+            stack[-1][6] += memory
+        elif self.__local.tracing:
+            tracemalloc.stop()
+        elapsed -= children
+        memory -= children_memory
+        with self.__lock:
+            self.__cost(self.phases, name).add(name, elapsed, memory)
+            if url is not None:
+                self.__cost(self.documents, url).add(name, elapsed, memory)
+            if attributes:
+                if "type" in attributes:
+                    self.__cost(self.types, attributes["type"]).add(name,
+                        elapsed, memory)
+                if "object" in attributes:
+                    self.__cost(self.objects, attributes["object"]).add(name,
+                        elapsed, memory)
+
+    def reset(self):
+        """
+        Discard all the accounted costs.
+        """
+        with self.__lock:
+            self.phases = {}
+            self.documents = {}
+            self.types = {}
+            self.objects = {}
+
+    def top(self, costs, n=10):
+        """
+        Get the most expensive entries of an accounted cost table.
+        @param costs: The cost table, e.g. L{documents} or L{types}.
+        @type costs: {str: L{Cost}}
+        @param n: The number of entries to get.
+        @type n: int
+        @return: (key, L{Cost}) pairs, most time consuming first.
+        @rtype: list
+        """
+        items = sorted(costs.items(), key=lambda x: (-x[1].time, x[0]))
+        return items[:n]
+
+    def report(self, n=10):
+        """
+        Get a text report of the WSDL loading stages and the most expensive
+        documents, schema types & WSDL objects.
+        @param n: The number of documents, types & objects to report.
+        @type n: int
+        @return: The report.
+        @rtype: str
+        """
+        s = []
+        for title, costs, detail in (("phase", self.phases, False),
+                ("document", self.documents, True),
+                ("type", self.types, False), ("object", self.objects, False)):
+            if not costs:
+                continue
+            if s:
+                s.append("")
+            s.append(self.__row(title, "spans", "time [ms]", "memory [kB]"))
+            for key, cost in self.top(costs, len(costs) if costs is
+                    self.phases else n):
+                s.append(self.__row(key, "%d" % (cost.count,), "%.3f" % (
+                    cost.time / 1e6,), "%.1f" % (cost.memory / 1024.0,)))
+                if detail:
+                    phases = sorted(cost.phases.items(), key=lambda x: (
+                        -x[1][0], x[0]))
+                    for name, (t, m) in phases:
+                        s.append(self.__row("  " + name, "", "%.3f" % (
+                            t / 1e6,), "%.1f" % (m / 1024.0,)))
+        return "\n".join(s)
+
+    def __row(self, key, count, time, memory):
+        row = "%-48s %8s %12s" % (key, count, time)
+        if self.memory:
+            row += " %12s" % (memory,)
+        return row
+
+    def __allocated(self):
+        if self.memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def __stack(self):
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    @staticmethod
+    def __cost(costs, key):
+        cost = costs.get(key)
+        if cost is None:
+            cost = costs[key] = Cost()
+        return cost
@@ -17,11 +17,23 @@
 """
 The I{metrics} module defines classes and other resources
 designed for collecting and reporting performance metrics.
+
+Web service operation invocations get measured only when metric sinks are
+registered using the I{metrics} option. Each invocation is then described by
+a L{Measurement} holding the time spent in each of its processing L{PHASES}
+and the request & reply message sizes, passed to every registered L{Sink}
+once the invocation ends. An in-memory L{Aggregator} sink and a Prometheus
+text format exporter, see L{prometheus()}, are provided.
+
+A single invocation may also be profiled, see L{Profiler}, collecting its
+measurement together with its function call statistics.
 """
 
 import time
 from suds import *
+from bisect import bisect_left
 from math import modf
+from threading import Lock
 
 from logging import getLogger
 log = getLogger(__name__)
@@ -61,3 +73,446 @@ class Timer:
             return '%d.%.3d (seconds)' % jmod(m)
         m = modf(duration/60)
         return '%d.%.3d (minutes)' % jmod(m)
+
+
+# Monotonic high resolution clock used for measurements [ns].
+clock = time.perf_counter_ns
+
+# Web service operation invocation processing phases.
+PHASES = (
+    "arguments",  # argument parsing & request envelope construction
+    "marshal",  # marshalling parameter & header values into XML
+    "serialize",  # serializing the request envelope into bytes
+    "plugins",  # running message plugins
+    "network",  # sending the request & waiting for the reply
+    "parse",  # SAX parsing the reply
+    "faults",  # detecting & unmarshalling SOAP faults
+    "unmarshal")  # unmarshalling the reply
+
+
+class Measurement:
+    """
+    Metrics of a single web service operation invocation.
+
+    @ivar operation: The operation name.
+    @type operation: str
+    @ivar endpoint: The operation's endpoint URL.
+    @type endpoint: str
+    @ivar phases: Time spent in each of the invocation's L{PHASES} that
+        occurred [ns].
+    @type phases: {str: int}
+    @ivar request_bytes: The sent request size, None if not sent.
+    @type request_bytes: int
+    @ivar reply_bytes: The received reply size, None if not received.
+    @type reply_bytes: int
+    """
+
+    def __init__(self, operation, endpoint):
+        """
+        @param operation: The operation name.
+        @type operation: str
+        @param endpoint: The operation's endpoint URL.
+        @type endpoint: str
+        """
+        self.operation = operation
+        self.endpoint = endpoint
+        self.phases = {}
+        self.request_bytes = None
+        self.reply_bytes = None
+
+    def add(self, phase, started):
+        """
+        Account the time elapsed since a phase started.
+        @param phase: The phase, one of L{PHASES}.
+        @type phase: str
+        @param started: The L{clock} value when the phase started.
+        @type started: int
+        @return: The elapsed time [ns].
+        @rtype: int
+        """
+        elapsed = clock() - started
+        self.phases[phase] = self.phases.get(phase, 0) + elapsed
+        return elapsed
+
+    def record(self, sinks):
+        """
+        Pass the measurement to the given sinks.
+        @param sinks: Metric sinks.
+        @type sinks: [L{Sink},...]
+        """
+        for sink in sinks:
+            sink.record(self)
+
+    def __str__(self):
+        phases = ", ".join("%s: %.3f ms" % (phase, self.phases[phase] / 1e6)
+            for phase in PHASES if phase in self.phases)
+        return "'%s' at '%s' (%s; request: %s bytes, reply: %s bytes)" % (
+            self.operation, self.endpoint, phases, self.request_bytes,
+            self.reply_bytes)
+
+
+def measured(measurement, phase, function, *args, **kwargs):
+    """
+    Call a function, accounting its run time to a measurement's phase.
+    @param measurement: The measurement, None to just call the function.
+    @type measurement: L{Measurement}
+    @param phase: The phase, one of L{PHASES}.
+    @type phase: str
+    @param function: The function to call.
+    @type function: callable
+    @return: The function's return value.
+    """
+    if measurement is None:
+        return function(*args, **kwargs)
+    started = clock()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        measurement.add(phase, started)
+
+
+class Sink:
+    """
+    A metric sink, receiving a L{Measurement} for each web service operation
+    invocation. Sinks may be called concurrently from multiple threads.
+    """
+
+    def record(self, measurement):
+        """
+        Record an invocation's measurement.
+        @param measurement: The measurement.
+        @type measurement: L{Measurement}
+        """
+        raise NotImplementedError
+
+
+class LogSink(Sink):
+    """
+    Logs each measurement using the L{log} logger at the DEBUG level.
+    """
+
+    def record(self, measurement):
+        log.debug("invoked %s", measurement)
+
+
+class Histogram:
+    """
+    A histogram of observed values.
+    @ivar bounds: Bucket upper bounds, in ascending order.
+    @type bounds: tuple
+    @ivar buckets: Number of values observed per bucket, the last one
+        counting values above all the bounds.
+    @type buckets: [int,...]
+    @ivar count: Number of values observed.
+    @type count: int
+    @ivar sum: Sum of the values observed.
+    @type sum: float
+    """
+
+    def __init__(self, bounds):
+        """
+        @param bounds: Bucket upper bounds, in ascending order.
+        @type bounds: tuple
+        """
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        """
+        Observe a value.
+        @param value: The value.
+        @type value: int|float
+        """
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """
+        Get cumulative bucket counts.
+        @return: (upper bound, number of values observed at or below it)
+            pairs, the last one with an infinite upper bound.
+        @rtype: [(float, int),...]
+        """
+        result = []
+        total = 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.buckets):
+            total += n
+            result.append((bound, total))
+        return result
+
+
+class Aggregator(Sink):
+    """
+    An in-memory metric sink, aggregating measurements into histograms per
+    operation, endpoint & metric.
+
+    Phase durations are aggregated in seconds under their phase names,
+    message sizes in bytes under the I{request_bytes} & I{reply_bytes}
+    names.
+
+    @cvar DURATION_BOUNDS: Default phase duration histogram buckets [s].
+    @type DURATION_BOUNDS: tuple
+    @cvar SIZE_BOUNDS: Default message size histogram buckets [bytes].
+    @type SIZE_BOUNDS: tuple
+    @ivar histograms: Histograms by (operation, endpoint, metric name).
+    @type histograms: {tuple: L{Histogram}}
+    """
+
+    DURATION_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+        0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    SIZE_BOUNDS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+        16777216)
+
+    def __init__(self, duration_bounds=None, size_bounds=None):
+        """
+        @param duration_bounds: Phase duration histogram buckets [s].
+        @type duration_bounds: tuple
+        @param size_bounds: Message size histogram buckets [bytes].
+        @type size_bounds: tuple
+        """
+        if duration_bounds is None:
+            duration_bounds = self.DURATION_BOUNDS
+        if size_bounds is None:
+            size_bounds = self.SIZE_BOUNDS
+        self.duration_bounds = tuple(duration_bounds)
+        self.size_bounds = tuple(size_bounds)
+        self.histograms = {}
+        self.__lock = Lock()
+
+    def record(self, measurement):
+        operation = measurement.operation
+        endpoint = measurement.endpoint
+        with self.__lock:
+            for phase, elapsed in measurement.phases.items():
+                self.__histogram(operation, endpoint, phase,
+                    self.duration_bounds).observe(elapsed / 1e9)
+            for name in ("request_bytes", "reply_bytes"):
+                size = getattr(measurement, name)
+                if size is not None:
+                    self.__histogram(operation, endpoint, name,
+                        self.size_bounds).observe(size)
+
+    def get(self, operation, endpoint, name):
+        """
+        Get a histogram.
+        @param operation: The operation name.
+        @type operation: str
+        @param endpoint: The operation's endpoint URL.
+        @type endpoint: str
+        @param name: The metric name, a phase or a message size name.
+        @type name: str
+        @return: The histogram, None if nothing has been recorded for it.
+        @rtype: L{Histogram}
+        """
+        return self.histograms.get((operation, endpoint, name))
+
+    def items(self):
+        """
+        Get all the histograms, sorted by their keys.
+        @return: ((operation, endpoint, metric name), histogram) pairs.
+        @rtype: [(tuple, L{Histogram}),...]
+        """
+        with self.__lock:
+            return sorted(self.histograms.items(), key=lambda x: x[0])
+
+    def reset(self):
+        """
+        Discard all the recorded measurements.
+        """
+        with self.__lock:
+            self.histograms = {}
+
+    def __histogram(self, operation, endpoint, name, bounds):
+        key = (operation, endpoint, name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(bounds)
+        return histogram
+
+
+class Profile:
+    """
+    A profile of a single web service operation invocation.
+
+    @ivar measurement: The invocation's measurement, holding the time spent
+        in each of its processing phases & the request & reply sizes.
+    @type measurement: L{Measurement}
+    @ivar stats: The invocation's function call statistics, None if they
+        could not be collected, e.g. because another profiler was active.
+    @type stats: I{pstats.Stats}
+    @ivar error: The exception the invocation failed with, if any.
+    @type error: Exception
+    """
+
+    def __init__(self, measurement, stats=None, error=None):
+        self.measurement = measurement
+        self.stats = stats
+        self.error = error
+
+    def top(self, n=10, sort="cumulative"):
+        """
+        Get the functions the invocation spent the most time in.
+        @param n: The number of functions to get.
+        @type n: int
+        @param sort: Sort by 'cumulative' time, including called functions,
+            or by 'tottime', excluding them.
+        @type sort: str
+        @return: (function, calls, total [s], cumulative [s]) tuples, with
+            functions described as 'file:line(name)'.
+        @rtype: list
+        """
+        if self.stats is None:
+            return []
+        index = {"tottime": 2, "cumulative": 3}[sort]
+        items = []
+        for (file, line, name), (cc, nc, tt, ct, callers) in \
+                self.stats.stats.items():
+            items.append(("%s:%d(%s)" % (file, line, name), nc, tt, ct))
+        items.sort(key=lambda x: -x[index])
+        return items[:n]
+
+    def __str__(self):
+        s = ["profiled %s" % (self.measurement,)]
+        if self.error is not None:
+            s.append("failed: %s" % (self.error,))
+        top = self.top()
+        if top:
+            s.append("%10s %12s %12s  %s" % ("calls", "total [ms]",
+                "cum. [ms]", "function"))
+            for function, calls, total, cumulative in top:
+                s.append("%10d %12.3f %12.3f  %s" % (calls, total * 1000,
+                    cumulative * 1000, function))
+        return "\n".join(s)
+
+
+class Profiler:
+    """
+    Profiles a single web service operation invocation using I{cProfile}
+    and delivers the resulting L{Profile} to a callback, or logs it using
+    the L{log} logger at the INFO level if no callback is given.
+    @ivar measurement: The invocation's measurement.
+    @type measurement: L{Measurement}
+    @ivar callback: The callback, called with the L{Profile}.
+    @type callback: callable
+    @ivar profile: The profile, once the invocation has been run.
+    @type profile: L{Profile}
+    """
+
+    def __init__(self, measurement, callback=None):
+        self.measurement = measurement
+        self.callback = callback
+        self.profile = None
+
+    def run(self, function, *args, **kwargs):
+        """
+        Run the invocation.
+        @param function: The function running the invocation.
+        @type function: callable
+        @return: The function's return value.
+        """
+        import cProfile
+        import pstats
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active.
+            profile = None
+        error = None
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            stats = None
+            if profile is not None:
+                profile.disable()
+                stats = pstats.Stats(profile)
+            self.profile = Profile(self.measurement, stats, error)
+
+    def deliver(self):
+        """
+        Deliver the profile, once the invocation has been run & measured.
+
+        Errors raised by the callback for a failed invocation get logged
+        instead, so they do not mask the invocation's own error.
+
+        """
+        if self.profile is None:
+            return
+        if self.callback is None:
+            log.info("%s", self.profile)
+        elif self.profile.error is None:
+            self.callback(self.profile)
+        else:
+            try:
+                self.callback(self.profile)
+            except Exception:
+                log.exception("profile callback failed for %s",
+                    self.profile.measurement)
+
+
+def prometheus(aggregator, prefix="suds"):
+    """
+    Export aggregated metrics in the Prometheus text exposition format.
+
+    Phase durations are exported as the I{<prefix>_phase_seconds} histogram
+    labeled by operation, endpoint & phase, and message sizes as the
+    I{<prefix>_message_bytes} histogram labeled by operation, endpoint &
+    direction (request or reply).
+
+    @param aggregator: The aggregated metrics.
+    @type aggregator: L{Aggregator}
+    @param prefix: The metric name prefix.
+    @type prefix: str
+    @return: The exported metrics.
+    @rtype: str
+    """
+    durations = []
+    sizes = []
+    for (operation, endpoint, name), histogram in aggregator.items():
+        labels = [("operation", operation), ("endpoint", endpoint)]
+        if name.endswith("_bytes"):
+            labels.append(("direction", name[:-len("_bytes")]))
+            sizes.append((labels, histogram))
+        else:
+            labels.append(("phase", name))
+            durations.append((labels, histogram))
+    lines = []
+    for name, text, histograms in (
+            ("phase_seconds", "Web service operation invocation phase "
+                "durations.", durations),
+            ("message_bytes", "Web service operation request & reply "
+                "sizes.", sizes)):
+        if not histograms:
+            continue
+        name = "%s_%s" % (prefix, name)
+        lines.append("# HELP %s %s" % (name, text))
+        lines.append("# TYPE %s histogram" % (name,))
+        for labels, histogram in histograms:
+            for bound, n in histogram.cumulative():
+                lines.append("%s_bucket%s %d" % (name, _labels(labels + [
+                    ("le", _number(bound))]), n))
+            lines.append("%s_sum%s %s" % (name, _labels(labels),
+                _number(histogram.sum)))
+            lines.append("%s_count%s %d" % (name, _labels(labels),
+                histogram.count))
+    return "".join(line + "\n" for line in lines)
+
+
+def _labels(labels):
+    """Format Prometheus metric labels."""
+    return "{%s}" % ",".join('%s="%s"' % (name, str(value).replace("\\",
+        "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value
+        in labels)
+
+
+def _number(value):
+    """Format a Prometheus sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
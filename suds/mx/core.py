@@ -47,13 +47,17 @@ class Core:
         @param content: The content to process.
         @type content: L{Object}
         """
-        log.debug('processing:\n%s', content)
-        self.reset()
-        if content.tag is None:
-            content.tag = content.value.__class__.__name__
-        document = Document()
-        self.append(document, content)
-        return document.root()
+        if DEBUG_LOGGING:
+            log.debug('processing:\n%s', content)
+        state = self.enter()
+        try:
+            if content.tag is None:
+                content.tag = content.value.__class__.__name__
+            document = Document()
+            self.append(document, content)
+            return document.root()
+        finally:
+            self.leave(state)
 
     def append(self, parent, content):
         """
@@ -63,7 +67,8 @@ class Core:
         @param content: The content to append.
         @type content: L{Object}
         """
-        log.debug('appending parent:\n%s\ncontent:\n%s', parent, content)
+        if DEBUG_LOGGING:
+            log.debug('appending parent:\n%s\ncontent:\n%s', parent, content)
         if self.start(content):
             self.appender.append(parent, content)
             self.end(parent, content)
@@ -74,6 +79,23 @@ class Core:
         """
         pass
 
+    def enter(self):
+        """
+        Start marshalling a new document. Any per document state is set up
+        here so a marshaller may be reused, even while it is marshalling
+        another document.
+        @return: The interrupted document's state, passed to L{leave()}.
+        """
+        self.reset()
+
+    def leave(self, state):
+        """
+        Marshalling a document has ended.
+        @param state: The interrupted document's state, as returned by
+            L{enter()}.
+        """
+        pass
+
     def node(self, content):
         """
         Create and return an XML node.
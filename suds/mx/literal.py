@@ -68,6 +68,12 @@ class Typed(Core):
     def reset(self):
         self.resolver.reset()
 
+    def enter(self):
+        return self.resolver.enter()
+
+    def leave(self, state):
+        self.resolver.leave(state)
+
     def start(self, content):
         """
         Start marshalling the 'content' by ensuring that both the 'content'
@@ -76,7 +82,8 @@ class Typed(Core):
         Only values that are objects have their attributes sorted.
 
         """
-        log.debug("starting content:\n%s", content)
+        if DEBUG_LOGGING:
+            log.debug("starting content:\n%s", content)
         if content.type is None:
             name = content.tag
             if name.startswith("_"):
@@ -89,8 +96,9 @@ class Typed(Core):
             if isinstance(content.value, Object):
                 known = self.resolver.known(content.value)
                 if known is None:
-                    log.debug("object %s has no type information",
-                        content.value)
+                    if DEBUG_LOGGING:
+                        log.debug("object %s has no type information",
+                            content.value)
                     known = content.type
             frame = Frame(content.type, resolved=known)
             self.resolver.push(frame)
@@ -100,7 +108,8 @@ class Typed(Core):
         self.translate(content)
         self.sort(content)
         if self.skip(content):
-            log.debug("skipping (optional) content:\n%s", content)
+            if DEBUG_LOGGING:
+                log.debug("skipping (optional) content:\n%s", content)
             self.resolver.pop()
             return False
         return True
@@ -133,7 +142,8 @@ class Typed(Core):
         since for list processing we play games with the resolver stack.
 
         """
-        log.debug("ending content:\n%s", content)
+        if DEBUG_LOGGING:
+            log.debug("ending content:\n%s", content)
         current = self.resolver.top().type
         if current != content.type:
             raise Exception("content (end) mismatch: top=(%s) cont=(%s)" % (
@@ -156,7 +166,8 @@ class Typed(Core):
         else:
             node = Element(content.tag)
         self.encode(node, content)
-        log.debug("created - node:\n%s", node)
+        if DEBUG_LOGGING:
+            log.debug("created - node:\n%s", node)
         return node
 
     def setnil(self, node, content):
@@ -18,12 +18,12 @@
 Suds basic options classes.
 """
 
-from suds.cache import Cache, NoCache
 from suds.properties import *
-from suds.store import DocumentStore, defaultDocumentStore
+from suds.tracing import Tracer
 from suds.transport import Transport
-from suds.wsse import Security
-from suds.xsd.doctor import Doctor
+
+from collections.abc import Callable
+from copy import copy, deepcopy
 
 
 class TpLinker(AutoLinker):
@@ -40,19 +40,31 @@ class TpLinker(AutoLinker):
             tp = Unskin(next.options)
             properties.link(tp)
 
+    def linked(self, value):
+        if isinstance(value, Transport):
+            return Unskin(value.options)
+
+    def detached(self, value):
+        if getattr(value.__class__, "__deepcopy__", None) is not None:
+            return deepcopy(value)
+        clone = copy(value)
+        clone.options = value.options.__class__()
+        Unskin(clone.options).update(Unskin(value.options))
+        return clone
+
 
 class Options(Skin):
     """
     Options:
         - B{cache} - The XML document cache. May be set to None for no caching.
-                - type: L{Cache}
-                - default: L{NoCache()}
+                - type: L{suds.cache.Cache}
+                - default: L{suds.cache.NoCache()}
         - B{documentStore} - The XML document store used to access locally
             stored documents without having to download them from an external
             location. May be set to None for no internal suds library document
             store.
-                - type: L{DocumentStore}
-                - default: L{defaultDocumentStore}
+                - type: L{suds.store.DocumentStore}
+                - default: L{suds.store.defaultDocumentStore}
         - B{extraArgumentErrors} - Raise exceptions when unknown message parts
             are detected when receiving a web service reply, compared to the
             operation's WSDL schema definition.
@@ -84,10 +96,10 @@ class Options(Skin):
                 - type: I{any}
                 - default: None
         - B{wsse} - The web services I{security} provider object.
-                - type: L{Security}
+                - type: L{suds.wsse.Security}
                 - default: None
         - B{doctor} - A schema I{doctor} object.
-                - type: L{Doctor}
+                - type: L{suds.xsd.doctor.Doctor}
                 - default: None
         - B{xstq} - The B{x}ml B{s}chema B{t}ype B{q}ualified flag indicates
             that the I{xsi:type} attribute values should be qualified by
@@ -133,8 +145,69 @@ class Options(Skin):
             Enabled by default for historical purposes.
                 - type: I{bool}
                 - default: True
+        - B{reply_model} - The data structures replies get unmarshalled into.
+                - type: I{str}
+                  - 'object' = suds objects.
+                  - 'dict' = Plain dictionaries & lists, the same as
+                    converting suds objects using
+                    L{suds.sudsobject.recursive_asdict()}.
+                  - 'columns' = Repeated flat records as columns by field
+                    name, other replies as suds objects. See
+                    L{suds.umx.columnar}.
+                  - 'lazy' = suds objects unmarshalling their child elements
+                    on first access. See L{suds.umx.lazy}.
+                - default: 'object'
+        - B{codecs} - Per-operation codecs, keyed by operation name, used
+            instead of the generic marshalling & unmarshalling engine. See
+            L{suds.codegen}.
+                - type: I{dict}
+                - default: {}
+        - B{projections} - Per-operation reply field projections, keyed by
+            operation name. Each projection is a list of dotted field paths,
+            e.g. ['items.id', 'items.price'], relative to the returned value.
+            Reply content outside the projection is skipped when
+            unmarshalling. May be overridden for a single call using the
+            I{__fields} keyword argument.
+                - type: I{dict}
+                - default: {}
+        - B{metrics} - Metric sinks receiving a measurement of each web
+            service operation invocation. Invocations are not measured when
+            no sinks are registered. See L{suds.metrics}.
+                - type: I{list}
+                - default: I{list()}
+        - B{tracer} - A tracer notified of the web service operation
+            invocation & WSDL loading stages. See L{suds.tracing}.
+                - type: L{suds.tracing.Tracer}
+                - default: None
+        - B{profile} - Profile each web service operation invocation using
+            I{cProfile}. Either a callable receiving each invocation's
+            L{suds.metrics.Profile} or True to log them using the
+            I{suds.metrics} logger at the INFO level. May be overridden for
+            a single call using the I{__profile} keyword argument.
+                - type: I{bool}|I{callable}
+                - default: False
+        - B{retention} - The sent & received SOAP messages retained for
+            L{suds.client.Client.last_sent()},
+            L{suds.client.Client.last_received()} &
+            L{suds.client.Client.exchanges()}, per client & thread.
+                - type: I{str}|I{int}
+                  - 'off' = Nothing retained.
+                  - 'last' = The last request document & reply element tree.
+                  - 'bytes' = The last request & reply raw XML content,
+                    parsed again when requested.
+                  - I{N} = The raw XML content of the last I{N} exchanges.
+                - default: 'bytes'
+            Before this option was added, the parsed documents were always
+            retained, i.e. 'last', and L{suds.client.Client.messages} held
+            them instead of their raw XML content.
     """
     def __init__(self, **kwargs):
+        # Imported here so that importing suds.client does not load the
+        # document store, WS-Security, XSD schema & cache modules.
+        from suds.cache import Cache, NoCache
+        from suds.store import DocumentStore, defaultDocumentStore
+        from suds.wsse import Security
+        from suds.xsd.doctor import Doctor
         domain = __name__
         definitions = [
             Definition('cache', Cache, NoCache()),
@@ -158,5 +231,42 @@ class Options(Skin):
             Definition('plugins', (list, tuple), []),
             Definition('nosend', bool, False),
             Definition('unwrap', bool, True),
-            Definition('sortNamespaces', bool, True)]
+            Definition('sortNamespaces', bool, True),
+            Definition('codecs', dict, {}),
+            Definition('reply_model', str, 'object',
+                validator=_reply_model),
+            Definition('projections', dict, {}),
+            Definition('metrics', (list, tuple), []),
+            Definition('tracer', Tracer, None),
+            Definition('profile', (bool, Callable), False),
+            Definition('retention', (str, int), 'bytes',
+                validator=_retention)]
         Skin.__init__(self, domain, definitions, kwargs)
+
+
+def _reply_model(value):
+    """
+    Validate a I{reply_model} option value.
+    @param value: The value.
+    @type value: str
+    @raise ValueError: When I{value} is not a known reply model.
+    """
+    if value not in ('columns', 'dict', 'lazy', 'object'):
+        raise ValueError("unknown reply model %r, expected one of: columns, "
+            "dict, lazy, object" % (value,))
+
+
+def _retention(value):
+    """
+    Validate a I{retention} option value.
+    @param value: The value.
+    @type value: str|int
+    @raise ValueError: When I{value} is not a known retention policy.
+    """
+    if isinstance(value, str):
+        if value in ('off', 'last', 'bytes'):
+            return
+    elif value.__class__ is int and value > 0:
+        return
+    raise ValueError("unknown retention policy %r, expected 'off', 'last', "
+        "'bytes' or a positive number of exchanges" % (value,))
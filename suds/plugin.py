@@ -196,10 +196,17 @@ class PluginContainer:
     """
     Plugin container provides easy method invocation.
 
+    Plugin hooks get compiled into per-domain lists of bound plugin methods
+    when the container is constructed. Hooks not overridden by any of the
+    plugins are skipped entirely. Compiled containers are shared using
+    L{compiled()}.
+
     @ivar plugins: A list of plugin objects.
     @type plugins: [L{Plugin},]
     @cvar ctxclass: A dict of plugin method / context classes.
     @type ctxclass: dict
+    @cvar cache: Compiled containers by their plugins' identities.
+    @type cache: dict
 
     """
 
@@ -208,6 +215,9 @@ class PluginContainer:
         'document': (DocumentContext, DocumentPlugin),
         'message': (MessageContext, MessagePlugin)}
 
+    cache = {}
+    cache_size = 64
+
     def __init__(self, plugins):
         """
         @param plugins: A list of plugin objects.
@@ -215,14 +225,36 @@ class PluginContainer:
 
         """
         self.plugins = plugins
+        for name, (ctx, pclass) in self.domains.items():
+            domain_plugins = [p for p in plugins if isinstance(p, pclass)]
+            self.__dict__[name] = PluginDomain(ctx, domain_plugins, pclass)
+
+    @classmethod
+    def compiled(cls, plugins):
+        """
+        Get a compiled container for the given plugins.
+
+        The container is reused for as long as the same plugin objects are
+        given in the same order. Cached containers keep their plugins alive
+        so their identities can not get reused by other objects.
+
+        @param plugins: A list of plugin objects.
+        @type plugins: [L{Plugin},]
+        @return: The plugin container.
+        @rtype: L{PluginContainer}
+
+        """
+        key = tuple(map(id, plugins))
+        container = cls.cache.get(key)
+        if container is None:
+            container = cls(list(plugins))
+            if len(cls.cache) >= cls.cache_size:
+                cls.cache.clear()
+            cls.cache[key] = container
+        return container
 
     def __getattr__(self, name):
-        domain = self.domains.get(name)
-        if not domain:
-            raise Exception('plugin domain (%s), invalid' % (name,))
-        ctx, pclass = domain
-        plugins = [p for p in self.plugins if isinstance(p, pclass)]
-        return PluginDomain(ctx, plugins)
+        raise Exception('plugin domain (%s), invalid' % (name,))
 
 
 class PluginDomain:
@@ -236,9 +268,22 @@ class PluginDomain:
 
     """
 
-    def __init__(self, ctx, plugins):
+    def __init__(self, ctx, plugins, pclass=None):
+        """
+        @param ctx: A context class.
+        @type ctx: L{Context}
+        @param plugins: A list of plugins (targets).
+        @type plugins: list
+        @param pclass: The domain's plugin base class, its hooks get
+            compiled up front.
+        @type pclass: L{Plugin}
+
+        """
         self.ctx = ctx
         self.plugins = plugins
+        if pclass is not None:
+            for name in hooks(pclass):
+                self.__dict__[name] = Method(name, self)
 
     def __getattr__(self, name):
         return Method(name, self)
@@ -248,10 +293,15 @@ class Method:
     """
     Plugin method.
 
+    Evaluates as False if none of the domain's plugins override the hook, in
+    which case callers may skip calling it and constructing its context.
+
     @ivar name: The method name.
     @type name: str
     @ivar domain: The plugin domain.
     @type domain: L{PluginDomain}
+    @ivar methods: The plugins' bound hook methods.
+    @type methods: [callable,]
 
     """
 
@@ -265,12 +315,40 @@ class Method:
         """
         self.name = name
         self.domain = domain
+        self.methods = []
+        for plugin in domain.plugins:
+            method = getattr(plugin, name, None)
+            if not method or not callable(method):
+                continue
+            if getattr(method, "__func__", None) in _noop:
+                continue
+            self.methods.append(method)
+
+    def __bool__(self):
+        return bool(self.methods)
 
     def __call__(self, **kwargs):
         ctx = self.domain.ctx()
         ctx.__dict__.update(kwargs)
-        for plugin in self.domain.plugins:
-            method = getattr(plugin, self.name, None)
-            if method and callable(method):
-                method(ctx)
+        for method in self.methods:
+            method(ctx)
         return ctx
+
+
+def hooks(pclass):
+    """
+    Get the names of the hooks defined by a plugin base class.
+
+    @param pclass: A plugin base class.
+    @type pclass: L{Plugin}
+    @return: The hook names.
+    @rtype: [str,]
+
+    """
+    return [name for name, value in vars(pclass).items() if
+        callable(value) and not name.startswith("_")]
+
+
+# The plugin base class hook implementations, doing nothing.
+_noop = frozenset(getattr(pclass, name) for pclass in (InitPlugin,
+    DocumentPlugin, MessagePlugin) for name in hooks(pclass))
@@ -18,6 +18,8 @@
 Properties classes.
 """
 
+from collections import ChainMap
+
 
 class AutoLinker(object):
     """
@@ -34,6 +36,27 @@ class AutoLinker(object):
         """
         pass
 
+    def linked(self, value):
+        """
+        Get the L{Properties} contained within a I{value}.
+        @param value: A property value.
+        @type value: any
+        @return: The contained properties, None if there are none.
+        @rtype: L{Properties}
+        """
+        return None
+
+    def detached(self, value):
+        """
+        Get a private copy of a I{value} containing L{Properties}, not sharing
+        those properties with the original.
+        @param value: A property value.
+        @type value: any
+        @return: The copy.
+        @rtype: any
+        """
+        return value
+
 
 class Link(object):
     """
@@ -131,8 +154,11 @@ class Definition:
     @type classes: tuple
     @ivar default: The default value.
     @ivar type: any
+    @ivar validator: Validates permitted values beyond their class.
+    @type validator: callable
     """
-    def __init__(self, name, classes, default, linker=AutoLinker()):
+    def __init__(self, name, classes, default, linker=AutoLinker(),
+            validator=None):
         """
         @param name: The property name.
         @type name: str
@@ -140,6 +166,9 @@ class Definition:
         @type classes: tuple
         @param default: The default value.
         @type default: any
+        @param validator: Called with each value of a permitted class, raising
+            an exception for invalid ones.
+        @type validator: callable
         """
         if not isinstance(classes, (list, tuple)):
             classes = (classes,)
@@ -147,6 +176,7 @@ class Definition:
         self.classes = classes
         self.default = default
         self.linker = linker
+        self.validator = validator
 
     def nvl(self, value=None):
         """
@@ -174,6 +204,8 @@ class Definition:
             not isinstance(value, self.classes):
                 msg = '"%s" must be: %s' % (self.name, self.classes)
                 raise AttributeError(msg)
+        if self.validator is not None:
+            self.validator(value)
 
 
     def __repr__(self):
@@ -203,7 +235,16 @@ class Properties:
     @type links: [L{Property},..]
     @ivar defined: A dict of property values.
     @type defined: dict
+    @ivar parent: The properties overlaid by this object, if any.
+    @type parent: L{Properties}
+    @cvar version: Incremented on every change made to any properties.
+    @type version: int
     """
+
+    parent = None
+    version = 0
+    __snapshot = None
+
     def __init__(self, domain, definitions, kwargs):
         """
         @param domain: The property domain name.
@@ -223,6 +264,27 @@ class Properties:
         self.prime()
         self.update(kwargs)
 
+    def overlay(self):
+        """
+        Construct copy-on-write properties overlaying this object.
+
+        The overlay stores only the values set on it and reads all the
+        others from this object, including any later changes made to them.
+        Values contained in linked properties, e.g. transport options, are
+        shared too. Setting one of those on the overlay first replaces the
+        value containing them with a private copy.
+        @return: The overlay.
+        @rtype: L{Properties}
+        """
+        overlay = Properties.__new__(Properties)
+        overlay.definitions = self.definitions
+        overlay.domain = self.domain
+        overlay.links = []
+        overlay.defined = ChainMap({}, self.defined)
+        overlay.modified = set()
+        overlay.parent = self
+        return overlay
+
     def definition(self, name):
         """
         Get the definition for the property I{name}.
@@ -259,7 +321,7 @@ class Properties:
         @return: True if never been set.
         @rtype: bool
         """
-        self.provider(name).__notset(name)
+        return self.provider(name).__notset(name)
 
     def set(self, name, value):
         """
@@ -273,7 +335,11 @@ class Properties:
         @return: self
         @rtype: L{Properties}
         """
-        self.provider(name).__set(name, value)
+        provider = self.provider(name)
+        if self.parent is not None and provider is not self and \
+                provider not in self.links:
+            provider = self.__detach(name)
+        provider.__set(name, value)
         return self
 
     def unset(self, name):
@@ -310,6 +376,7 @@ class Properties:
         @rtype: L{Properties}
         """
         Link(self, other)
+        Properties.version += 1
         return self
 
     def unlink(self, *others):
@@ -325,6 +392,7 @@ class Properties:
         for p in self.links[:]:
             if p in others:
                 p.teardown()
+        Properties.version += 1
         return self
 
     def provider(self, name, history=None):
@@ -353,8 +421,50 @@ class Properties:
         history.remove(self)
         if len(history):
             return None
+        if self.parent is not None:
+            return self.parent.provider(name)
         return self
 
+    def values(self, history=None):
+        """
+        Get the values of I{all} properties, including those of linked and
+        overlaid properties.
+        @param history: A history of nodes checked to prevent
+            circular hunting.
+        @type history: [L{Properties},..]
+        @return: Property values by name.
+        @rtype: dict
+        """
+        if history is None:
+            history = []
+        history.append(self)
+        values = {}
+        if self.parent is not None and len(history) == 1:
+            values.update(self.parent.values())
+        values.update(self.defined)
+        for x in self.links:
+            if x in history:
+                continue
+            values.update(x.values(history))
+        history.remove(self)
+        return values
+
+    def snapshot(self):
+        """
+        Get an immutable snapshot of the values of I{all} properties.
+
+        The snapshot is reused until any properties get changed.
+        @return: The snapshot.
+        @rtype: L{Snapshot}
+        """
+        version = Properties.version
+        cached = self.__snapshot
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        snapshot = Snapshot.create(self.values())
+        self.__snapshot = (version, snapshot)
+        return snapshot
+
     def keys(self, history=None):
         """
         Get the set of I{all} property names.
@@ -409,7 +519,26 @@ class Properties:
         return self
 
     def __notset(self, name):
-        return not (name in self.modified)
+        if name in self.modified:
+            return False
+        return self.parent is None or self.parent.__notset(name)
+
+    def __detach(self, name):
+        """
+        Replace the shared value containing the linked properties providing
+        the property I{name} with a private copy.
+        @param name: A property name.
+        @type name: str
+        @return: The private copy's properties.
+        @rtype: L{Properties}
+        """
+        for d in list(self.definitions.values()):
+            value = self.defined[d.name]
+            linked = d.linker.linked(value)
+            if linked is not None and name in linked.keys():
+                self.__set(d.name, d.linker.detached(value))
+                break
+        return self.provider(name)
 
     def __set(self, name, value):
         d = self.definition(name)
@@ -419,6 +548,7 @@ class Properties:
         self.defined[name] = value
         self.modified.add(name)
         d.linker.updated(self, prev, value)
+        Properties.version += 1
 
     def __get(self, name, *df):
         d = self.definition(name)
@@ -450,6 +580,46 @@ class Properties:
         return self.str([])
 
 
+class Snapshot(object):
+    """
+    An immutable snapshot of property values, read as attributes.
+    @cvar classes: Snapshot classes by their (sorted) property names.
+    @type classes: dict
+    """
+
+    __slots__ = ()
+    classes = {}
+
+    @classmethod
+    def create(cls, values):
+        """
+        Construct a snapshot.
+        @param values: Property values by name.
+        @type values: dict
+        @return: The snapshot.
+        @rtype: L{Snapshot}
+        """
+        names = tuple(sorted(values))
+        subclass = cls.classes.get(names)
+        if subclass is None:
+            subclass = cls.classes.setdefault(names, type("Snapshot", (cls,),
+                {"__slots__": names}))
+        snapshot = subclass.__new__(subclass)
+        for name, value in values.items():
+            object.__setattr__(snapshot, name, value)
+        return snapshot
+
+    def __setattr__(self, name, value):
+        raise AttributeError("snapshot is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("snapshot is read-only")
+
+    def __repr__(self):
+        return "Snapshot(%s)" % ", ".join("%s=%r" % (name, getattr(self,
+            name)) for name in self.__slots__)
+
+
 class Skin(object):
     """
     The meta-programming I{skin} around the L{Properties} object.
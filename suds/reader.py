@@ -22,8 +22,11 @@ caching system.
 import suds.cache
 import suds.plugin
 import suds.sax.parser
+import suds.tracing
 import suds.transport
 
+from threading import Lock, Thread
+
 try:
     from hashlib import md5
 except ImportError:
@@ -31,6 +34,9 @@ except ImportError:
     # 'md5' package in older Python versions.
     from md5 import md5
 
+from logging import getLogger
+log = getLogger(__name__)
+
 
 class Reader(object):
     """
@@ -41,6 +47,11 @@ class Reader(object):
 
     """
 
+    # Cache entries currently being refreshed in the background, shared by all
+    # readers so that each expiring entry gets rebuilt only once.
+    __refreshing = set()
+    __refreshing_lock = Lock()
+
     def __init__(self, options):
         """
         @param options: An options object.
@@ -48,7 +59,7 @@ class Reader(object):
 
         """
         self.options = options
-        self.plugins = suds.plugin.PluginContainer(options.plugins)
+        self.plugins = suds.plugin.PluginContainer.compiled(options.plugins)
 
     def mangle(self, name, x):
         """
@@ -66,6 +77,42 @@ class Reader(object):
             h = md5(name.encode()).hexdigest()
         return '%s-%s' % (h, x)
 
+    def refresh(self, cache, id, fn):
+        """
+        Rebuild an expiring cache entry in a background thread.
+
+        The rebuilt object replaces the existing cache entry once done. Does
+        nothing if the same cache entry is already being refreshed.
+
+        @param cache: The cache holding the entry.
+        @type cache: L{Cache}
+        @param id: The cache entry id.
+        @type id: str
+        @param fn: A function constructing the object to cache.
+        @type fn: I{callable}
+        @return: The started refresh thread, else None.
+        @rtype: I{threading.Thread}
+
+        """
+        key = (cache, id)
+        with Reader.__refreshing_lock:
+            if key in Reader.__refreshing:
+                return
+            Reader.__refreshing.add(key)
+        def worker():
+            try:
+                cache.put(id, fn())
+            except Exception:
+                log.debug("refreshing cache entry %s failed", id,
+                    exc_info=True)
+            finally:
+                with Reader.__refreshing_lock:
+                    Reader.__refreshing.discard(key)
+        thread = Thread(target=worker, name="suds-refresh-%s" % (id,))
+        thread.daemon = True
+        thread.start()
+        return thread
+
 
 class DefinitionsReader(Reader):
     """
@@ -94,7 +141,9 @@ class DefinitionsReader(Reader):
 
         First, the WSDL schema is looked up in the I{object cache}. If not
         found, a new one constructed using the I{fn} factory function and the
-        result is cached for the next open().
+        result is cached for the next open(). If found but expiring according
+        to the cache's refresh policy, the cached one is used while a new one
+        gets constructed and cached in the background.
 
         @param url: A WSDL URL.
         @type url: str.
@@ -109,6 +158,8 @@ class DefinitionsReader(Reader):
             wsdl = self.fn(url, self.options)
             cache.put(id, wsdl)
         else:
+            if cache.expiring(id):
+                self.refresh(cache, id, lambda: self.fn(url, self.options))
             # Cached WSDL Definitions objects may have been created with
             # different options so we update them here with our current ones.
             wsdl.options = self.options
@@ -138,7 +189,9 @@ class DocumentReader(Reader):
 
         First, a preparsed document is looked up in the I{object cache}. If not
         found, its content is fetched from an external source and parsed using
-        the SAX parser. The result is cached for the next open().
+        the SAX parser. The result is cached for the next open(). If found but
+        expiring according to the cache's refresh policy, the cached one is
+        used while it gets fetched and cached again in the background.
 
         @param url: A document URL.
         @type url: str.
@@ -146,14 +199,21 @@ class DocumentReader(Reader):
         @rtype: I{Document}
 
         """
-        cache = self.__cache()
-        id = self.mangle(url, "document")
-        xml = cache.get(id)
-        if xml is None:
-            xml = self.__fetch(url)
-            cache.put(id, xml)
-        self.plugins.document.parsed(url=url, document=xml.root())
-        return xml
+        tracer = self.options.tracer
+        with suds.tracing.loading(tracer, "suds.document.open", url):
+            cache = self.__cache()
+            id = self.mangle(url, "document")
+            xml = cache.get(id)
+            if xml is None:
+                xml = self.__fetch(url)
+                cache.put(id, xml)
+            elif cache.expiring(id):
+                self.refresh(cache, id, lambda: self.__fetch(url))
+            parsed = self.plugins.document.parsed
+            if parsed:
+                with suds.tracing.span(tracer, "suds.plugin.parsed"):
+                    parsed(url=url, document=xml.root())
+            return xml
 
     def __cache(self):
         """
@@ -184,19 +244,24 @@ class DocumentReader(Reader):
         @rtype: file-like
 
         """
+        tracer = self.options.tracer
         content = None
-        store = self.options.documentStore
-        if store is not None:
-            content = store.open(url)
-        if content is None:
-            request = suds.transport.Request(url)
-            request.headers = self.options.headers
-            fp = self.options.transport.open(request)
-            try:
-                content = fp.read()
-            finally:
-                fp.close()
-        ctx = self.plugins.document.loaded(url=url, document=content)
-        content = ctx.document
+        with suds.tracing.span(tracer, "suds.document.fetch"):
+            store = self.options.documentStore
+            if store is not None:
+                content = store.open(url)
+            if content is None:
+                request = suds.transport.Request(url)
+                request.headers = self.options.headers
+                fp = self.options.transport.open(request)
+                try:
+                    content = fp.read()
+                finally:
+                    fp.close()
+        loaded = self.plugins.document.loaded
+        if loaded:
+            with suds.tracing.span(tracer, "suds.plugin.loaded"):
+                content = loaded(url=url, document=content).document
         sax = suds.sax.parser.Parser()
-        return sax.parse(string=content)
+        with suds.tracing.span(tracer, "suds.document.parse"):
+            return sax.parse(string=content)
@@ -25,6 +25,7 @@ from suds.sudsobject import Object
 from suds.xsd.query import BlindQuery, TypeQuery, qualify
 
 import re
+import threading
 
 from logging import getLogger
 log = getLogger(__name__)
@@ -55,14 +56,16 @@ class Resolver:
         @return: The found schema I{type}
         @rtype: L{xsd.sxbase.SchemaObject}
         """
-        log.debug('searching schema for (%s)', name)
+        if DEBUG_LOGGING:
+            log.debug('searching schema for (%s)', name)
         qref = qualify(name, self.schema.root, self.schema.tns)
         query = BlindQuery(qref)
         result = query.execute(self.schema)
         if result is None:
             log.error('(%s) not-found', name)
             return None
-        log.debug('found (%s) as (%s)', name, Repr(result))
+        if DEBUG_LOGGING:
+            log.debug('found (%s) as (%s)', name, Repr(result))
         if resolved:
             result = result.resolve()
         return result
@@ -126,14 +129,16 @@ class PathResolver(Resolver):
         """
         result = None
         name = parts[0]
-        log.debug('searching schema for (%s)', name)
+        if DEBUG_LOGGING:
+            log.debug('searching schema for (%s)', name)
         qref = self.qualify(parts[0])
         query = BlindQuery(qref)
         result = query.execute(self.schema)
         if result is None:
             log.error('(%s) not-found', name)
             raise PathResolver.BadPath(name)
-        log.debug('found (%s) as (%s)', name, Repr(result))
+        if DEBUG_LOGGING:
+            log.debug('found (%s) as (%s)', name, Repr(result))
         return result
 
     def branch(self, root, parts):
@@ -149,13 +154,15 @@ class PathResolver(Resolver):
         result = root
         for part in parts[1:-1]:
             name = splitPrefix(part)[1]
-            log.debug('searching parent (%s) for (%s)', Repr(result), name)
+            if DEBUG_LOGGING:
+                log.debug('searching parent (%s) for (%s)', Repr(result), name)
             result, ancestry = result.get_child(name)
             if result is None:
                 log.error('(%s) not-found', name)
                 raise PathResolver.BadPath(name)
             result = result.resolve(nobuiltin=True)
-            log.debug('found (%s) as (%s)', name, Repr(result))
+            if DEBUG_LOGGING:
+                log.debug('found (%s) as (%s)', name, Repr(result))
         return result
 
     def leaf(self, parent, parts):
@@ -223,8 +230,10 @@ class TreeResolver(Resolver):
     used to resolve each node in a tree.  As such, it mirrors
     the tree structure to ensure that nodes are resolved in
     context.
-    @ivar stack: The context stack.
-    @type stack: list
+    The state of the traversal in progress is kept in a thread-local
+    L{Context} so a single resolver may be shared by concurrent traversals.
+    @ivar context: The traversal context.
+    @type context: L{Context}
     """
 
     def __init__(self, schema):
@@ -233,13 +242,43 @@ class TreeResolver(Resolver):
         @type schema: L{xsd.schema.Schema}
         """
         Resolver.__init__(self, schema)
-        self.stack = Stack()
+        self.context = Context()
+
+    @property
+    def stack(self):
+        """The context stack of the traversal in progress."""
+        return self.context.stack
+
+    @stack.setter
+    def stack(self, stack):
+        self.context.stack = stack
 
     def reset(self):
         """
         Reset the resolver's state.
         """
-        self.stack = Stack()
+        self.context.stack = Stack()
+
+    def enter(self):
+        """
+        Start a new traversal, interrupting the one in progress, if any.
+        @return: The interrupted traversal's context stack, to be restored
+            using L{leave()}.
+        @rtype: L{Stack}
+        """
+        context = self.context
+        stack = context.stack
+        context.stack = Stack()
+        return stack
+
+    def leave(self, stack):
+        """
+        End the current traversal, resuming an interrupted one.
+        @param stack: The interrupted traversal's context stack, as returned
+            by L{enter()}.
+        @type stack: L{Stack}
+        """
+        self.context.stack = stack
 
     def push(self, x):
         """
@@ -253,8 +292,10 @@ class TreeResolver(Resolver):
             frame = x
         else:
             frame = Frame(x)
-        self.stack.append(frame)
-        log.debug('push: (%s)\n%s', Repr(frame), Repr(self.stack))
+        stack = self.context.stack
+        stack.append(frame)
+        if DEBUG_LOGGING:
+            log.debug('push: (%s)\n%s', Repr(frame), Repr(stack))
         return frame
 
     def top(self):
@@ -263,8 +304,9 @@ class TreeResolver(Resolver):
         @return: The top I{frame}, else Frame.Empty.
         @rtype: L{Frame}
         """
-        if len(self.stack):
-            return self.stack[-1]
+        stack = self.context.stack
+        if len(stack):
+            return stack[-1]
         else:
             return Frame.Empty()
 
@@ -274,11 +316,14 @@ class TreeResolver(Resolver):
         @return: The popped frame, else None.
         @rtype: L{Frame}
         """
-        if len(self.stack):
-            popped = self.stack.pop()
-            log.debug('pop: (%s)\n%s', Repr(popped), Repr(self.stack))
+        stack = self.context.stack
+        if len(stack):
+            popped = stack.pop()
+            if DEBUG_LOGGING:
+                log.debug('pop: (%s)\n%s', Repr(popped), Repr(stack))
             return popped
-        log.debug('stack empty, not-popped')
+        if DEBUG_LOGGING:
+            log.debug('stack empty, not-popped')
         return None
 
     def depth(self):
@@ -291,7 +336,8 @@ class TreeResolver(Resolver):
 
     def getchild(self, name, parent):
         """Get a child by name."""
-        log.debug('searching parent (%s) for (%s)', Repr(parent), name)
+        if DEBUG_LOGGING:
+            log.debug('searching parent (%s) for (%s)', Repr(parent), name)
         if name.startswith('@'):
             return parent.get_attribute(name[1:])
         return parent.get_child(name)
@@ -366,7 +412,8 @@ class NodeResolver(TreeResolver):
 
     def query(self, name, node):
         """Blindly query the schema by name."""
-        log.debug('searching schema for (%s)', name)
+        if DEBUG_LOGGING:
+            log.debug('searching schema for (%s)', name)
         qref = qualify(name, node, node.namespace())
         query = BlindQuery(qref)
         result = query.execute(self.schema)
@@ -434,7 +481,8 @@ class GraphResolver(TreeResolver):
 
     def query(self, name):
         """Blindly query the schema by name."""
-        log.debug('searching schema for (%s)', name)
+        if DEBUG_LOGGING:
+            log.debug('searching schema for (%s)', name)
         schema = self.schema
         wsdl = self.wsdl()
         if wsdl is None:
@@ -463,6 +511,17 @@ class GraphResolver(TreeResolver):
             pass
 
 
+class Context(threading.local):
+    """
+    The thread-local state of a L{TreeResolver} traversal.
+    @ivar stack: The context stack.
+    @type stack: L{Stack}
+    """
+
+    def __init__(self):
+        self.stack = Stack()
+
+
 class Frame:
     def __init__(self, type, resolved=None, ancestry=()):
         self.type = type
@@ -121,17 +121,19 @@ class Parser:
         """
         if file is None and string is None:
             return
-        timer = suds.metrics.Timer()
-        timer.start()
+        if suds.DEBUG_LOGGING:
+            timer = suds.metrics.Timer()
+            timer.start()
         source = file
         if file is None:
             source = InputSource(None)
             source.setByteStream(suds.BytesIO(string))
         sax, handler = self.saxparser()
         sax.parse(source)
-        timer.stop()
-        if file is None:
-            suds.metrics.log.debug("%s\nsax duration: %s", string, timer)
-        else:
-            suds.metrics.log.debug("sax (%s) duration: %s", file, timer)
+        if suds.DEBUG_LOGGING:
+            timer.stop()
+            if file is None:
+                suds.metrics.log.debug("%s\nsax duration: %s", string, timer)
+            else:
+                suds.metrics.log.debug("sax (%s) duration: %s", file, timer)
         return handler.nodes[0]
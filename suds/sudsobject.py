@@ -104,7 +104,6 @@ def merge(a, b):
     """
     for item in a:
         setattr(b, item[0], item[1])
-        b.__metadata__ = b.__metadata__
     return b
 
 def footprint(sobject):
@@ -149,8 +148,8 @@ class Factory:
         key = ".".join((name, str(bases)))
         subclass = cls.cache.get(key)
         if subclass is None:
-            subclass = type(name, bases, dict)
-            cls.cache[key] = subclass
+            # setdefault() keeps concurrently created classes unique.
+            subclass = cls.cache.setdefault(key, type(name, bases, dict))
         return subclass
 
     @classmethod
@@ -174,28 +173,54 @@ class Factory:
         return subclass(value)
 
 
+def _builtin(name):
+    """Get whether an attribute name is reserved (not an object key)."""
+    return name[:2] == "__" and name[-2:] == "__"
+
+
 class Object(UnicodeMixin):
+    """
+    A suds object.
 
-    def __init__(self):
-        self.__keylist__ = []
-        self.__printer__ = Printer()
-        self.__metadata__ = Metadata()
+    Keys are the object's attributes, in the order they were first set,
+    excluding I{__builtin__} ones. Both are stored directly in the instance
+    dictionary, which keeps the insertion order & provides O(1) membership.
+    The key list gets cached in the instance dictionary together with its
+    size, and is only collected again once keys have been added or deleted.
+    The object's I{__metadata__} is constructed on first access.
+
+    @cvar __printer__: The printer shared by all objects.
+    @type __printer__: L{Printer}
+
+    """
 
-    def __setattr__(self, name, value):
-        builtin = name.startswith("__") and name.endswith("__")
-        if not builtin and name not in self.__keylist__:
-            self.__keylist__.append(name)
-        self.__dict__[name] = value
+    __printer__ = None
+
+    @property
+    def __keylist__(self):
+        d = self.__dict__
+        cached = d.get("__keycache__")
+        if cached is not None and cached[0] == len(d):
+            return cached[1]
+        keylist = [k for k in d if not _builtin(k)]
+        d["__keycache__"] = (len(d) + (cached is None), keylist)
+        return keylist
+
+    def __getattr__(self, name):
+        if name == "__metadata__":
+            md = self.__dict__["__metadata__"] = Metadata()
+            return md
+        cls = self.__class__.__name__
+        raise AttributeError("%s has no attribute '%s'" % (cls, name))
 
     def __delattr__(self, name):
+        d = self.__dict__
         try:
-            del self.__dict__[name]
-            builtin = name.startswith("__") and name.endswith("__")
-            if not builtin:
-                self.__keylist__.remove(name)
-        except Exception:
+            del d[name]
+        except KeyError:
             cls = self.__class__.__name__
             raise AttributeError("%s has no attribute '%s'" % (cls, name))
+        d.pop("__keycache__", None)
 
     def __getitem__(self, name):
         if isinstance(name, int):
@@ -212,7 +237,7 @@ class Object(UnicodeMixin):
         return len(self.__keylist__)
 
     def __contains__(self, name):
-        return name in self.__keylist__
+        return name in self.__dict__ and not _builtin(name)
 
     def __repr__(self):
         return str(self)
@@ -221,6 +246,19 @@ class Object(UnicodeMixin):
         return self.__printer__.tostr(self)
 
 
+def metadata(sobject):
+    """
+    Get the metadata of a suds object without constructing it.
+
+    @param sobject: A suds object.
+    @type sobject: L{Object}
+    @return: The object's metadata, None if it has not been constructed.
+    @rtype: L{Metadata}
+
+    """
+    return sobject.__dict__.get("__metadata__")
+
+
 class Iter:
 
     def __init__(self, sobject):
@@ -241,26 +279,27 @@ class Iter:
 
     def __keylist(self, sobject):
         keylist = sobject.__keylist__
+        md = metadata(sobject)
+        ordering = md is not None and md.__dict__.get("ordering")
+        if not ordering:
+            return keylist
         try:
-            keyset = set(keylist)
-            ordering = sobject.__metadata__.ordering
             ordered = set(ordering)
-            if not ordered.issuperset(keyset):
+        except TypeError:
+            return keylist
+        for k in keylist:
+            if k not in ordered:
                 log.debug("%s must be superset of %s, ordering ignored",
                     keylist, ordering)
-                raise KeyError()
-            return ordering
-        except Exception:
-            return keylist
+                return keylist
+        return ordering
 
     def __iter__(self):
         return self
 
 
 class Metadata(Object):
-    def __init__(self):
-        self.__keylist__ = []
-        self.__printer__ = Printer()
+    pass
 
 
 class Facade(Object):
@@ -405,7 +444,7 @@ class Printer:
     def unwrap(self, d, item):
         """Translate (unwrap) using an optional wrapper function."""
         try:
-            md = d.__metadata__
+            md = metadata(d)
             pmd = getattr(md, "__print__", None)
             if pmd is None:
                 return item
@@ -419,7 +458,7 @@ class Printer:
     def exclude(self, d, item):
         """Check metadata for excluded items."""
         try:
-            md = d.__metadata__
+            md = metadata(d)
             pmd = getattr(md, "__print__", None)
             if pmd is None:
                 return False
@@ -428,3 +467,6 @@ class Printer:
         except Exception:
             pass
         return False
+
+
+Object.__printer__ = Printer()
@@ -0,0 +1,252 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+The I{tracing} module provides tracing span hooks.
+
+A L{Tracer} registered using the I{tracer} option gets notified when each of
+the web service operation invocation & WSDL loading stages starts and ends,
+e.g. to adapt them to an OpenTelemetry style tracer. Stages get traced using
+L{span()}, doing nothing when no tracer is registered.
+
+Traced spans::
+
+    suds.invoke (operation, endpoint)
+      suds.get_message
+      suds.plugin.<hook>
+      suds.transport.send
+      suds.parse
+      suds.get_reply
+    suds.process_reply (operation, endpoint)
+      ...
+    suds.document.open (url)
+      suds.document.fetch
+      suds.plugin.<hook>
+      suds.document.parse
+    suds.wsdl.imports (url)
+    suds.wsdl.resolve (url)
+      suds.wsdl.object (object)
+    suds.wsdl.build_schema (url)
+      suds.schema.build (url)
+      suds.schema.imports (url)
+      suds.schema.dereference (url)
+        suds.schema.type (type)
+        suds.schema.dependency_sort
+      suds.schema.merge (url)
+    suds.wsdl.set_wrapped (url)
+    suds.wsdl.add_methods (url)
+
+"""
+
+from suds import *
+
+import threading
+import time
+
+
+class Tracer:
+    """
+    A tracer interface, notified of traced span starts & ends.
+
+    Spans started in a thread get ended in the same thread, in reverse order.
+    """
+
+    def start(self, name, attributes):
+        """
+        A span has started.
+        @param name: The span name.
+        @type name: str
+        @param attributes: The span attributes, if any.
+        @type attributes: dict
+        @return: The started span, passed to L{end()}.
+        """
+        pass
+
+    def end(self, span, error):
+        """
+        A span has ended.
+        @param span: The span, as returned by L{start()}.
+        @param error: The exception ending the span, None if it ended
+            successfully.
+        @type error: Exception
+        """
+        pass
+
+
+class Scope:
+    """
+    A traced span's context manager.
+    @ivar tracer: The tracer.
+    @type tracer: L{Tracer}
+    @ivar name: The span name.
+    @type name: str
+    @ivar attributes: The span attributes.
+    @type attributes: dict
+    @ivar span: The started span.
+    """
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span = None
+
+    def __enter__(self):
+        self.span = self.tracer.start(self.name, self.attributes)
+        return self.span
+
+    def __exit__(self, type, value, traceback):
+        self.tracer.end(self.span, value)
+
+
+class NoScope:
+    """
+    The context manager used when no tracer is registered, doing nothing.
+    """
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+
+_noscope = NoScope()
+
+
+def span(tracer, name, attributes=None):
+    """
+    Get a context manager tracing a span.
+    @param tracer: The tracer, None if not tracing.
+    @type tracer: L{Tracer}
+    @param name: The span name.
+    @type name: str
+    @param attributes: The span attributes.
+    @type attributes: dict
+    @return: The context manager, a shared one doing nothing if not tracing.
+    """
+    if tracer is None:
+        return _noscope
+    return Scope(tracer, name, attributes)
+
+
+def loading(tracer, name, url):
+    """
+    Get a context manager tracing a WSDL loading stage as a span attributed
+    with the URL of the document being processed.
+    @param tracer: The tracer, None if not tracing.
+    @type tracer: L{Tracer}
+    @param name: The span name.
+    @type name: str
+    @param url: The document URL.
+    @type url: str
+    @return: The context manager, a shared one doing nothing if not tracing.
+    """
+    if tracer is None:
+        return _noscope
+    return Scope(tracer, name, {"url": url})
+
+
+class Span:
+    """
+    A span recorded by the L{MemoryTracer}.
+    @ivar name: The span name.
+    @type name: str
+    @ivar attributes: The span attributes.
+    @type attributes: dict
+    @ivar parent: The enclosing span, None for a root span.
+    @type parent: L{Span}
+    @ivar children: The enclosed spans, in start order.
+    @type children: [L{Span},...]
+    @ivar started: The span start time [ns].
+    @type started: int
+    @ivar ended: The span end time [ns], None while in progress.
+    @type ended: int
+    @ivar error: The exception ending the span, if any.
+    @type error: Exception
+    """
+
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or ())
+        self.parent = parent
+        self.children = []
+        self.started = time.perf_counter_ns()
+        self.ended = None
+        self.error = None
+
+    def duration(self):
+        """
+        Get the span duration.
+        @return: The span duration [ns], None while in progress.
+        @rtype: int
+        """
+        if self.ended is not None:
+            return self.ended - self.started
+
+    def tree(self):
+        """
+        Get the names of this span and its enclosed spans.
+        @return: (name, [child tree,...]) pair.
+        @rtype: tuple
+        """
+        return self.name, [child.tree() for child in self.children]
+
+    def __repr__(self):
+        return "Span(%s)" % (self.name,)
+
+
+class MemoryTracer(Tracer):
+    """
+    A tracer recording spans in memory, e.g. for testing.
+    @ivar spans: The recorded root spans, in start order.
+    @type spans: [L{Span},...]
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    def start(self, name, attributes):
+        stack = self.__stack()
+        parent = stack[-1] if stack else None
+        span = Span(name, attributes, parent)
+        if parent is None:
+            with self.__lock:
+                self.spans.append(span)
+        else:
+            parent.children.append(span)
+        stack.append(span)
+        return span
+
+    def end(self, span, error):
+        span.ended = time.perf_counter_ns()
+        span.error = error
+        stack = self.__stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def reset(self):
+        """
+        Discard all the recorded spans.
+        """
+        with self.__lock:
+            self.spans = []
+
+    def __stack(self):
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
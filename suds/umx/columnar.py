@@ -0,0 +1,202 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Provides columnar unmarshalling of tabular replies.
+
+Repeated flat records, i.e. complex values containing only single
+occurrence builtin typed elements & attributes, get unmarshalled into a
+dictionary mapping each record field to a column holding that field's
+values for all the records. Integer, floating point & boolean columns are
+packed into NumPy arrays when NumPy is available and into I{array.array}
+objects otherwise. Columns containing missing or nil values, and columns
+of any other type, are plain lists.
+"""
+
+from suds import *
+from suds.umx.core import reserved
+from suds.xsd.sxbuiltin import XBoolean, XFloat, XInteger, XLong
+
+import array
+
+
+# Column types: (array.array typecode, NumPy dtype)
+INTEGER = ("q", "int64")
+FLOAT = ("d", "float64")
+BOOLEAN = (None, "bool")
+
+
+class Field:
+    """
+    A record field.
+    @ivar key: The field's column key.
+    @type key: str
+    @ivar name: The field's XML element or attribute name.
+    @type name: str
+    @ivar attribute: Whether the field is an XML attribute.
+    @type attribute: bool
+    @ivar translate: Translates the field's XML text to a Python value.
+    @type translate: callable
+    @ivar kind: The field's column type, None for a list.
+    @type kind: tuple
+    """
+
+    def __init__(self, type):
+        """
+        @param type: The field's schema object.
+        @type type: L{suds.xsd.sxbase.SchemaObject}
+        """
+        resolved = type.resolve()
+        self.name = type.name
+        self.attribute = type.isattr()
+        if self.attribute:
+            self.key = "_%s" % reserved.get(type.name, type.name)
+        else:
+            self.key = reserved.get(type.name, type.name)
+        self.translate = resolved.translate
+        self.kind = None
+        if isinstance(resolved, (XInteger, XLong)):
+            self.kind = INTEGER
+        elif isinstance(resolved, XFloat):
+            self.kind = FLOAT
+        elif isinstance(resolved, XBoolean):
+            self.kind = BOOLEAN
+
+
+class Columnar:
+    """
+    Columnar unmarshaller for repeated flat records.
+    @ivar fields: The record's fields.
+    @type fields: [L{Field},...]
+    @ivar attributes: The record's attribute fields.
+    @type attributes: [L{Field},...]
+    @ivar elements: The record's element fields by element name.
+    @type elements: {str: L{Field}}
+    @ivar skipped: Names of the record's elements outside the projection.
+    @type skipped: set
+    """
+
+    def __init__(self, type, projection=None):
+        """
+        @param type: The resolved record type.
+        @type type: L{suds.xsd.sxbase.SchemaObject}
+        @param projection: The projected fields tree, all fields if None.
+            See L{suds.umx.core.projection()}.
+        @type projection: dict
+        @raise Exception: Records of the given type are not flat.
+        """
+        fields = self.flat(type)
+        if fields is None:
+            raise Exception("'%s' records not flat" % (type.name,))
+        fields = [Field(t) for t in fields]
+        self.fields = [f for f in fields if projection is None or f.key in
+            projection]
+        self.skipped = set(f.name for f in fields if not f.attribute and
+            f not in self.fields)
+        self.attributes = [f for f in self.fields if f.attribute]
+        self.elements = dict((f.name, f) for f in self.fields if not
+            f.attribute)
+
+    @classmethod
+    def flat(cls, type):
+        """
+        Get the fields of a flat record type.
+        @param type: The resolved record type.
+        @type type: L{suds.xsd.sxbase.SchemaObject}
+        @return: The field schema objects, None if the type does not define
+            flat records.
+        @rtype: [L{suds.xsd.sxbase.SchemaObject},...]
+        """
+        if type.builtin() or type.mixed() or type.any():
+            return
+        result = []
+        for child, ancestry in type.resolve():
+            if child.any() or child.name is None:
+                return
+            if not child.isattr() and child.multi_occurrence():
+                return
+            if not child.resolve().builtin():
+                return
+            result.append(child)
+        if result:
+            return result
+
+    def process(self, nodes):
+        """
+        Unmarshal the given record XML elements into columns.
+        @param nodes: The record XML elements.
+        @type nodes: [L{suds.sax.element.Element},...]
+        @return: Columns by field key.
+        @rtype: dict
+        """
+        n = len(nodes)
+        buffers = dict((f.key, [None] * n) for f in self.fields)
+        attributes = [(f, buffers[f.key]) for f in self.attributes]
+        elements = dict((name, (f, buffers[f.key])) for name, f in
+            self.elements.items())
+        for i, node in enumerate(nodes):
+            for f, buffer in attributes:
+                value = node.get(f.name)
+                if value is not None:
+                    buffer[i] = f.translate(value)
+            for child in node.children:
+                target = elements.get(child.name)
+                if target is None:
+                    if child.name in self.skipped:
+                        continue
+                    raise TypeNotFound(child.qname())
+                if child.isnil():
+                    continue
+                text = child.getText()
+                if text is not None:
+                    target[1][i] = target[0].translate(text)
+        return dict((f.key, self.column(f, buffers[f.key])) for f in
+            self.fields)
+
+    def column(self, field, values):
+        """
+        Pack a field's values into a typed column when possible.
+        @param field: The field.
+        @type field: L{Field}
+        @param values: The field's values.
+        @type values: list
+        @return: The column.
+        @rtype: list|I{array.array}|I{numpy.ndarray}
+        """
+        if field.kind is None or None in values:
+            return values
+        typecode, dtype = field.kind
+        np = numpy()
+        try:
+            if np is not None:
+                return np.array(values, dtype=dtype)
+            if typecode is not None:
+                return array.array(typecode, values)
+        except OverflowError:
+            pass
+        return values
+
+
+_numpy = []
+
+
+def numpy():
+    """Get the NumPy module, None if it is not available."""
+    if not _numpy:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy.append(numpy)
+    return _numpy[0]
@@ -21,19 +21,59 @@ Provides base classes for XML->object I{unmarshalling}.
 from suds import *
 from suds.umx import *
 from suds.umx.attrlist import AttrList
+from suds.umx.model import ObjectModel
 from suds.sax.text import Text
-from suds.sudsobject import Factory, merge
 
 
 reserved = {'class':'cls', 'def':'dfn'}
 
+#
+# Add projection extension
+# fields = The projected fields tree, None for all fields
+#
+Content.extensions.append('fields')
+
+
+def projection(paths):
+    """
+    Build a projected fields tree from a list of dotted field paths.
+
+    Each tree level maps a field key to the tree of its projected subfields,
+    or to None if all of that field's content is projected. List items are
+    transparent so 'items.id' selects the I{id} of every I{items} entry.
+    Attributes are selected using their '_' prefixed keys.
+    @param paths: Dotted field paths, e.g. ['items.id', 'items._code'].
+    @type paths: [str,...]
+    @return: The projected fields tree, None if I{paths} is None.
+    @rtype: dict
+    """
+    if paths is None:
+        return
+    if isinstance(paths, str):
+        paths = [paths]
+    tree = {}
+    for path in paths:
+        names = path.split('.')
+        node = tree
+        for name in names[:-1]:
+            node = node.setdefault(name, {})
+            if node is None:
+                break
+        else:
+            node[names[-1]] = None
+    return tree
+
 
 class Core:
     """
     The abstract XML I{node} unmarshaller.  This class provides the
     I{core} unmarshalling functionality.
+    @ivar model: The reply model constructing complex values.
+    @type model: L{ObjectModel}
     """
 
+    model = ObjectModel()
+
     def process(self, content):
         """
         Process an object graph representation of the xml I{node}.
@@ -42,8 +82,11 @@ class Core:
         @return: A suds object.
         @rtype: L{Object}
         """
-        self.reset()
-        return self.append(content)
+        state = self.enter()
+        try:
+            return self.append(content)
+        finally:
+            self.leave(state)
 
     def append(self, content):
         """
@@ -83,9 +126,9 @@ class Core:
         if attributes.rlen() and \
             not len(node.children) and \
             node.hasText():
-                p = Factory.property(node.name, node.getText())
-                return merge(content.data, p)
-        if len(content.data):
+                return self.model.property(node.name, node.getText(),
+                    content.data)
+        if len(content.data) or (content.fields and len(node.children)):
             return content.data
         lang = attributes.lang()
         if content.node.isnil():
@@ -108,8 +151,12 @@ class Core:
         @type content: L{Content}
         """
         attributes = AttrList(content.node.attributes)
+        fields = content.fields
         for attr in attributes.real():
             name = attr.name
+            if fields is not None and \
+                    '_%s' % reserved.get(name, name) not in fields:
+                continue
             value = attr.value
             self.append_attribute(name, value, content)
 
@@ -125,32 +172,54 @@ class Core:
         """
         key = name
         key = '_%s' % reserved.get(key, key)
-        setattr(content.data, key, value)
+        self.model.set(content.data, key, value)
 
     def append_children(self, content):
         """
         Append child nodes into L{Content.data}
+        Child nodes outside the projected L{Content.fields} are skipped
+        without being unmarshalled.
         @param content: The current content being unmarshalled.
         @type content: L{Content}
         """
+        fields = content.fields
         for child in content.node:
-            cont = Content(child)
-            cval = self.append(cont)
             key = reserved.get(child.name, child.name)
-            if key in content.data:
-                v = getattr(content.data, key)
-                if isinstance(v, list):
-                    v.append(cval)
-                else:
-                    setattr(content.data, key, [v, cval])
+            if fields is None:
+                cont = Content(child)
+            elif key in fields:
+                cont = Content(child, fields=fields[key])
+            else:
                 continue
-            if self.multi_occurrence(cont):
-                if cval is None:
-                    setattr(content.data, key, [])
-                else:
-                    setattr(content.data, key, [cval,])
+            self.append_child(content, key, cont)
+
+    def append_child(self, content, key, cont):
+        """
+        Unmarshal a child node and append it into L{Content.data}.
+        Repeated children are collected into a I{list}.
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @param key: The child's key.
+        @type key: str
+        @param cont: The child's content.
+        @type cont: L{Content}
+        """
+        cval = self.append(cont)
+        model = self.model
+        if model.contains(content.data, key):
+            v = model.get(content.data, key)
+            if isinstance(v, list):
+                v.append(cval)
             else:
-                setattr(content.data, key, cval)
+                model.set(content.data, key, [v, cval])
+            return
+        if self.multi_occurrence(cont):
+            if cval is None:
+                model.set(content.data, key, [])
+            else:
+                model.set(content.data, key, [cval,])
+        else:
+            model.set(content.data, key, cval)
 
     def append_text(self, content):
         """
@@ -164,6 +233,23 @@ class Core:
     def reset(self):
         pass
 
+    def enter(self):
+        """
+        Start unmarshalling a new XML document. Any per document state is
+        set up here so an unmarshaller may be reused, even while it is
+        unmarshalling another document.
+        @return: The interrupted document's state, passed to L{leave()}.
+        """
+        self.reset()
+
+    def leave(self, state):
+        """
+        Unmarshalling an XML document has ended.
+        @param state: The interrupted document's state, as returned by
+            L{enter()}.
+        """
+        pass
+
     def start(self, content):
         """
         Processing on I{node} has started.  Build and return
@@ -173,7 +259,7 @@ class Core:
         @return: A subclass of Object.
         @rtype: L{Object}
         """
-        content.data = Factory.object(content.node.name)
+        content.data = self.model.object(content.node.name)
 
     def end(self, content):
         """
@@ -119,7 +119,7 @@ class Encoded(Typed):
         @param content: An array content.
         @type content: L{Content}
         """
-        for n,v in content.data:
+        for n,v in self.model.items(content.data):
             if isinstance(v, list):
                 content.data = v
                 return
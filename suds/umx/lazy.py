@@ -0,0 +1,101 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Provides lazy unmarshallers.
+
+Complex content gets unmarshalled into L{Deferred} suds objects holding on
+to their child XML elements. Each child element gets unmarshalled, using the
+same rules as the eager unmarshallers, only once its value is first
+accessed, so untouched reply subtrees never get their schema types resolved
+or their values constructed & translated. Note that the reply XML document
+is kept alive until all of its content has been unmarshalled.
+"""
+
+from suds.umx import *
+from suds.umx.core import reserved
+from suds.umx.encoded import Encoded
+from suds.umx.model import Deferred
+from suds.umx.typed import Typed
+
+
+class Lazy:
+    """
+    Lazy unmarshaller mix-in, deferring child elements of L{Deferred}
+    complex content.
+    """
+
+    def append_children(self, content):
+        data = content.data
+        if not isinstance(data, Deferred):
+            return super(Lazy, self).append_children(content)
+        d = data.__dict__
+        keys = d["__keys__"]
+        pending = d["__pending__"]
+        fields = content.fields
+        for child in content.node:
+            key = reserved.get(child.name, child.name)
+            if fields is not None and key not in fields:
+                continue
+            nodes = pending.get(key)
+            if nodes is None:
+                pending[key] = [child]
+                if key not in keys:
+                    keys.append(key)
+            else:
+                nodes.append(child)
+        if pending:
+            d["__context__"] = (self, self.resolver.top(), fields)
+
+    def materialize(self, data, key, nodes, frame, fields):
+        """
+        Unmarshal a L{Deferred} object's pending child elements.
+        @param data: The object.
+        @type data: L{Deferred}
+        @param key: The child elements' key.
+        @type key: str
+        @param nodes: The child elements.
+        @type nodes: [L{suds.sax.element.Element},...]
+        @param frame: The object's schema type resolver frame.
+        @type frame: L{suds.resolver.Frame}
+        @param fields: The object's projected fields tree.
+        @type fields: dict
+        """
+        content = Content(None)
+        content.data = data
+        state = self.enter()
+        self.resolver.push(frame)
+        try:
+            for child in nodes:
+                if fields is None:
+                    cont = Content(child)
+                else:
+                    cont = Content(child, fields=fields[key])
+                self.append_child(content, key, cont)
+        finally:
+            self.leave(state)
+
+
+class LazyTyped(Lazy, Typed):
+    """
+    A lazy I{typed} XML unmarshaller.
+    """
+    pass
+
+
+class LazyEncoded(Lazy, Encoded):
+    """
+    A lazy SOAP section (5) encoding unmarshaller.
+    """
+    pass
@@ -0,0 +1,217 @@
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Provides the reply object models used by the unmarshallers.
+
+A reply model defines the data structures constructed for unmarshalled
+complex content. It is selected using the I{reply_model} option.
+
+"""
+
+from suds.sudsobject import Factory, Object, _builtin, merge
+
+
+class ObjectModel:
+    """
+    Unmarshals complex content into suds objects.
+    """
+
+    def object(self, name, sxtype=None):
+        """
+        Construct an empty complex value.
+        @param name: The value's type (or element) name.
+        @type name: str
+        @param sxtype: The value's schema type.
+        @type sxtype: L{suds.xsd.sxbase.SchemaObject}
+        @return: The constructed value.
+        @rtype: L{Object}
+        """
+        data = Factory.object(name)
+        if sxtype is not None:
+            data.__metadata__.sxtype = sxtype
+        return data
+
+    def property(self, name, value, data):
+        """
+        Construct a value for an element containing text and attributes.
+        @param name: The element name.
+        @type name: str
+        @param value: The element text.
+        @type value: L{suds.sax.text.Text}
+        @param data: The complex value holding the element's attributes.
+        @type data: L{Object}
+        @return: The constructed value.
+        @rtype: L{suds.sudsobject.Property}
+        """
+        return merge(data, Factory.property(name, value))
+
+    def contains(self, data, key):
+        return key in data
+
+    def get(self, data, key):
+        return getattr(data, key)
+
+    def set(self, data, key, value):
+        setattr(data, key, value)
+
+    def items(self, data):
+        return iter(data)
+
+
+class DictModel(ObjectModel):
+    """
+    Unmarshals complex content into plain dictionaries.
+
+    Keys & values match those of the suds objects constructed by the
+    L{ObjectModel}, so the result is the same as converting those using
+    L{suds.sudsobject.recursive_asdict()}.
+    """
+
+    def object(self, name, sxtype=None):
+        return {}
+
+    def property(self, name, value, data):
+        result = {"value": value}
+        result.update(data)
+        return result
+
+    def get(self, data, key):
+        return data[key]
+
+    def set(self, data, key, value):
+        data[key] = value
+
+    def items(self, data):
+        return iter(data.items())
+
+
+class Deferred(Object):
+    """
+    A suds object unmarshalling its child elements on first access.
+
+    Child element XML nodes are kept, grouped by key, until the key's value
+    is first accessed. The value is then unmarshalled by the lazy
+    unmarshaller that constructed the object and memoized as a regular
+    object attribute. Keys are kept in document order.
+
+    @ivar __keys__: All of the object's keys in order.
+    @type __keys__: [str,...]
+    @ivar __pending__: Child element XML nodes not yet unmarshalled, by key.
+    @type __pending__: {str: [L{suds.sax.element.Element},...]}
+    @ivar __context__: The unmarshaller, the object's schema type L{Frame}
+        and projected fields tree, used to unmarshal pending child elements.
+    @type __context__: tuple
+    """
+
+    def __init__(self):
+        d = self.__dict__
+        d["__keys__"] = []
+        d["__pending__"] = {}
+
+    @property
+    def __keylist__(self):
+        return list(self.__dict__.get("__keys__", ()))
+
+    def __getattr__(self, name):
+        pending = self.__dict__.get("__pending__")
+        if pending and name in pending:
+            nodes = pending[name]
+            umx, frame, fields = self.__dict__["__context__"]
+            umx.materialize(self, name, nodes, frame, fields)
+            if not pending:
+                del self.__dict__["__context__"]
+            return self.__dict__[name]
+        return Object.__getattr__(self, name)
+
+    def __setattr__(self, name, value):
+        d = self.__dict__
+        if not _builtin(name):
+            d["__pending__"].pop(name, None)
+            keys = d["__keys__"]
+            if name not in d and name not in keys:
+                keys.append(name)
+        d[name] = value
+
+    def __delattr__(self, name):
+        d = self.__dict__
+        if name in d["__pending__"]:
+            del d["__pending__"][name]
+            d["__keys__"].remove(name)
+            return
+        Object.__delattr__(self, name)
+        if not _builtin(name):
+            d["__keys__"].remove(name)
+
+    def __len__(self):
+        return len(self.__dict__.get("__keys__", ()))
+
+    def __contains__(self, name):
+        d = self.__dict__
+        return (name in d and not _builtin(name)) or name in d.get(
+            "__pending__", ())
+
+    def __getstate__(self):
+        self.__materialize__()
+        state = dict(self.__dict__)
+        state.pop("__context__", None)
+        return state
+
+    def __materialize__(self):
+        """
+        Unmarshal all of the pending child elements, recursively.
+        """
+        for k in self.__keylist__:
+            v = getattr(self, k)
+            for v in (v if isinstance(v, list) else (v,)):
+                if isinstance(v, Deferred):
+                    v.__materialize__()
+
+
+class LazyModel(ObjectModel):
+    """
+    Unmarshals complex content into L{Deferred} suds objects, unmarshalling
+    child elements on first access.
+    """
+
+    def object(self, name, sxtype=None):
+        data = Factory.subclass(name, Deferred)()
+        if sxtype is not None:
+            data.__metadata__.sxtype = sxtype
+        return data
+
+    def contains(self, data, key):
+        return key in data.__dict__
+
+
+models = {"object": ObjectModel(), "dict": DictModel(), "lazy": LazyModel()}
+
+# Only repeated flat records get unmarshalled into columns, see
+# L{suds.umx.columnar}.
+models["columns"] = models["object"]
+
+
+def get(name):
+    """
+    Get a reply model by name.
+    @param name: The reply model name.
+    @type name: str
+    @return: The reply model.
+    @rtype: L{ObjectModel}
+    """
+    model = models.get(name)
+    if model is None:
+        raise Exception("unknown reply model '%s', expected one of: %s" % (
+            name, ", ".join(sorted(models))))
+    return model
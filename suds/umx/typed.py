@@ -22,7 +22,6 @@ from suds import *
 from suds.umx import *
 from suds.umx.core import Core
 from suds.resolver import NodeResolver, Frame
-from suds.sudsobject import Factory
 
 from logging import getLogger
 log = getLogger(__name__)
@@ -44,31 +43,46 @@ class Typed(Core):
     @type resolver: L{NodeResolver}
     """
 
-    def __init__(self, schema):
+    def __init__(self, schema, model=None):
         """
         @param schema: A schema object.
         @type schema: L{xsd.schema.Schema}
+        @param model: The reply model, suds objects are constructed if None.
+        @type model: L{suds.umx.model.ObjectModel}
         """
         self.resolver = NodeResolver(schema)
+        if model is not None:
+            self.model = model
 
-    def process(self, node, type):
+    def process(self, node, type, fields=None):
         """
         Process an object graph representation of the xml L{node}.
         @param node: An XML tree.
         @type node: L{sax.element.Element}
         @param type: The I{optional} schema type.
         @type type: L{xsd.sxbase.SchemaObject}
+        @param fields: The I{optional} projected fields tree, see
+            L{suds.umx.core.projection()}.
+        @type fields: dict
         @return: A suds object.
         @rtype: L{Object}
         """
         content = Content(node)
         content.type = type
+        content.fields = fields
         return Core.process(self, content)
 
     def reset(self):
-        log.debug('reset')
+        if DEBUG_LOGGING:
+            log.debug('reset')
         self.resolver.reset()
 
+    def enter(self):
+        return self.resolver.enter()
+
+    def leave(self, state):
+        self.resolver.leave(state)
+
     def start(self, content):
         #
         # Resolve to the schema type; build an object and setup metadata.
@@ -88,9 +102,7 @@ class Typed(Core):
         cls_name = real.name
         if cls_name is None:
             cls_name = content.node.name
-        content.data = Factory.object(cls_name)
-        md = content.data.__metadata__
-        md.sxtype = real
+        content.data = self.model.object(cls_name, real)
 
     def end(self, content):
         self.resolver.pop()
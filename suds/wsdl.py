@@ -33,6 +33,7 @@ from suds.xsd.schema import Schema, SchemaCollection
 
 import re
 from . import soaparray
+import suds.tracing
 from urllib.parse import urljoin
 
 from logging import getLogger
@@ -185,12 +186,18 @@ class Definitions(WObject):
         if imported_definitions is None:
             imported_definitions = {}
         imported_definitions[url] = self
-        self.open_imports(imported_definitions)
-        self.resolve()
-        self.build_schema()
-        self.set_wrapped()
+        tracer = options.tracer
+        with suds.tracing.loading(tracer, "suds.wsdl.imports", url):
+            self.open_imports(imported_definitions)
+        with suds.tracing.loading(tracer, "suds.wsdl.resolve", url):
+            self.resolve()
+        with suds.tracing.loading(tracer, "suds.wsdl.build_schema", url):
+            self.build_schema()
+        with suds.tracing.loading(tracer, "suds.wsdl.set_wrapped", url):
+            self.set_wrapped()
         for s in self.services:
-            self.add_methods(s)
+            with suds.tracing.loading(tracer, "suds.wsdl.add_methods", url):
+                self.add_methods(s)
         log.debug("WSDL at '%s' loaded:\n%s", url, self)
 
     def mktns(self, root):
@@ -234,8 +241,12 @@ class Definitions(WObject):
 
     def resolve(self):
         """Tell all children to resolve themselves."""
+        tracer = self.options.tracer
         for c in self.children:
-            c.resolve(self)
+            with suds.tracing.span(tracer, "suds.wsdl.object", tracer and {
+                    "object": "%s %s" % (c.__class__.__name__, getattr(c,
+                    "name", None))}):
+                c.resolve(self)
 
     def build_schema(self):
         """Process L{Types} objects and create the schema collection."""
@@ -255,7 +266,9 @@ class Definitions(WObject):
         # reference entities from the imported schema, but do not include them
         # as their own content.
         for s in (t.schema() for t in self.types if t.imported()):
-            self.schema.merge(s)
+            with suds.tracing.loading(self.options.tracer, "suds.schema.merge",
+                    s.baseurl):
+                self.schema.merge(s)
         return self.schema
 
     def add_methods(self, service):
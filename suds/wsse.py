@@ -25,12 +25,6 @@ from suds.sax.element import Element
 from suds.sax.date import DateTime, UtcTimezone
 from datetime import datetime, timedelta
 
-try:
-    from hashlib import md5
-except ImportError:
-    # Python 2.4 compatibility
-    from md5 import md5
-
 
 dsns = \
     ('ds',
@@ -154,6 +148,7 @@ class UsernameToken(Token):
         @type text: str
         """
         if text is None:
+            from hashlib import md5
             s = []
             s.append(self.username)
             s.append(self.password)
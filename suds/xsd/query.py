@@ -68,7 +68,8 @@ class Query(Object):
             return True
         reject = ( result in self.history )
         if reject:
-            log.debug('result %s, rejected by\n%s', Repr(result), self)
+            if DEBUG_LOGGING:
+                log.debug('result %s, rejected by\n%s', Repr(result), self)
         return reject
 
     def result(self, result):
@@ -78,11 +79,13 @@ class Query(Object):
         @type result: L{sxbase.SchemaObject}
         """
         if result is None:
-            log.debug('%s, not-found', self.ref)
+            if DEBUG_LOGGING:
+                log.debug('%s, not-found', self.ref)
             return
         if self.resolved:
             result = result.resolve()
-        log.debug('%s, found as: %s', self.ref, Repr(result))
+        if DEBUG_LOGGING:
+            log.debug('%s, found as: %s', self.ref, Repr(result))
         self.history.append(result)
         return result
 
@@ -98,7 +101,8 @@ class BlindQuery(Query):
         if schema.builtin(self.ref):
             name = self.ref[0]
             b = Factory.create(schema, name)
-            log.debug('%s, found builtin (%s)', self.id, name)
+            if DEBUG_LOGGING:
+                log.debug('%s, found builtin (%s)', self.id, name)
             return b
         result = None
         for d in (schema.elements, schema.types):
@@ -124,7 +128,8 @@ class TypeQuery(Query):
         if schema.builtin(self.ref):
             name = self.ref[0]
             b = Factory.create(schema, name)
-            log.debug('%s, found builtin (%s)', self.id, name)
+            if DEBUG_LOGGING:
+                log.debug('%s, found builtin (%s)', self.id, name)
             return b
         result = schema.types.get(self.ref)
         if self.filter(result):
@@ -31,6 +31,7 @@ from suds.xsd.sxbasic import Factory as BasicFactory
 from suds.xsd.sxbuiltin import Factory as BuiltinFactory
 from suds.sax import splitPrefix, Namespace
 from suds.sax.element import Element
+import suds.tracing
 
 from logging import getLogger
 log = getLogger(__name__)
@@ -94,16 +95,25 @@ class SchemaCollection(UnicodeMixin):
         @rtype: L{Schema}
 
         """
+        tracer = options.tracer
         if options.autoblend:
             self.autoblend()
         for child in self.children:
-            child.build()
+            with suds.tracing.loading(tracer, "suds.schema.build",
+                    child.baseurl):
+                child.build()
         for child in self.children:
-            child.open_imports(options, loaded_schemata)
+            with suds.tracing.loading(tracer, "suds.schema.imports",
+                    child.baseurl):
+                child.open_imports(options, loaded_schemata)
         for child in self.children:
-            child.dereference()
+            with suds.tracing.loading(tracer, "suds.schema.dereference",
+                    child.baseurl):
+                child.dereference(tracer)
         log.debug("loaded:\n%s", self)
-        merged = self.merge()
+        with suds.tracing.loading(tracer, "suds.schema.merge",
+                self.children and self.children[0].baseurl or None):
+            merged = self.merge()
         log.debug("MERGED:\n%s", merged)
         return merged
 
@@ -257,10 +267,15 @@ class Schema(UnicodeMixin):
             # XML elements to our schema before our XSD schema object entities
             # get built, but there is bound to be a cleaner way to do this,
             # similar to how we support such XML modifications in suds plugins.
-            self.build()
-            self.open_imports(options, loaded_schemata)
+            tracer = options.tracer
+            with suds.tracing.loading(tracer, "suds.schema.build", baseurl):
+                self.build()
+            with suds.tracing.loading(tracer, "suds.schema.imports", baseurl):
+                self.open_imports(options, loaded_schemata)
             log.debug("built:\n%s", self)
-            self.dereference()
+            with suds.tracing.loading(tracer, "suds.schema.dereference",
+                    baseurl):
+                self.dereference(tracer)
             log.debug("dereferenced:\n%s", self)
 
     def mktns(self):
@@ -355,25 +370,45 @@ class Schema(UnicodeMixin):
             log.debug("imported:\n%s", imported)
             self.merge(imported)
 
-    def dereference(self):
-        """Instruct all children to perform dereferencing."""
+    def dereference(self, tracer=None):
+        """
+        Instruct all children to perform dereferencing.
+
+        @param tracer: The tracer notified of each schema object getting
+            qualified & merged with its dependency, attributed with the top
+            level schema object containing it, and of sorting all the schema
+            objects by their dependencies, if any.
+        @type tracer: L{suds.tracing.Tracer}
+
+        """
         all = []
         indexes = {}
+        owners = {}
         for child in self.children:
+            start = len(all)
             child.content(all)
+            if tracer is not None:
+                owner = {"type": "%s {%s}%s" % (child.__class__.__name__,
+                    self.tns[1], child.name)}
+                for x in all[start:]:
+                    owners[x] = owner
         dependencies = {}
         for x in all:
-            x.qualify()
-            midx, deps = x.dependencies()
+            with suds.tracing.span(tracer, "suds.schema.type", owners.get(x)):
+                x.qualify()
+                midx, deps = x.dependencies()
             dependencies[x] = deps
             indexes[x] = midx
-        for x, deps in dependency_sort(dependencies):
+        with suds.tracing.span(tracer, "suds.schema.dependency_sort"):
+            ordered = dependency_sort(dependencies)
+        for x, deps in ordered:
             midx = indexes.get(x)
             if midx is None:
                 continue
             d = deps[midx]
             log.debug("(%s) merging %s <== %s", self.tns[1], Repr(x), Repr(d))
-            x.merge(d)
+            with suds.tracing.span(tracer, "suds.schema.type", owners.get(x)):
+                x.merge(d)
 
     def locate(self, ns):
         """
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds benchmark suite.
+
+Times the main suds processing stages using a WSDL & replies generated by
+tests.profiling.generate, all served locally from a suds DocumentStore
+without any network access:
+
+  - cold & warm (object cache) Client construction
+  - Factory.create()
+  - document/literal request marshalling & serialization
+  - document/literal reply parsing & unmarshalling
+  - rpc/encoded request marshalling
+  - rpc/encoded multiref reply processing
+
+Each benchmark gets calibrated to run for at least 0.2 seconds per timing and
+its best & median per call times get reported. Results may be saved as a JSON
+report and compared against a previously saved baseline report, exiting with
+status 1 if any benchmark got slower by more than the given threshold.
+
+Usage::
+
+    python -m tests.profiling.benchmark [options]
+    python -m tests.profiling.benchmark --output baseline.json
+    python -m tests.profiling.benchmark --compare baseline.json
+
+"""
+
+import suds
+import suds.cache
+import suds.client
+import tests.profiling.generate as generate
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import timeit
+
+
+class Invocation(object):
+    """
+    Web service operation invocation stages for a single operation, run
+    separately using the suds client internals.
+
+    """
+
+    def __init__(self, client, port, name, args):
+        self.client = client
+        self.method = getattr(client.service[port], name).method
+        self.args = args
+        self.soap = suds.client._SoapClient(client, self.method)
+
+    def marshal(self):
+        return self.soap.get_message(self.args, {})
+
+    def unmarshal(self, replyroot):
+        binding = self.method.binding.output.using(self.soap.options)
+        return binding.get_reply(self.method, replyroot)
+
+
+class Benchmarks(object):
+    """
+    The benchmarks, run using a generated WSDL of the given size.
+
+    Benchmark methods are named 'bench_<group>_<stage>'.
+
+    """
+
+    def __init__(self, types=50, depth=3, operations=10, records=100,
+            namespaces=4):
+        self.parameters = dict(types=types, depth=depth,
+            operations=operations, records=records, namespaces=namespaces)
+        self.generator = generate.Generator(types=types,
+            namespaces=namespaces, depth=depth, operations=operations)
+        self.store = self.generator.store()
+        self.cache_dir = tempfile.mkdtemp(prefix="suds-benchmark-")
+        self.cache = suds.cache.ObjectCache(self.cache_dir, days=1)
+        self.client = self.new_client()
+        self.factory = self.client.factory
+        items = [self.record(i) for i in range(records)]
+        self.document = Invocation(self.client, "DocumentPort", "doc0",
+            [items])
+        self.envelope = self.document.marshal()
+        self.reply = self.generator.reply("doc0", records)
+        self.replyroot = suds.client._parse(self.reply)
+        items = self.factory.create("{%s}rpcEnc0Records" % (
+            self.generator.namespace(0),))
+        items.item = [self.record(i) for i in range(records)]
+        self.encoded = Invocation(self.client, "RpcEncodedPort", "rpcEnc0",
+            [items])
+        self.encoded_reply = self.generator.reply("rpcEnc0", records,
+            multiref=True)
+        self.check()
+        self.new_client(cache=self.cache, cachingpolicy=1)
+
+    def close(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def new_client(self, **kwargs):
+        kwargs.setdefault("cache", None)
+        return suds.client.Client(self.generator.url,
+            documentStore=self.store, nosend=True, **kwargs)
+
+    def record(self, i):
+        """
+        Construct a record of the 'doc0' & 'rpcEnc0' operations' record type
+        using the client's factory, holding the same values as the
+        generated replies.
+
+        """
+        t = self.generator.record_type(0)
+        result = self.factory.create("{%s}Type%d" % (self.generator.namespace(
+            self.generator.type_namespace(t)), t))
+        elements, attributes = self.generator.fields(t)
+        for k, name in elements:
+            kind = name.rsplit("_", 1)[1]
+            setattr(result, name, i if kind == "count" else "%s %d" % (kind,
+                i))
+        setattr(result, "_" + attributes[0], i)
+        setattr(result, "_" + attributes[1], True)
+        return result
+
+    def check(self):
+        """Verify the canned replies get unmarshalled as expected."""
+        records = self.parameters["records"]
+        # Document/literal replies get unwrapped, rpc ones do not.
+        for items in (self.bench_document_unmarshal(),
+                getattr(self.bench_encoded_reply(), "item", [])):
+            assert len(items) == records
+            if not records:
+                continue
+            item = items[-1]
+            elements, attributes = self.generator.fields(
+                self.generator.record_type(0))
+            assert getattr(item, elements[-1][1]) == records - 1
+            assert getattr(item, "_" + attributes[1]) is True
+
+    def bench_client_cold(self):
+        self.new_client()
+
+    def bench_client_warm(self):
+        self.new_client(cache=self.cache, cachingpolicy=1)
+
+    def bench_factory_create(self):
+        self.record(0)
+
+    def bench_document_marshal(self):
+        self.document.marshal()
+
+    def bench_document_serialize(self):
+        self.envelope.plain().encode("utf-8")
+
+    def bench_document_parse(self):
+        suds.client._parse(self.reply)
+
+    def bench_document_unmarshal(self):
+        return self.document.unmarshal(self.replyroot)
+
+    def bench_encoded_marshal(self):
+        self.encoded.marshal()
+
+    def bench_encoded_reply(self):
+        # Multiref processing modifies the parsed reply so it can not be
+        # reused.
+        replyroot = suds.client._parse(self.encoded_reply)
+        return self.encoded.unmarshal(replyroot)
+
+    @classmethod
+    def names(cls):
+        return [x[len("bench_"):].replace("_", ".", 1) for x in dir(cls) if
+            x.startswith("bench_")]
+
+    def timer(self, name):
+        return timeit.Timer(getattr(self, "bench_" + name.replace(".", "_")))
+
+
+def run(benchmarks, names, repeat=5, minimum=0.2, verbose=True):
+    """
+    Run the given benchmarks.
+
+    Returns a {name: {'number':, 'times':, 'best':, 'median':}} dictionary
+    with all times given in seconds per call.
+
+    """
+    results = {}
+    for name in names:
+        timer = benchmarks.timer(name)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= minimum:
+                break
+            number *= max(2, min(10, int(minimum / max(elapsed, 1e-9)) + 1))
+        times = [elapsed / number] + [timer.timeit(number) / number for i in
+            range(repeat - 1)]
+        results[name] = dict(number=number, times=times, best=min(times),
+            median=statistics.median(times))
+        if verbose:
+            print("  %-20s %12s %12s  (%d x %d)" % (name, _format(min(times)),
+                _format(statistics.median(times)), repeat, number))
+    return results
+
+
+def report(parameters, results):
+    """Construct a JSON benchmark report."""
+    return dict(
+        python=sys.version,
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        suds=suds.__version__,
+        parameters=parameters,
+        benchmarks=results)
+
+
+def compare(baseline, current, threshold):
+    """
+    Compare a benchmark report against a baseline report.
+
+    Prints best times & their ratios for all benchmarks found in both
+    reports and returns the names of benchmarks slower than the baseline by
+    more than <threshold> percent.
+
+    """
+    if baseline.get("parameters") != current["parameters"]:
+        print("WARNING: benchmark parameters differ from the baseline's %s" %
+            (baseline.get("parameters"),))
+    print("  %-20s %12s %12s %8s" % ("benchmark", "baseline", "current",
+        "ratio"))
+    regressions = []
+    for name, result in sorted(current["benchmarks"].items()):
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        ratio = result["best"] / base["best"]
+        flag = ""
+        if ratio > 1 + threshold / 100.0:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif ratio < 1 - threshold / 100.0:
+            flag = "  improved"
+        print("  %-20s %12s %12s %7.2fx%s" % (name, _format(base["best"]),
+            _format(result["best"]), ratio, flag))
+    return regressions
+
+
+def _format(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "%.3f %s" % (seconds / scale, unit)
+    return "%.1f ns" % (seconds / 1e-9,)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.profiling.benchmark",
+        description="Run the suds benchmark suite.")
+    parser.add_argument("--types", type=int, default=50,
+        help="number of generated WSDL complex types (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=3,
+        help="generated type extension chain depth (default: %(default)s)")
+    parser.add_argument("--operations", type=int, default=10,
+        help="number of generated WSDL operations per port (default: "
+        "%(default)s)")
+    parser.add_argument("--namespaces", type=int, default=4,
+        help="number of generated WSDL schema namespaces (default: "
+        "%(default)s)")
+    parser.add_argument("--records", type=int, default=100,
+        help="number of records per request & reply (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5,
+        help="timings per benchmark (default: %(default)s)")
+    parser.add_argument("--filter", action="append", metavar="PREFIX",
+        help="run only benchmarks whose names start with PREFIX")
+    parser.add_argument("--output", metavar="FILE",
+        help="save the JSON benchmark report to FILE")
+    parser.add_argument("--compare", metavar="FILE",
+        help="compare against the baseline JSON benchmark report in FILE")
+    parser.add_argument("--threshold", type=float, default=10,
+        help="regression threshold in percent (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = Benchmarks.names()
+    if args.filter:
+        names = [x for x in names if any(x.startswith(f) for f in
+            args.filter)]
+    print("Python %s" % (sys.version,))
+    print("")
+    benchmarks = Benchmarks(args.types, args.depth, args.operations,
+        args.records, args.namespaces)
+    try:
+        print("Benchmarks %s" % (", ".join("%s=%s" % x for x in sorted(
+            benchmarks.parameters.items())),))
+        print("  %-20s %12s %12s" % ("benchmark", "best", "median"))
+        results = run(benchmarks, names, args.repeat)
+    finally:
+        benchmarks.close()
+    current = report(benchmarks.parameters, results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print("")
+        print("Comparing against %s (threshold %g %%)" % (args.compare,
+            args.threshold))
+        if compare(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
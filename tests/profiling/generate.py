@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Synthetic large WSDL & reply generator for scale testing.
+
+Generates a valid WSDL together with its XSD schema documents, spread over
+the given number of target namespaces, each namespace having a main schema
+document importing the other namespaces it references and including a
+second document holding the namespace's groups & attribute groups. Complex
+types form extension chains of the given depth, crossing namespaces, with
+the first type in each chain referencing a model group & an attribute group
+and optionally nesting the last type of the previous chain.
+
+The WSDL defines three ports, each with the given number of operations, one
+using document/literal, one rpc/literal & one rpc/encoded operations. Each
+operation takes & returns a sequence of records of the last type in one of
+the extension chains. Matching replies containing any number of records may
+be generated, rpc/encoded ones optionally referencing each record as a
+separate multiref element.
+
+Usage::
+
+    python -m tests.profiling.generate [options] --output DIR
+    python -m tests.profiling.generate [options] --reply OPERATION \\
+        --records N [--multiref] --output FILE
+    python -m tests.profiling.generate [options] --scale N [N ...]
+
+The last form loads generated WSDLs with the given numbers of types and
+reports how client construction time scales with their size.
+
+"""
+
+import suds
+import suds.client
+import suds.store
+
+import argparse
+import os
+import sys
+import time
+
+
+XSD = "http://www.w3.org/2001/XMLSchema"
+ENCODING = "http://schemas.xmlsoap.org/soap/encoding/"
+
+# Operation styles: (port name, operation name prefix, SOAP binding style,
+# SOAP body use).
+STYLES = (
+    ("DocumentPort", "doc", "document", "literal"),
+    ("RpcLiteralPort", "rpcLit", "rpc", "literal"),
+    ("RpcEncodedPort", "rpcEnc", "rpc", "encoded"))
+
+
+class Generator(object):
+    """
+    Generates a WSDL, its schema documents & matching replies.
+
+    @ivar types: The number of complex types.
+    @type types: int
+    @ivar namespaces: The number of schema target namespaces.
+    @type namespaces: int
+    @ivar depth: The extension chain depth.
+    @type depth: int
+    @ivar groups: The number of model & attribute groups.
+    @type groups: int
+    @ivar operations: The number of operations per port.
+    @type operations: int
+    @ivar base: The base URL of all generated documents.
+    @type base: str
+
+    """
+
+    def __init__(self, types=1000, namespaces=10, depth=5, groups=20,
+            operations=10, base="suds://generated/"):
+        self.types = max(types, 1)
+        self.namespaces = max(min(namespaces, self.types), 1)
+        self.depth = max(min(depth, self.types), 1)
+        self.groups = max(groups, 1)
+        self.operations = max(operations, 1)
+        self.base = base
+
+    @property
+    def url(self):
+        """The WSDL URL."""
+        return self.base + "service.wsdl"
+
+    def store(self):
+        """Get a DocumentStore containing all the generated documents."""
+        return suds.store.DocumentStore(dict((self.__location(url), content)
+            for url, content in self.documents().items()))
+
+    def client(self, **kwargs):
+        """Construct a suds client for the generated WSDL."""
+        kwargs.setdefault("cache", None)
+        return suds.client.Client(self.url, documentStore=self.store(),
+            **kwargs)
+
+    def documents(self):
+        """
+        Generate all the documents.
+        @return: Document content by URL.
+        @rtype: {str: bytes}
+        """
+        result = {self.url: self.wsdl()}
+        for k in range(self.namespaces):
+            result[self.__schema_url(k)] = self.schema(k)
+            result[self.__groups_url(k)] = self.group_schema(k)
+        return dict((url, suds.byte_str(x)) for url, x in result.items())
+
+    def write(self, directory):
+        """Write all the documents into the given directory."""
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        for url, content in self.documents().items():
+            path = os.path.join(directory, url[len(self.base):])
+            with open(path, "wb") as f:
+                f.write(content)
+
+    # Model.
+
+    def namespace(self, k):
+        return "urn:generated:ns%d" % (k,)
+
+    def type_namespace(self, i):
+        return i % self.namespaces
+
+    def group_namespace(self, g):
+        return g % self.namespaces
+
+    def chain_start(self, i):
+        return i - i % self.depth
+
+    def chain_end(self, i):
+        return min(self.chain_start(i) + self.depth, self.types) - 1
+
+    def group(self, i):
+        """Get the groups referenced by a chain start type."""
+        return (i // self.depth) % self.groups
+
+    def nested(self, i):
+        """Get the type nested by a chain start type, None if none."""
+        if i >= self.depth:
+            return i - 1
+
+    def record_type(self, k):
+        """Get the record type of the k-th operation of each port."""
+        chains = (self.types + self.depth - 1) // self.depth
+        return self.chain_end((k % chains) * self.depth)
+
+    def fields(self, i):
+        """
+        Get the elements & attributes of a type in instance document order.
+        @return: ([(namespace index, element name),...],
+            [attribute name,...]) pair.
+        @rtype: tuple
+        """
+        elements = []
+        start = self.chain_start(i)
+        g = self.group(start)
+        gk = self.group_namespace(g)
+        elements.append((gk, "g%d_code" % (g,)))
+        elements.append((gk, "g%d_label" % (g,)))
+        for j in range(start, i + 1):
+            k = self.type_namespace(j)
+            elements.append((k, "t%d_name" % (j,)))
+            elements.append((k, "t%d_count" % (j,)))
+        return elements, ["a%d_id" % (g,), "a%d_flag" % (g,)]
+
+    # Documents.
+
+    def schema(self, k):
+        """Generate the main schema document of the k-th namespace."""
+        types = []
+        imports = set()
+        for i in range(k, self.types, self.namespaces):
+            types.append(self.complex_type(i, imports))
+        if k == 0:
+            for n, style in enumerate(STYLES):
+                for op in range(self.operations):
+                    types.append(self.wrappers(style, op, imports))
+        imports.discard(k)
+        s = [self.__schema_header(k, imports)]
+        s.append('  <xsd:include schemaLocation="%s"/>' % (
+            self.__groups_url(k),))
+        s.extend(types)
+        s.append("</xsd:schema>")
+        return "\n".join(s)
+
+    def group_schema(self, k):
+        """Generate the included groups schema document of a namespace."""
+        s = [self.__schema_header(k, ())]
+        for g in range(k, self.groups, self.namespaces):
+            s.append("""\
+  <xsd:group name="Group%(g)d">
+    <xsd:sequence>
+      <xsd:element name="g%(g)d_code" type="xsd:string"/>
+      <xsd:element name="g%(g)d_label" type="xsd:string" minOccurs="0"/>
+    </xsd:sequence>
+  </xsd:group>
+  <xsd:attributeGroup name="Attrs%(g)d">
+    <xsd:attribute name="a%(g)d_id" type="xsd:int"/>
+    <xsd:attribute name="a%(g)d_flag" type="xsd:boolean"/>
+  </xsd:attributeGroup>""" % dict(g=g))
+        s.append("</xsd:schema>")
+        return "\n".join(s)
+
+    def complex_type(self, i, imports):
+        k = self.type_namespace(i)
+        elements = """\
+      <xsd:element name="t%(i)d_name" type="xsd:string"/>
+      <xsd:element name="t%(i)d_count" type="xsd:int"/>""" % dict(i=i)
+        if i != self.chain_start(i):
+            base = i - 1
+            imports.add(self.type_namespace(base))
+            return """\
+  <xsd:complexType name="Type%d">
+    <xsd:complexContent>
+      <xsd:extension base="ns%d:Type%d">
+        <xsd:sequence>
+%s
+        </xsd:sequence>
+      </xsd:extension>
+    </xsd:complexContent>
+  </xsd:complexType>""" % (i, self.type_namespace(base), base, "\n".join(
+                "    " + x for x in elements.split("\n")))
+        g = self.group(i)
+        gk = self.group_namespace(g)
+        imports.add(gk)
+        nested = self.nested(i)
+        if nested is not None:
+            imports.add(self.type_namespace(nested))
+            elements += """
+      <xsd:element name="t%d_next" type="ns%d:Type%d" minOccurs="0"/>""" % (
+                i, self.type_namespace(nested), nested)
+        return """\
+  <xsd:complexType name="Type%d">
+    <xsd:sequence>
+      <xsd:group ref="ns%d:Group%d"/>
+%s
+    </xsd:sequence>
+    <xsd:attributeGroup ref="ns%d:Attrs%d"/>
+  </xsd:complexType>""" % (i, gk, g, elements, gk, g)
+
+    def wrappers(self, style, op, imports):
+        """Generate the schema content used by an operation."""
+        port, prefix, binding, use = style
+        name = "%s%d" % (prefix, op)
+        t = self.record_type(op)
+        imports.add(self.type_namespace(t))
+        sequence = """\
+    <xsd:sequence>
+      <xsd:element name="item" type="ns%d:Type%d" minOccurs="0"
+          maxOccurs="unbounded"/>
+    </xsd:sequence>""" % (self.type_namespace(t), t)
+        if binding == "document":
+            return "\n".join("""\
+  <xsd:element name="%s%s">
+    <xsd:complexType>
+  %s
+    </xsd:complexType>
+  </xsd:element>""" % (name, suffix, sequence.replace("\n", "\n  ")) for
+                suffix in ("Request", "Response"))
+        return """\
+  <xsd:complexType name="%sRecords">
+%s
+  </xsd:complexType>""" % (name, sequence)
+
+    def wsdl(self):
+        """Generate the WSDL document."""
+        s = ["""\
+<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="urn:generated:wsdl"
+    xmlns:tns="urn:generated:wsdl"
+    xmlns:ns0="%s"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:xsd="%s"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/">
+  <wsdl:types>
+    <xsd:schema targetNamespace="urn:generated:wsdl">
+      <xsd:import namespace="%s" schemaLocation="%s"/>
+    </xsd:schema>
+  </wsdl:types>""" % (self.namespace(0), XSD, self.namespace(0),
+            self.__schema_url(0))]
+        ports = []
+        bindings = []
+        for style in STYLES:
+            port, prefix, binding, use = style
+            operations = []
+            bops = []
+            for op in range(self.operations):
+                name = "%s%d" % (prefix, op)
+                for suffix, part in (("Request", "items"),
+                        ("Response", "result")):
+                    if binding == "document":
+                        part = 'name="parameters" element="ns0:%s%s"' % (
+                            name, suffix)
+                    else:
+                        part = 'name="%s" type="ns0:%sRecords"' % (part,
+                            name)
+                    s.append("""\
+  <wsdl:message name="%s%s">
+    <wsdl:part %s/>
+  </wsdl:message>""" % (name, suffix, part))
+                operations.append("""\
+    <wsdl:operation name="%(name)s">
+      <wsdl:input message="tns:%(name)sRequest"/>
+      <wsdl:output message="tns:%(name)sResponse"/>
+    </wsdl:operation>""" % dict(name=name))
+                body = 'use="%s"' % (use,)
+                if binding == "rpc":
+                    body += ' namespace="%s"' % (self.namespace(0),)
+                if use == "encoded":
+                    body += ' encodingStyle="%s"' % (ENCODING,)
+                bops.append("""\
+    <wsdl:operation name="%(name)s">
+      <soap:operation soapAction="%(name)s"/>
+      <wsdl:input><soap:body %(body)s/></wsdl:input>
+      <wsdl:output><soap:body %(body)s/></wsdl:output>
+    </wsdl:operation>""" % dict(name=name, body=body))
+            ports.append("""\
+  <wsdl:portType name="%sType">
+%s
+  </wsdl:portType>""" % (port, "\n".join(operations)))
+            bindings.append("""\
+  <wsdl:binding name="%sBinding" type="tns:%sType">
+    <soap:binding style="%s"
+        transport="http://schemas.xmlsoap.org/soap/http"/>
+%s
+  </wsdl:binding>""" % (port, port, binding, "\n".join(bops)))
+        s.extend(ports)
+        s.extend(bindings)
+        s.append("""\
+  <wsdl:service name="GeneratedService">""")
+        for port, prefix, binding, use in STYLES:
+            s.append("""\
+    <wsdl:port name="%s" binding="tns:%sBinding">
+      <soap:address location="http://localhost/generated/%s"/>
+    </wsdl:port>""" % (port, port, port))
+        s.append("""\
+  </wsdl:service>
+</wsdl:definitions>""")
+        return "\n".join(s)
+
+    # Replies.
+
+    def reply(self, operation, records, multiref=False):
+        """
+        Generate a reply for an operation.
+        @param operation: The operation name, e.g. 'rpcEnc3'.
+        @type operation: str
+        @param records: The number of records.
+        @type records: int
+        @param multiref: Whether to reference each record as a separate
+            multiref element, rpc/encoded operations only.
+        @type multiref: bool
+        @return: The reply.
+        @rtype: bytes
+        """
+        for port, prefix, binding, use in STYLES:
+            if operation.startswith(prefix) and operation[len(prefix):
+                    ].isdigit():
+                break
+        else:
+            raise Exception("unknown operation '%s'" % (operation,))
+        if multiref and use != "encoded":
+            raise Exception("multiref replies are rpc/encoded only")
+        t = self.record_type(int(operation[len(prefix):]))
+        tk = self.type_namespace(t)
+        encoded = use == "encoded"
+        items = []
+        refs = []
+        for r in range(records):
+            content = self.instance(t, r, encoded)
+            if multiref:
+                items.append('<ns0:item href="#id%d"/>' % (r,))
+                refs.append('<multiRef id="id%d" enc:root="0" '
+                    'xsi:type="ns%d:Type%d"%s</multiRef>' % (r, tk, t,
+                    content))
+            else:
+                xsi_type = encoded and ' xsi:type="ns%d:Type%d"' % (tk, t)
+                items.append("<ns0:item%s%s</ns0:item>" % (xsi_type or "",
+                    content))
+        items = "".join(items)
+        if binding == "document":
+            body = "<ns0:%sResponse>%s</ns0:%sResponse>" % (operation, items,
+                operation)
+        else:
+            style = encoded and ' enc:encodingStyle="%s"' % (ENCODING,)
+            body = ("<ns0:%sResponse%s><result>%s</result></ns0:%sResponse>"
+                "%s" % (operation, style or "", items, operation,
+                "".join(refs)))
+        return suds.byte_str("""\
+<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:enc="%s"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xmlns:xsd="%s"
+    %s>
+  <env:Body>%s</env:Body>
+</env:Envelope>""" % (ENCODING, XSD, "\n    ".join('xmlns:ns%d="%s"' % (k,
+            self.namespace(k)) for k in range(self.namespaces)), body))
+
+    def instance(self, i, r, encoded=False):
+        """
+        Generate a record's attributes & content, following its start tag
+        name.
+        """
+        elements, attributes = self.fields(i)
+        s = ['%s="%s"' % (attributes[0], r), '%s="true">' % (attributes[1],)]
+        for k, name in elements:
+            kind = name.rsplit("_", 1)[1]
+            value = r if kind == "count" else "%s %d" % (kind, r)
+            xsi_type = ""
+            if encoded:
+                xsi_type = ' xsi:type="xsd:%s"' % (kind == "count" and "int"
+                    or "string",)
+            s.append("<ns%d:%s%s>%s</ns%d:%s>" % (k, name, xsi_type, value, k,
+                name))
+        return " " + " ".join(s[:2]) + "".join(s[2:])
+
+    def __location(self, url):
+        return url.split("://", 1)[-1]
+
+    def __schema_url(self, k):
+        return "%sns%d.xsd" % (self.base, k)
+
+    def __groups_url(self, k):
+        return "%sns%d-groups.xsd" % (self.base, k)
+
+    def __schema_header(self, k, imports):
+        s = ['<?xml version="1.0" encoding="UTF-8"?>']
+        s.append('<xsd:schema targetNamespace="%s" xmlns:xsd="%s"' % (
+            self.namespace(k), XSD))
+        for n in range(self.namespaces):
+            s.append('    xmlns:ns%d="%s"' % (n, self.namespace(n)))
+        s[-1] += ' elementFormDefault="qualified">'
+        for n in sorted(imports):
+            s.append('  <xsd:import namespace="%s" schemaLocation="%s"/>' % (
+                self.namespace(n), self.__schema_url(n)))
+        return "\n".join(s)
+
+
+def scale(sizes, **kwargs):
+    """
+    Report how client construction time scales with the number of types.
+    """
+    print("  %8s %12s %14s" % ("types", "load [s]", "per type [ms]"))
+    for n in sizes:
+        generator = Generator(types=n, **kwargs)
+        store = generator.store()
+        started = time.perf_counter()
+        suds.client.Client(generator.url, documentStore=store, cache=None)
+        elapsed = time.perf_counter() - started
+        print("  %8d %12.3f %14.3f" % (n, elapsed, elapsed / n * 1000))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.profiling.generate",
+        description="Generate a synthetic WSDL, its schemas & replies.")
+    parser.add_argument("--types", type=int, default=1000,
+        help="number of complex types (default: %(default)s)")
+    parser.add_argument("--namespaces", type=int, default=10,
+        help="number of schema namespaces (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=5,
+        help="extension chain depth (default: %(default)s)")
+    parser.add_argument("--groups", type=int, default=20,
+        help="number of model & attribute groups (default: %(default)s)")
+    parser.add_argument("--operations", type=int, default=10,
+        help="number of operations per port (default: %(default)s)")
+    parser.add_argument("--output", metavar="PATH",
+        help="output directory, or file for replies")
+    parser.add_argument("--reply", metavar="OPERATION",
+        help="generate a reply for the given operation, e.g. doc0, rpcLit0 "
+        "or rpcEnc0")
+    parser.add_argument("--records", type=int, default=100,
+        help="number of records per reply (default: %(default)s)")
+    parser.add_argument("--multiref", action="store_true",
+        help="generate a rpc/encoded reply using multiref elements")
+    parser.add_argument("--scale", type=int, nargs="+", metavar="N",
+        help="report client construction times for N types")
+    args = parser.parse_args(argv)
+    kwargs = dict(namespaces=args.namespaces, depth=args.depth,
+        groups=args.groups, operations=args.operations)
+    if args.scale:
+        print("Python %s" % (sys.version,))
+        print("")
+        scale(args.scale, **kwargs)
+    elif args.reply:
+        generator = Generator(args.types, **kwargs)
+        reply = generator.reply(args.reply, args.records, args.multiref)
+        if args.output:
+            with open(args.output, "wb") as f:
+                f.write(reply)
+        else:
+            sys.stdout.write(reply.decode("utf-8"))
+    elif args.output:
+        Generator(args.types, base="", **kwargs).write(args.output)
+    else:
+        parser.error("one of --output, --reply or --scale is required")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
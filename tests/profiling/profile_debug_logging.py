@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds hot path debug logging overhead profiler.
+
+Constructs a web service operation request & unmarshals its reply, each
+containing a few hundred XML elements, in separate Python interpreter
+processes with hot path debug logging enabled & removed using the
+SUDS_DEBUG_LOGGING environment variable. Debug logging is not enabled in
+either process, so the difference is pure logging call overhead.
+
+Usage::
+
+    python -m tests.profiling.profile_debug_logging [rows]
+
+"""
+
+import os
+import subprocess
+import sys
+
+
+WSDL = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="my-namespace"
+    xmlns:tns="my-namespace"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/">
+  <wsdl:types>
+    <xsd:schema targetNamespace="my-namespace" elementFormDefault="qualified">
+      <xsd:complexType name="Row">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:int"/>
+          <xsd:element name="name" type="xsd:string"/>
+          <xsd:element name="price" type="xsd:double"/>
+          <xsd:element name="when" type="xsd:date"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="Rows">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="row" type="tns:Row" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </wsdl:types>
+  <wsdl:message name="fRequestMessage">
+    <wsdl:part name="parameters" element="tns:Rows"/>
+  </wsdl:message>
+  <wsdl:message name="fResponseMessage">
+    <wsdl:part name="parameters" element="tns:Rows"/>
+  </wsdl:message>
+  <wsdl:portType name="DummyPortType">
+    <wsdl:operation name="f">
+      <wsdl:input message="tns:fRequestMessage"/>
+      <wsdl:output message="tns:fResponseMessage"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="DummyBinding" type="tns:DummyPortType">
+    <soap:binding style="document"
+        transport="http://schemas.xmlsoap.org/soap/http"/>
+    <wsdl:operation name="f">
+      <soap:operation soapAction="my-soap-action"/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="DummyService">
+    <wsdl:port name="DummyPort" binding="tns:DummyBinding">
+      <soap:address location="unga-bunga-location"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+"""
+
+ROW = ("<row><id>%d</id><name>row %d</name><price>%d.5</price>"
+    "<when>2020-01-02</when></row>")
+
+
+class Profiler(object):
+
+    def __init__(self, rows):
+        import suds.client
+        import suds.store
+        store = suds.store.DocumentStore(wsdl=WSDL.encode("utf-8"))
+        self.client = suds.client.Client("suds://wsdl", documentStore=store,
+            cache=None, nosend=True)
+        factory = self.client.factory
+        self.rows = []
+        for i in range(rows):
+            row = factory.create("{my-namespace}Row")
+            row.id = i
+            row.name = "row %d" % (i,)
+            row.price = i + 0.5
+            row.when = "2020-01-02"
+            self.rows.append(row)
+        self.reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body><Rows xmlns="my-namespace">%s</Rows></Body>
+</Envelope>""" % ("".join(ROW % (i, i, i) for i in range(rows)),))
+
+    def roundtrip(self):
+        request = self.client.service.f(self.rows)
+        request.process_reply(self.reply)
+
+    def run(self, number=20, repeat=5):
+        import timeit
+        self.roundtrip()
+        return min(timeit.repeat(self.roundtrip, number=number,
+            repeat=repeat)) / number
+
+
+def measure(debug_logging, rows):
+    """Time a single roundtrip in a new interpreter process [s]."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env["SUDS_DEBUG_LOGGING"] = debug_logging and "1" or "0"
+    popen = subprocess.Popen([sys.executable, "-m", __spec__.name, "--run",
+        str(rows)], cwd=root, env=env, stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE, universal_newlines=True)
+    out, err = popen.communicate()
+    if popen.returncode != 0:
+        raise Exception("profiling run failed:\n%s" % (err,))
+    return float(out)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--run"]:
+        print(Profiler(int(args[1])).run())
+        sys.exit(0)
+    rows = 100
+    if args:
+        rows = int(args[0])
+    print("Python %s" % (sys.version,))
+    print("")
+    print("Request & reply roundtrip with %d rows (best of 5 x 20 runs)" % (
+        rows,))
+    enabled = measure(True, rows)
+    removed = measure(False, rows)
+    print("  debug logging enabled: %8.2f ms" % (enabled * 1000,))
+    print("  debug logging removed: %8.2f ms" % (removed * 1000,))
+    print("  difference:            %8.1f %%" % (
+        (enabled - removed) / enabled * 100,))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds module import time profiler.
+
+Imports a module in fresh Python interpreter processes run with the
+'-X importtime' option and reports the module's cumulative import time
+together with the modules contributing the most to it.
+
+Usage::
+
+    python -m tests.profiling.profile_import [module [repeat]]
+
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+
+_line = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class Profiler(object):
+
+    def __init__(self, module, repeat=7, show_top=15):
+        self.module = module
+        self.repeat = repeat
+        self.show_top = show_top
+
+    def measure(self):
+        """
+        Import the module once in a new interpreter process.
+
+        Returns a {module: (self [us], cumulative [us])} dictionary containing
+        all the modules imported as a result.
+
+        """
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        popen = subprocess.Popen([sys.executable, "-X", "importtime", "-c",
+            "import %s" % (self.module,)], cwd=root, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, universal_newlines=True)
+        out, err = popen.communicate()
+        if popen.returncode != 0:
+            raise Exception("importing '%s' failed:\n%s" % (self.module, err))
+        result = {}
+        for line in err.splitlines():
+            match = _line.match(line)
+            if match:
+                result[match.group(4)] = (int(match.group(1)),
+                    int(match.group(2)))
+        return result
+
+    def run(self):
+        runs = [self.measure() for i in range(self.repeat)]
+        best = min(runs, key=lambda r: r[self.module][1])
+        print("Importing '%s' (best of %d runs)" % (self.module, self.repeat))
+        print("  cumulative: %.1f ms" % (best[self.module][1] / 1000.0,))
+        print("  modules imported: %d (%d suds)" % (len(best), len([m for m
+            in best if m == "suds" or m.startswith("suds.")])))
+        print("")
+        print("  %10s  %10s  %s" % ("self [ms]", "cum. [ms]", "module"))
+        top = sorted(best.items(), key=lambda x: -x[1][0])[:self.show_top]
+        for name, (own, cumulative) in top:
+            print("  %10.1f  %10.1f  %s" % (own / 1000.0, cumulative / 1000.0,
+                name))
+        return best
+
+
+if __name__ == "__main__":
+    print("Python %s" % (sys.version,))
+    print("")
+    module = "suds.client"
+    repeat = 7
+    if len(sys.argv) > 1:
+        module = sys.argv[1]
+    if len(sys.argv) > 2:
+        repeat = int(sys.argv[2])
+    Profiler(module, repeat).run()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds WSDL loading profiler.
+
+Loads a WSDL generated by tests.profiling.generate, or one at the given URL,
+using a suds.diagnostics.LoadProfiler and reports the time & memory spent in
+each loading stage and the most expensive documents, schema types & WSDL
+objects.
+
+Usage::
+
+    python -m tests.profiling.profile_load [options]
+
+"""
+
+import tests.profiling.generate as generate
+
+import argparse
+import sys
+
+
+def main(argv=None):
+    import suds.client
+    import suds.diagnostics
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.profiling.profile_load",
+        description="Profile suds WSDL loading per document & per type.")
+    parser.add_argument("url", nargs="?",
+        help="WSDL URL (default: a generated WSDL)")
+    parser.add_argument("--types", type=int, default=500,
+        help="generated WSDL complex types (default: %(default)s)")
+    parser.add_argument("--namespaces", type=int, default=4,
+        help="generated WSDL schema namespaces (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10,
+        help="reported documents, types & objects (default: %(default)s)")
+    parser.add_argument("--memory", action="store_true",
+        help="trace memory allocations using tracemalloc")
+    args = parser.parse_args(argv)
+
+    profiler = suds.diagnostics.LoadProfiler(memory=args.memory)
+    print("Python %s" % (sys.version,))
+    print("")
+    if args.url:
+        suds.client.Client(args.url, cache=None, tracer=profiler)
+    else:
+        generate.Generator(types=args.types,
+            namespaces=args.namespaces).client(tracer=profiler)
+    print(profiler.report(args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
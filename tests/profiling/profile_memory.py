@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds memory usage profiler.
+
+Measures, using tracemalloc, the peak & retained memory for loading a
+generated WSDL and for parsing & unmarshalling generated replies containing
+the given numbers of records, see tests.profiling.generate. Also reports
+the loaded client's suds.diagnostics memory usage account.
+
+Usage::
+
+    python -m tests.profiling.profile_memory [types [records...]]
+
+"""
+
+import suds.client
+import suds.diagnostics
+import tests.profiling.benchmark as benchmark
+import tests.profiling.generate as generate
+
+import gc
+import sys
+import tracemalloc
+
+
+def traced(fn, *args):
+    """
+    Call a function while tracing memory allocations.
+
+    Returns a (result, peak [bytes], retained [bytes]) tuple, with the
+    retained memory being that still allocated once the function returns
+    and any garbage it left behind, e.g. parsed XML element trees, gets
+    collected.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, peak, retained
+
+
+def unmarshal(invocation, reply):
+    return invocation.unmarshal(suds.client._parse(reply))
+
+
+def _format(size):
+    return "%10.1f kB" % (size / 1024.0,)
+
+
+if __name__ == "__main__":
+    args = [int(x) for x in sys.argv[1:]]
+    types = args[:1] and args[0] or 200
+    records = args[1:] or [10, 100, 1000]
+    depth = 3
+    print("Python %s" % (sys.version,))
+    print("")
+    generator = generate.Generator(types=types, namespaces=4, depth=depth)
+    print("Loading a WSDL with %d types" % (types,))
+    client, peak, retained = traced(generator.client)
+    print("  peak:     %s" % (_format(peak),))
+    print("  retained: %s" % (_format(retained),))
+    print("")
+    print(client.memory_report())
+    print("")
+    print("Unmarshalling document/literal replies (%d types deep extension "
+        "chain records)" % (depth,))
+    print("  %8s %13s %13s %13s" % ("records", "reply size", "peak",
+        "retained"))
+    invocation = benchmark.Invocation(client, "DocumentPort", "doc0", [[]])
+    for n in records:
+        reply = generator.reply("doc0", n)
+        result, peak, retained = traced(unmarshal, invocation, reply)
+        assert len(result) == n
+        print("  %8d %s %s %s" % (n, _format(len(reply)), _format(peak),
+            _format(retained)))
+        del result
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Local SOAP web service stand-in server & end-to-end throughput benchmark.
+
+The L{StandIn} server, based on I{http.server}, serves WSDL & XSD schema
+documents using HTTP GET requests and answers SOAP requests, sent using HTTP
+POST requests, with canned or templated replies selected by their SOAPAction
+header, optionally after a configured latency. Connections are kept alive
+between requests unless keep-alive gets disabled.
+
+Run as a script, it serves a WSDL & replies generated by
+tests.profiling.generate and runs the given number of concurrent suds
+clients, each in its own thread, invoking a web service operation through
+the default suds HTTP transport, and reports the achieved number of requests
+per second & the request latency percentiles.
+
+Usage::
+
+    python -m tests.profiling.server [options]
+
+"""
+
+import tests.profiling.generate as generate
+
+import argparse
+import http.server
+import statistics
+import sys
+import threading
+import time
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Stand-in server HTTP request handler."""
+
+    def do_GET(self):
+        content = self.server.documents.get(self.path.lstrip("/"))
+        if content is None:
+            self.respond(404, b"")
+        else:
+            self.respond(200, content, "text/xml; charset=utf-8")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = self.rfile.read(length)
+        action = self.headers.get("SOAPAction", "").strip('"')
+        reply = self.server.replies.get(action)
+        if reply is None:
+            self.respond(404, b"")
+            return
+        if callable(reply):
+            reply = reply(request)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.count()
+        self.respond(200, reply, "text/xml; charset=utf-8")
+
+    def respond(self, status, content, content_type=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        if not self.server.keep_alive:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandIn(http.server.ThreadingHTTPServer):
+    """
+    A local SOAP web service stand-in server.
+
+    @ivar documents: Documents served by path, e.g. 'service.wsdl'.
+    @type documents: {str: bytes}
+    @ivar replies: SOAP replies by SOAPAction, either canned reply content
+        or callables constructing the reply content from the request
+        content.
+    @type replies: {str: bytes|callable}
+    @ivar latency: Time spent before answering each SOAP request [s].
+    @type latency: float
+    @ivar keep_alive: Whether connections are kept alive between requests.
+    @type keep_alive: bool
+    @ivar requests: The number of SOAP requests answered.
+    @type requests: int
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, documents=None, replies=None, latency=0,
+            keep_alive=True, port=0):
+        self.documents = dict(documents or ())
+        self.replies = dict(replies or ())
+        self.latency = latency
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self.__lock = threading.Lock()
+        self.__thread = None
+        handler = type("Handler", (Handler,), dict(protocol_version=
+            keep_alive and "HTTP/1.1" or "HTTP/1.0"))
+        http.server.ThreadingHTTPServer.__init__(self, ("127.0.0.1", port),
+            handler)
+
+    @property
+    def url(self):
+        """The server's base URL."""
+        return "http://127.0.0.1:%d/" % (self.server_address[1],)
+
+    def count(self):
+        with self.__lock:
+            self.requests += 1
+
+    def start(self):
+        """Start serving requests in a background thread."""
+        self.__thread = threading.Thread(target=self.serve_forever,
+            name="suds-stand-in", daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving requests & close the server."""
+        if self.__thread is not None:
+            self.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def serve(server, generator, records):
+    """
+    Serve a generated WSDL & replies with the given number of records for
+    all its operations.
+    """
+    generator.base = server.url
+    for url, content in generator.documents().items():
+        server.documents[url[len(server.url):]] = content
+    for port, prefix, binding, use in generate.STYLES:
+        for op in range(generator.operations):
+            name = "%s%d" % (prefix, op)
+            server.replies[name] = generator.reply(name, records)
+
+
+def percentile(values, p):
+    """Get the p-th percentile of the given sorted values."""
+    if not values:
+        return 0
+    k = (len(values) - 1) * p / 100.0
+    i = int(k)
+    if i + 1 == len(values):
+        return values[i]
+    return values[i] + (values[i + 1] - values[i]) * (k - i)
+
+
+class Driver(object):
+    """
+    Invokes a web service operation using concurrent suds clients, each
+    a clone of the given client running in its own thread.
+    """
+
+    def __init__(self, client, port, operation, clients=4, requests=100):
+        self.client = client
+        self.port = port
+        self.operation = operation
+        self.clients = clients
+        self.requests = requests
+        self.latencies = []
+        self.errors = 0
+        self.__lock = threading.Lock()
+
+    def worker(self, barrier):
+        client = self.client.clone()
+        method = getattr(client.service[self.port], self.operation)
+        latencies = []
+        errors = 0
+        barrier.wait()
+        for i in range(self.requests):
+            started = time.perf_counter()
+            try:
+                method([])
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        with self.__lock:
+            self.latencies.extend(latencies)
+            self.errors += errors
+
+    def run(self):
+        """
+        Run the benchmark.
+        @return: Requests per second, p50 [s], p90 [s], p99 [s] & error
+            count.
+        @rtype: dict
+        """
+        barrier = threading.Barrier(self.clients + 1)
+        threads = [threading.Thread(target=self.worker, args=(barrier,)) for
+            i in range(self.clients)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        latencies = sorted(self.latencies)
+        return dict(rate=len(latencies) / elapsed,
+            p50=percentile(latencies, 50), p90=percentile(latencies, 90),
+            p99=percentile(latencies, 99), mean=statistics.mean(latencies),
+            errors=self.errors)
+
+
+def main(argv=None):
+    import suds.client
+    parser = argparse.ArgumentParser(prog="python -m tests.profiling.server",
+        description="Benchmark suds web service operation invocation "
+        "throughput against a local stand-in server.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4],
+        help="numbers of concurrent clients (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=200,
+        help="requests per client (default: %(default)s)")
+    parser.add_argument("--operation", default="doc0",
+        help="generated operation, e.g. doc0, rpcLit0 or rpcEnc0 (default: "
+        "%(default)s)")
+    parser.add_argument("--records", type=int, default=10,
+        help="records per reply (default: %(default)s)")
+    parser.add_argument("--types", type=int, default=100,
+        help="generated WSDL complex types (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0,
+        help="server latency per request [ms] (default: %(default)s)")
+    parser.add_argument("--no-keep-alive", action="store_true",
+        help="close connections after each request")
+    args = parser.parse_args(argv)
+
+    generator = generate.Generator(types=args.types, operations=1)
+    for port, prefix, binding, use in generate.STYLES:
+        if args.operation.startswith(prefix):
+            break
+    else:
+        parser.error("unknown operation '%s'" % (args.operation,))
+    print("Python %s" % (sys.version,))
+    print("")
+    with StandIn(latency=args.latency / 1000.0,
+            keep_alive=not args.no_keep_alive) as server:
+        serve(server, generator, args.records)
+        client = suds.client.Client(generator.url, cache=None,
+            location=server.url + "soap")
+        print("Invoking '%s' (%d records per reply, %g ms latency, "
+            "keep-alive %s)" % (args.operation, args.records, args.latency,
+            args.no_keep_alive and "off" or "on"))
+        print("  %8s %10s %10s %10s %10s %8s" % ("clients", "req/s",
+            "p50 [ms]", "p90 [ms]", "p99 [ms]", "errors"))
+        for clients in args.clients:
+            result = Driver(client, port, args.operation, clients,
+                args.requests).run()
+            print("  %8d %10.1f %10.2f %10.2f %10.2f %8d" % (clients,
+                result["rate"], result["p50"] * 1000, result["p90"] * 1000,
+                result["p99"] * 1000, result["errors"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -806,6 +806,45 @@ class TestFileCache:
         assert cache1.get("unga2") == value_p2
         assert cache2.get("unga2") is None
 
+    def test_put_replaces_entry_atomically(self, tmpdir):
+        cache_folder = tmpdir.strpath
+        cache = suds.cache.FileCache(cache_folder)
+        cache.put("unga1", value_p1)
+        cache.put("unga1", value_p11)
+        assert cache.get("unga1") == value_p11
+        files = sorted(os.listdir(cache_folder))
+        assert files == [os.path.basename(cache._FileCache__filename("unga1")),
+            "version"]
+
+    @pytest.mark.parametrize(("offset", "expect_expiring", "expect_remove"), (
+        (datetime.timedelta(hours=-2), False, False),
+        (datetime.timedelta(minutes=-30), True, False),
+        (datetime.timedelta(minutes=30), True, False),
+        (datetime.timedelta(hours=2), True, True)))
+    def test_refresh_policy(self, tmpdir, monkeypatch, offset,
+            expect_expiring, expect_remove):
+        policy = suds.cache.RefreshPolicy(stale=datetime.timedelta(hours=1),
+            ahead=datetime.timedelta(hours=1))
+        cache = suds.cache.FileCache(tmpdir.strpath, refresh=policy, days=1)
+        cache.put("unga1", value_p1)
+        filepath = cache._FileCache__filename("unga1")
+        file_time = datetime.datetime.fromtimestamp(os.path.getctime(filepath))
+        MockDateTime.mock_value = file_time + cache.duration + offset
+        monkeypatch.setattr(datetime, "datetime", MockDateTime)
+        expiring = cache.expiring("unga1")
+        value = cache.get("unga1")
+        monkeypatch.undo()
+        assert expiring == expect_expiring
+        assert value == (None if expect_remove else value_p1)
+        assert os.path.isfile(filepath) == (not expect_remove)
+
+    def test_refresh_policy_not_set(self, tmpdir, monkeypatch):
+        cache = suds.cache.FileCache(tmpdir.strpath, days=1)
+        cache.put("unga1", value_p1)
+        MockDateTime.mock_value = datetime.datetime.max
+        monkeypatch.setattr(datetime, "datetime", MockDateTime)
+        assert not cache.expiring("unga1")
+
     def test_reused_cache_folder(self, tmpdir):
         cache_folder = tmpdir.strpath
         cache1 = suds.cache.FileCache(cache_folder)
@@ -28,9 +28,13 @@ if __name__ == "__main__":
 
 import suds
 import suds.cache
+import suds.compile
+import suds.properties
+import suds.sax.parser
 import suds.store
 import suds.transport
 import suds.transport.https
+import suds.wsse
 
 import pytest
 
@@ -104,66 +108,6 @@ class MockDocumentStore(suds.store.DocumentStore):
         self.mock_log = []
 
 
-class MockTransport(suds.transport.Transport):
-    """
-    Mock Transport used by the tests implemented in this module.
-
-    Allows the tests to check which transport operations got triggered and to
-    control what each of them returns.
-
-    open/send output data may be given either as a single value or a list of
-    values to be used in order. Specifying a single value is a shortcut with
-    the same semantics as specifying a single element list containing that
-    value. Each of the value items may be either a simple byte string to be
-    returned or an Exception subclass or instance indicating an exception to be
-    raised from a particular operation call.
-
-    """
-
-    def __init__(self, open_data=None, send_data=None):
-        if open_data is None:
-            open_data = []
-        elif open_data.__class__ is not list:
-            open_data = [open_data]
-        if send_data is None:
-            send_data = []
-        elif send_data.__class__ is not list:
-            send_data = [send_data]
-        self.mock_log = []
-        self.mock_requests = []
-        self.mock_open_data = open_data
-        self.mock_send_data = send_data
-        super(MockTransport, self).__init__()
-
-    def open(self, request):
-        self.mock_log.append(("open", [request.url]))
-        self.mock_requests.append(request)
-        if not self.mock_open_data:
-            pytest.fail("Unexpected MockTransport.open() operation call.")
-        result = self.__next_operation_result(self.mock_open_data)
-        return suds.BytesIO(result)
-
-    def send(self, request):
-        self.mock_log.append(("send", [request.url, request.message]))
-        self.mock_requests.append(request)
-        if not self.mock_send_data:
-            pytest.fail("Unexpected MockTransport.send() operation call.")
-        status = http.client.OK
-        headers = {}
-        data = self.__next_operation_result(self.mock_send_data)
-        return suds.transport.Reply(status, headers, data)
-
-    @staticmethod
-    def __next_operation_result(data_list):
-        value = data_list.pop(0)
-        if isinstance(value, Exception):
-            raise value
-        if value.__class__ is type and issubclass(value, Exception):
-            raise value()
-        assert value.__class__ is bytes, "bad test data"
-        return value
-
-
 # Test data used in different tests in this module testing suds WSDL schema
 # import implementation.
 wsdl_imported_wsdl_namespace = "goodbye"
@@ -251,7 +195,8 @@ class TestCacheStoreTransportUsage:
             store1 = MockDocumentStore(wsdl=wsdl_import_wrapper,
                 wsdl_imported=wsdl_imported)
             c1 = suds.client.Client("suds://wsdl", cachingpolicy=1,
-                cache=cache, documentStore=store1, transport=MockTransport())
+                cache=cache, documentStore=store1,
+                transport=testutils.MockTransport())
             assert store1.mock_log == ["suds://wsdl", "suds://wsdl_imported"]
             assert len(cache.mock_data) == 1
             wsdl_object_id, wsdl_object = next(iter(cache.mock_data.items()))
@@ -261,7 +206,8 @@ class TestCacheStoreTransportUsage:
             cache.mock_log = []
             store2 = MockDocumentStore(wsdl=wsdl_import_wrapper)
             c2 = suds.client.Client("suds://wsdl", cachingpolicy=1,
-                cache=cache, documentStore=store2, transport=MockTransport())
+                cache=cache, documentStore=store2,
+                transport=testutils.MockTransport())
             assert cache.mock_log == [("get", [wsdl_object_id])]
             assert store2.mock_log == []
 
@@ -285,7 +231,8 @@ class TestCacheStoreTransportUsage:
             store1 = MockDocumentStore(wsdl=wsdl, imported_xsd=external_xsd1,
                 included_xsd=external_xsd2)
             c1 = suds.client.Client("suds://wsdl", cachingpolicy=1,
-                cache=cache, documentStore=store1, transport=MockTransport())
+                cache=cache, documentStore=store1,
+                transport=testutils.MockTransport())
             assert store1.mock_log == ["suds://wsdl", "suds://imported_xsd",
                 "suds://included_xsd"]
             assert len(cache.mock_data) == 1
@@ -296,7 +243,8 @@ class TestCacheStoreTransportUsage:
             cache.mock_log = []
             store2 = MockDocumentStore(wsdl=wsdl)
             c2 = suds.client.Client("suds://wsdl", cachingpolicy=1,
-                cache=cache, documentStore=store2, transport=MockTransport())
+                cache=cache, documentStore=store2,
+                transport=testutils.MockTransport())
             assert cache.mock_log == [("get", [wsdl_object_id])]
             assert store2.mock_log == []
 
@@ -333,7 +281,7 @@ class TestCacheStoreTransportUsage:
         store1 = MockDocumentStore(wsdl=wsdl_import_wrapper,
             wsdl_imported=wsdl_imported)
         c1 = suds.client.Client("suds://wsdl", cachingpolicy=0, cache=cache,
-            documentStore=store1, transport=MockTransport())
+            documentStore=store1, transport=testutils.MockTransport())
         assert [x for x, y in cache.mock_log] == ["get", "put"] * 2
         id_wsdl = cache.mock_log[0][1][0]
         assert cache.mock_log[1][1][0] == id_wsdl
@@ -361,7 +309,7 @@ class TestCacheStoreTransportUsage:
             assert len(cache.mock_data) == 1
             store2 = MockDocumentStore(wsdl=wsdl_import_wrapper)
         c2 = suds.client.Client("suds://wsdl", cachingpolicy=0, cache=cache,
-            documentStore=store2, transport=MockTransport())
+            documentStore=store2, transport=testutils.MockTransport())
         expected_cache_operations = [("get", id_wsdl)]
         if not importing_WSDL_cached:
             expected_cache_operations.append(("put", id_wsdl))
@@ -394,7 +342,8 @@ class TestCacheStoreTransportUsage:
         cache = MockCache()
         store1 = MockDocumentStore(umpala=testutils.wsdl(""))
         c1 = suds.client.Client("suds://umpala", cachingpolicy=caching_policy,
-            cache=cache, documentStore=store1, transport=MockTransport())
+            cache=cache, documentStore=store1,
+            transport=testutils.MockTransport())
         assert [x for x, y in cache.mock_log] == ["get", "put"]
         id = cache.mock_log[0][1][0]
         assert id == cache.mock_log[1][1][0]
@@ -417,7 +366,8 @@ class TestCacheStoreTransportUsage:
         cache.mock_put_config = MockCache.FAIL
         store2 = MockDocumentStore(mock_fail=True)
         c2 = suds.client.Client("suds://umpala", cachingpolicy=caching_policy,
-            cache=cache, documentStore=store2, transport=MockTransport())
+            cache=cache, documentStore=store2,
+            transport=testutils.MockTransport())
         assert cache.mock_log == [("get", [id])]
         assert c2.wsdl.root is wsdl_cached_root
 
@@ -462,7 +412,7 @@ class TestCacheStoreTransportUsage:
         cache = MockCache()
         store1 = MockDocumentStore(wsdl=wsdl, external=external_schema)
         c1 = suds.client.Client("suds://wsdl", cachingpolicy=0, cache=cache,
-            documentStore=store1, transport=MockTransport())
+            documentStore=store1, transport=testutils.MockTransport())
         assert [x for x, y in cache.mock_log] == ["get", "put"] * 2
         id_wsdl = cache.mock_log[0][1][0]
         assert id_wsdl == cache.mock_log[1][1][0]
@@ -493,7 +443,7 @@ class TestCacheStoreTransportUsage:
             assert len(cache.mock_data) == 1
             store2 = MockDocumentStore(wsdl=wsdl)
         c2 = suds.client.Client("suds://wsdl", cachingpolicy=0, cache=cache,
-            documentStore=store2, transport=MockTransport())
+            documentStore=store2, transport=testutils.MockTransport())
         expected_cache_operations = [("get", id_wsdl)]
         if not main_WSDL_cached:
             expected_cache_operations.append(("put", id_wsdl))
@@ -560,6 +510,48 @@ class TestCacheUsage:
             del e  # explicitly break circular reference chain in Python 3
 
 
+class TestCompiledWSDLUsage:
+    """suds.client.Client precompiled WSDL usage tests."""
+
+    def test_compiled_WSDL_avoids_store_avoids_transport(self, tmpdir,
+            monkeypatch):
+        url_imported = "suds://wsdl_imported"
+        wsdl_import_wrapper = wsdl_import_wrapper_format(url_imported)
+        wsdl_imported = wsdl_imported_format(
+            '<xsd:element name="Pistachio" type="xsd:string"/>')
+        store = MockDocumentStore(wsdl=wsdl_import_wrapper,
+            wsdl_imported=wsdl_imported)
+        artifact = tmpdir.join("compiled").strpath
+        wsdl = suds.compile.compile_wsdl("suds://wsdl", artifact,
+            documentStore=store, transport=testutils.MockTransport())
+        assert store.mock_log == ["suds://wsdl", "suds://wsdl_imported"]
+        assert wsdl.options is not None
+
+        def parse(*args, **kwargs):
+            pytest.fail("Unexpected XML parsing.")
+        monkeypatch.setattr(suds.sax.parser.Parser, "parse", parse)
+        store = MockDocumentStore(mock_fail=True)
+        client = suds.client.Client.from_compiled(artifact, cache=None,
+            documentStore=store, transport=testutils.MockTransport())
+        assert store.mock_log == []
+        assert client.wsdl.__class__ is suds.wsdl.Definitions
+        assert client.wsdl.url == "suds://wsdl"
+        assert client.wsdl.options is client.options
+        imported = client.wsdl.imports[0].imported
+        assert imported.options is client.options
+        assert client.factory.create("{ice-scream}Pistachio") is not None
+        assert "Methods (1)" in str(client)
+
+    def test_version_mismatch(self, tmpdir, monkeypatch):
+        store = MockDocumentStore(wsdl=testutils.wsdl(
+            '<xsd:element name="Wu" type="xsd:string"/>', output="Wu"))
+        artifact = tmpdir.join("compiled").strpath
+        suds.compile.compile_wsdl("suds://wsdl", artifact, documentStore=store)
+        monkeypatch.setattr(suds, "__version__", "0.0.0-other")
+        pytest.raises(suds.compile.CompiledError,
+            suds.client.Client.from_compiled, artifact, cache=None)
+
+
 class TestStoreUsage:
     """suds.client.Client document store component usage tests."""
 
@@ -588,7 +580,7 @@ class TestTransportUsage:
         suds.transport.TransportError("huku", 666)))
     def test_error_on_open(self, monkeypatch, exception):
         monkeypatch.delitem(locals(), "e_info", False)
-        transport = MockTransport(open_data=exception)
+        transport = testutils.MockTransport(open_data=exception)
         e_info = pytest.raises(exception.__class__, suds.client.Client, "url",
             cache=None, transport=transport)
         try:
@@ -598,7 +590,7 @@ class TestTransportUsage:
 
     def test_error_on_send__non_transport(self):
         e = MyException()
-        t = MockTransport(send_data=e)
+        t = testutils.MockTransport(send_data=e)
         store = MockDocumentStore(wsdl=testutils.wsdl("", operation_name="g"))
         client = suds.client.Client("suds://wsdl", documentStore=store,
             cache=None, transport=t)
@@ -617,7 +609,8 @@ class TestTransportUsage:
     # handled differently from other exception types.
     def test_error_on_send__transport(self, monkeypatch):
         monkeypatch.delitem(locals(), "e", False)
-        t = MockTransport(send_data=suds.transport.TransportError("huku", 666))
+        t = testutils.MockTransport(
+            send_data=suds.transport.TransportError("huku", 666))
         store = MockDocumentStore(wsdl=testutils.wsdl("", operation_name="g"))
         client = suds.client.Client("suds://wsdl", documentStore=store,
             cache=None, transport=t)
@@ -630,7 +623,7 @@ class TestTransportUsage:
 
     def test_nosend_should_avoid_transport_sends(self):
         wsdl = testutils.wsdl("")
-        t = MockTransport()
+        t = testutils.MockTransport()
         client = testutils.client_from_wsdl(wsdl, nosend=True, transport=t)
         client.service.f()
 
@@ -644,7 +637,7 @@ class TestTransportUsage:
         test_input_data = "Riff-raff"
         test_output_data = "La-di-da-da-da"
         store = MockDocumentStore(wsdl=wsdl)
-        transport = MockTransport(send_data=f"""\
+        transport = testutils.MockTransport(send_data=f"""\
 <?xml version="1.0"?>
 <env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
   <env:Body>
@@ -652,7 +645,7 @@ class TestTransportUsage:
   </env:Body>
 </env:Envelope>""".encode())
         client = suds.client.Client("suds://wsdl", documentStore=store,
-            cache=None, transport=transport)
+            cache=None, transport=transport, retention="last")
         assert transport.mock_log == []
         reply = client.service.pi(test_input_data)
         assert len(transport.mock_log) == 1
@@ -679,14 +672,14 @@ class TestTransportUsage:
     @pytest.mark.parametrize("url", test_URL_data)
     def test_WSDL_transport(self, url):
         store = MockDocumentStore()
-        t = MockTransport(open_data=testutils.wsdl(""))
+        t = testutils.MockTransport(open_data=testutils.wsdl(""))
         suds.client.Client(url, cache=None, documentStore=store, transport=t)
         assert t.mock_log == [("open", [url])]
 
     def test_WSDL_transport_headers(self):
         url = test_URL_data[0]
         store = MockDocumentStore()
-        t = MockTransport(open_data=testutils.wsdl(""))
+        t = testutils.MockTransport(open_data=testutils.wsdl(""))
         headers = {'foo': 'bar'}
         t.options.headers = headers # since we create a custom client, options must be set explicitly
         suds.client.Client(url, cache=None, documentStore=store, transport=t)
@@ -698,7 +691,7 @@ class TestTransportUsage:
         wsdl_import_wrapper = wsdl_import_wrapper_format(url)
         wsdl_imported = wsdl_imported_format("")
         store = MockDocumentStore(wsdl=wsdl_import_wrapper)
-        t = MockTransport(open_data=wsdl_imported)
+        t = testutils.MockTransport(open_data=wsdl_imported)
         suds.client.Client("suds://wsdl", cache=None, documentStore=store,
             transport=t)
         assert t.mock_log == [("open", [url])]
@@ -709,7 +702,7 @@ class TestTransportUsage:
         xsd_content = '<xsd:%(tag)s schemaLocation="%(url)s"/>' % dict(
             tag=external_reference_tag, url=url)
         store = MockDocumentStore(wsdl=testutils.wsdl(xsd_content))
-        t = MockTransport(open_data=b"""\
+        t = testutils.MockTransport(open_data=b"""\
 <?xml version='1.0' encoding='UTF-8'?>
 <schema xmlns="http://www.w3.org/2001/XMLSchema"/>
 """)
@@ -773,6 +766,365 @@ class TestWSDLImportWithDifferentTargetNamespaces:
         suds.client.Client("suds://wsdl", cache=None, documentStore=store)
 
 
+def test_import_does_not_load_WSDL_processing_modules(tmpdir):
+    """
+    Importing suds.client should not load any of the modules only needed
+    once a client gets constructed or a web service operation invoked.
+
+    """
+    test_file = tmpdir.join("test_lazy_import.py")
+    test_file.write("""\
+import sys
+import suds.client
+unexpected = [m for m in ("suds.wsdl", "suds.xsd.sxbasic", "suds.xsd.schema",
+    "suds.bindings.binding", "suds.mx", "suds.umx", "suds.reader",
+    "suds.transport.https", "suds.sax.parser", "hashlib", "http.client",
+    "http.cookiejar", "urllib.request", "cProfile", "pstats", "suds.cache",
+    "suds.store", "suds.wsse", "suds.xsd", "pickle") if m in sys.modules]
+if unexpected:
+    print("Unexpected modules imported: %s" % (", ".join(unexpected),))
+    sys.exit(-2)
+""")
+    testutils.run_test_process(test_file)
+
+
+def test_debug_logging_removed_from_hot_code_paths(tmpdir):
+    """
+    Setting the SUDS_DEBUG_LOGGING environment variable to 0 should remove
+    debug logging from hot code paths without affecting processing.
+
+    """
+    test_file = tmpdir.join("test_debug_logging.py")
+    test_file.write("""\
+import logging
+import sys
+import suds
+import suds.client
+import suds.store
+
+if suds.DEBUG_LOGGING:
+    print("Hot path debug logging not removed.")
+    sys.exit(-2)
+
+wsdl = suds.byte_str(%r)
+records = []
+class Handler(logging.Handler):
+    def emit(self, record):
+        records.append(record)
+logging.getLogger("suds.resolver").addHandler(Handler())
+logging.getLogger("suds.resolver").setLevel(logging.DEBUG)
+logging.getLogger("suds.mx.literal").addHandler(Handler())
+logging.getLogger("suds.mx.literal").setLevel(logging.DEBUG)
+
+store = suds.store.DocumentStore(wsdl=wsdl)
+client = suds.client.Client("suds://wsdl", documentStore=store, cache=None,
+    nosend=True)
+request = client.service.f(x=5)
+if b":x>5</" not in request.envelope:
+    print("Unexpected request: %%s" %% (request.envelope,))
+    sys.exit(-2)
+if request.process_reply(suds.byte_str(%r)) != 7:
+    print("Unexpected reply.")
+    sys.exit(-2)
+if records:
+    print("Unexpected debug log records: %%s" %% (records,))
+    sys.exit(-2)
+""" % (testutils.wsdl('<xsd:element name="x" type="xsd:int"/>', input="x",
+        output="x").decode("utf-8"), """\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body><x xmlns="my-xsd-namespace">7</x></Body>
+</Envelope>"""))
+    testutils.run_test_process(test_file, env={"SUDS_DEBUG_LOGGING": "0"})
+
+
+def test_service_definitions_constructed_on_first_use(monkeypatch):
+    import suds.servicedefinition
+    constructed = []
+    class MockServiceDefinition(suds.servicedefinition.ServiceDefinition):
+        def __init__(self, *args, **kwargs):
+            constructed.append(self)
+            super(MockServiceDefinition, self).__init__(*args, **kwargs)
+    monkeypatch.setattr(suds.servicedefinition, "ServiceDefinition",
+        MockServiceDefinition)
+    wsdl = testutils.wsdl('<xsd:element name="Wu" type="xsd:string"/>',
+        input="Wu", operation_name="f")
+    client = testutils.client_from_wsdl(wsdl, nosend=True)
+    assert not constructed
+    client.service.f("x")
+    client.factory.create("{my-xsd-namespace}Wu")
+    assert not constructed
+    text = str(client)
+    assert "Methods (1)" in text
+    assert len(constructed) == 1
+    assert str(client) == text
+    assert len(constructed) == 1
+
+
+def test_lazy_construction_not_locking_other_clients():
+    wsdl = testutils.wsdl('<xsd:element name="Wu" type="xsd:string"/>',
+        input="Wu", operation_name="f")
+    client = testutils.client_from_wsdl(wsdl)
+    other = testutils.client_from_wsdl(wsdl)
+    clone = client.clone()
+    locks = [x._Client__lock for x in (client, other, clone)]
+    assert len(set(map(id, locks))) == 3
+    # Constructing the service of one client while another one's lock is
+    # held does not block.
+    with locks[0]:
+        assert other.service is not None
+        assert clone.factory is not None
+
+
+def test_shared_client_concurrent_invocation():
+    import re
+    import threading
+    wsdl = testutils.wsdl("""\
+      <xsd:element name="Data" type="xsd:string"/>
+      <xsd:element name="Result">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="value" type="xsd:string"/>
+            <xsd:element name="n" type="xsd:int" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", input="Data", output="Result", operation_name="f")
+
+    class EchoTransport(suds.transport.Transport):
+        def send(self, request):
+            value = re.search(b">(t[0-9]+-[0-9]+)<", request.message).group(1)
+            n = value.split(b"-")[1]
+            return suds.transport.Reply(http.client.OK, {}, b"""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <Result xmlns="my-xsd-namespace">
+      <value>%s</value><n>%s</n><n>%s</n>
+    </Result>
+  </env:Body>
+</env:Envelope>""" % (value, n, n))
+
+    store = MockDocumentStore(wsdl=wsdl)
+    client = suds.client.Client("suds://wsdl", documentStore=store,
+        cache=None, transport=EchoTransport())
+    thread_count = 64
+    barrier = threading.Barrier(thread_count)
+    errors = []
+
+    def run(t):
+        try:
+            barrier.wait()
+            for i in range(25):
+                value = "t%d-%d" % (t, i)
+                reply = client.service.f(value)
+                assert reply.value == value
+                assert reply.n == [i, i]
+                assert value.encode() in client.last_sent().plain().encode()
+                assert client.last_received().childAtPath(
+                    "Envelope/Body/Result/value").getText() == value
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in
+        range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert client.last_sent() is None
+
+
+def _retention_client(**kwargs):
+    wsdl = testutils.wsdl("""\
+      <xsd:element name="Data" type="xsd:string"/>
+      <xsd:element name="Result" type="xsd:string"/>""", input="Data",
+        output="Result", operation_name="f")
+    replies = [b"""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <Result xmlns="my-xsd-namespace">r%d</Result>
+  </env:Body>
+</env:Envelope>""" % (i,) for i in range(3)]
+    transport = testutils.MockTransport(send_data=list(replies))
+    client = testutils.client_from_wsdl(wsdl, transport=transport, **kwargs)
+    return client, replies
+
+
+def test_message_retention_bytes():
+    client, replies = _retention_client()
+    assert client.options.retention == "bytes"
+    assert client.service.f("x") == "r0"
+    assert client.messages["rx"] == replies[0]
+    assert client.messages["tx"].__class__ is bytes
+    assert b">x<" in client.messages["tx"]
+    sent = client.last_sent()
+    assert sent.__class__ is suds.sax.document.Document
+    assert sent.childAtPath("Envelope/Body/Data").getText() == "x"
+    received = client.last_received()
+    assert received.childAtPath("Envelope/Body/Result").getText() == "r0"
+    # Parsed again on each call, not retained.
+    assert client.last_received() is not received
+    assert client.exchanges() == []
+
+
+def test_message_retention_last():
+    client, replies = _retention_client(retention="last")
+    client.service.f("x")
+    sent = client.last_sent()
+    assert sent.__class__ is suds.sax.document.Document
+    assert client.messages["tx"] is sent
+    assert client.last_received() is client.messages["rx"]
+    assert client.last_received().childAtPath("Envelope/Body/Result"
+        ).getText() == "r0"
+
+
+def test_message_retention_off():
+    client, replies = _retention_client()
+    client.service.f("x")
+    client.set_options(retention="off")
+    client.service.f("y")
+    assert client.last_sent() is None
+    assert client.last_received() is None
+    assert client.messages == dict(tx=None, rx=None)
+
+
+def test_message_retention_ring_buffer():
+    client, replies = _retention_client(retention=2)
+    for value in ("x", "y", "z"):
+        client.service.f(value)
+    exchanges = client.exchanges()
+    assert len(exchanges) == 2
+    assert [received for sent, received in exchanges] == replies[1:]
+    assert b">y<" in exchanges[0][0] and b">z<" in exchanges[1][0]
+    assert client.messages["tx"] == exchanges[1][0]
+    assert client.last_received().childAtPath("Envelope/Body/Result"
+        ).getText() == "r2"
+    assert client.clone().exchanges() == []
+
+
+@pytest.mark.parametrize("retention", ("all", 0, -1, True, False))
+def test_message_retention_invalid(retention):
+    client, replies = _retention_client()
+    e = pytest.raises(ValueError, client.set_options, retention=retention
+        ).value
+    try:
+        assert "unknown retention policy" in str(e)
+    finally:
+        del e  # explicitly break circular reference chain in Python 3
+    assert client.options.retention == "bytes"
+    e = pytest.raises(ValueError, _retention_client, retention=retention
+        ).value
+    del e
+
+
+def test_marshallers_shared_between_invocations():
+    import pickle
+    wsdl = testutils.wsdl("""\
+      <xsd:element name="Data" type="xsd:string"/>
+      <xsd:element name="Result">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="value" type="xsd:string"/>
+            <xsd:element name="n" type="xsd:int" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", input="Data", output="Result", operation_name="f")
+    reply = """\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <Result xmlns="my-xsd-namespace"><value>%s</value><n>%d</n></Result>
+  </env:Body>
+</env:Envelope>"""
+    store = MockDocumentStore(wsdl=wsdl)
+    client = suds.client.Client("suds://wsdl", documentStore=store,
+        cache=None, nosend=True, reply_model="lazy")
+    binding = client.wsdl.services[0].ports[0].methods["f"].binding.output
+    r1 = client.service.f("x").process_reply(suds.byte_str(reply % ("a", 1)))
+    marshaller = binding.marshaller()
+    unmarshaller = binding.unmarshaller()
+    r2 = client.service.f("y").process_reply(suds.byte_str(reply % ("b", 2)))
+    assert binding.marshaller() is marshaller
+    assert binding.unmarshaller() is unmarshaller
+    assert r2.value == "b"
+    assert r1.n == [1]
+    assert r1.value == "a"
+    assert r2.n == [2]
+
+    client.set_options(reply_model="object")
+    r3 = client.service.f("z").process_reply(suds.byte_str(reply % ("c", 3)))
+    assert (r3.value, r3.n) == ("c", [3])
+    assert len(binding.engines) == 3
+
+    copy = pickle.loads(pickle.dumps(client.wsdl))
+    binding = copy.services[0].ports[0].methods["f"].binding.output
+    assert not binding.engines
+
+
+def test_clone_options_copy_on_write():
+    wsdl = testutils.wsdl('<xsd:element name="Wu" type="xsd:string"/>',
+        input="Wu", operation_name="f")
+    client = testutils.client_from_wsdl(wsdl, nosend=True)
+    transport = client.options.transport
+    clone = client.clone()
+    assert clone.wsdl is client.wsdl
+    assert clone.options.nosend
+    assert clone.options.transport is transport
+    assert not suds.properties.Unskin(clone.options).defined.maps[0]
+
+    clone.options.location = "http://clone/"
+    clone.options.prettyxml = True
+    assert client.options.location is None
+    assert not client.options.prettyxml
+    assert clone.service.f("x").envelope.startswith(b"<?xml")
+
+    # Options not set on the clone follow the original client's options.
+    client.options.retxml = True
+    assert clone.options.retxml
+
+    # Setting a transport option on the clone gives it a private transport.
+    clone.options.timeout = 5
+    assert clone.options.transport is not transport
+    assert clone.options.timeout == 5
+    assert client.options.timeout == 90
+    assert client.options.transport is transport
+    assert set(suds.properties.Unskin(clone.options).defined.maps[0]) == set(
+        ["location", "prettyxml", "transport"])
+
+    client.options.timeout = 7
+    assert clone.options.timeout == 5
+    assert clone.clone().options.timeout == 5
+    assert clone.clone().options.location == "http://clone/"
+
+
+def test_invocation_options_snapshot():
+    wsdl = testutils.wsdl('<xsd:element name="Wu" type="xsd:string"/>',
+        input="Wu", operation_name="f")
+    client = testutils.client_from_wsdl(wsdl, nosend=True)
+    properties = suds.properties.Unskin(client.options)
+    snapshot = properties.snapshot()
+    assert properties.snapshot() is snapshot
+    assert snapshot.nosend is True
+    assert snapshot.timeout == client.options.timeout
+    assert snapshot.transport is client.options.transport
+    pytest.raises(AttributeError, setattr, snapshot, "nosend", False)
+    client.options.timeout = 5
+    changed = properties.snapshot()
+    assert changed is not snapshot
+    assert changed.timeout == 5
+    assert snapshot.timeout == 90
+
+    # Options set on a clone get used by the bindings processing its calls.
+    clone = client.clone()
+    security = suds.wsse.Security()
+    security.tokens.append(suds.wsse.UsernameToken("Bob", "x"))
+    clone.options.wsse = security
+    assert b"Bob" in clone.service.f("x").envelope
+    assert b"Bob" not in client.service.f("x").envelope
+
+
 #TODO: extract WSDL processing tests to a separate test module
 def test_resolving_references_to_later_entities_in_XML():
     """
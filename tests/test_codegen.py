@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds Python library static code generation (suds.codegen) unit tests.
+
+Generated code is expected to construct the exact same SOAP requests as the
+generic marshalling engine and to unmarshal replies into the same values.
+
+"""
+
+import testutils
+from testutils import _assert_request_content
+if __name__ == "__main__":
+    testutils.run_using_pytest(globals())
+
+import suds
+import suds.codegen
+from suds.sax.date import Date
+
+import pytest
+
+
+wsdl = testutils.wsdl("""\
+      <xsd:simpleType name="Color">
+        <xsd:restriction base="xsd:string">
+          <xsd:enumeration value="RED"/>
+          <xsd:enumeration value="dark-blue"/>
+        </xsd:restriction>
+      </xsd:simpleType>
+      <xsd:complexType name="Person">
+        <xsd:sequence>
+          <xsd:element name="name" type="xsd:string"/>
+          <xsd:element name="age" type="xsd:int" minOccurs="0"/>
+          <xsd:element name="born" type="xsd:date" nillable="true"/>
+          <xsd:element name="color" type="my_xsd:Color"/>
+          <xsd:element name="nick" type="xsd:string" minOccurs="0"
+            maxOccurs="unbounded"/>
+          <xsd:element name="address" minOccurs="0">
+            <xsd:complexType>
+              <xsd:sequence>
+                <xsd:element name="street" type="xsd:string"/>
+              </xsd:sequence>
+            </xsd:complexType>
+          </xsd:element>
+        </xsd:sequence>
+        <xsd:attribute name="id" type="xsd:long"/>
+      </xsd:complexType>
+      <xsd:complexType name="Manager">
+        <xsd:complexContent>
+          <xsd:extension base="my_xsd:Person">
+            <xsd:sequence>
+              <xsd:element name="reports" type="my_xsd:Person"
+                maxOccurs="unbounded"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:element name="GetPerson">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="id" type="xsd:int"/>
+            <xsd:element name="p" type="my_xsd:Person" minOccurs="0"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="GetPersonResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result" type="my_xsd:Person"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", input="GetPerson", output="GetPersonResponse",
+    operation_name="getPerson")
+
+reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xmlns:x="my-xsd-namespace">
+  <env:Body>
+    <x:GetPersonResponse>
+      <x:result id="7">
+        <x:name>Bob</x:name>
+        <x:age>33</x:age>
+        <x:born xsi:nil="true"/>
+        <x:color>RED</x:color>
+        <x:nick>a</x:nick>
+        <x:nick>b</x:nick>
+        <x:address><x:street>Main</x:street></x:address>
+      </x:result>
+    </x:GetPersonResponse>
+  </env:Body>
+</env:Envelope>""")
+
+
+def _generated(client):
+    code = suds.codegen.generate(client.wsdl)
+    module = {}
+    exec(compile(code, "<generated>", "exec"), module)
+    return module
+
+
+class TestGeneratedCode:
+
+    def test_classes(self):
+        module = _generated(testutils.client_from_wsdl(wsdl))
+        Person, Manager = module["Person"], module["Manager"]
+        assert issubclass(Person, suds.codegen.Struct)
+        assert issubclass(Manager, Person)
+        assert Person.__sxtype__ == ("Person", "my-xsd-namespace")
+        assert Person.__fields__ == ("name", "age", "born", "color", "nick",
+            "address", "_id")
+        assert Manager.__slots__ == ("reports",)
+        assert Manager.__fields__ == Person.__fields__ + ("reports",)
+        p = Person(name="Bob")
+        assert p.nick == []
+        assert p.age is None
+        pytest.raises(AttributeError, setattr, p, "unknown", 1)
+        assert module["Color"].RED == "RED"
+        assert module["Color"].dark_blue == "dark-blue"
+        assert module["GetPerson"].__sxtype__ is None
+        assert module["Address"].__fields__ == ("street",)
+
+    def test_operations(self):
+        module = _generated(testutils.client_from_wsdl(wsdl))
+        codec = module["OPERATIONS"]["getPerson"]
+        assert isinstance(codec, suds.codegen.Codec)
+        assert codec.unmarshal is not None
+
+    def test_no_unmarshaller_for_simple_reply(self):
+        client = testutils.client_from_wsdl(testutils.wsdl("""\
+          <xsd:element name="Wrapper">
+            <xsd:complexType>
+              <xsd:sequence>
+                <xsd:element name="value" type="xsd:int"/>
+              </xsd:sequence>
+            </xsd:complexType>
+          </xsd:element>""", output="Wrapper"))
+        module = _generated(client)
+        assert module["OPERATIONS"]["f"].unmarshal is None
+
+
+class TestCodecUsage:
+
+    def test_request(self):
+        module = _generated(testutils.client_from_wsdl(wsdl))
+        generic = testutils.client_from_wsdl(wsdl, nosend=True)
+        person = generic.factory.create("{my-xsd-namespace}Person")
+        person.name = "Bob"
+        person.age = 3
+        person.color = "RED"
+        person.nick = ["a", "b"]
+        person._id = 7
+        expected = generic.service.getPerson(1, person).envelope
+
+        client = testutils.client_from_wsdl(wsdl, nosend=True,
+            codecs=module["OPERATIONS"])
+        person = module["Person"](name="Bob", age=3,
+            color=module["Color"].RED, nick=["a", "b"], _id=7)
+        request = client.service.getPerson(1, person)
+        _assert_request_content(request, expected.decode("utf-8"))
+        request = client.service.getPerson(id=1, p=person)
+        _assert_request_content(request, expected.decode("utf-8"))
+
+    def test_reply(self):
+        module = _generated(testutils.client_from_wsdl(wsdl))
+        generic = testutils.client_from_wsdl(wsdl, nosend=True)
+        expected = generic.service.getPerson(1).process_reply(reply)
+
+        client = testutils.client_from_wsdl(wsdl, nosend=True,
+            codecs=module["OPERATIONS"])
+        result = client.service.getPerson(1).process_reply(reply)
+        assert result.__class__ is module["Person"]
+        assert result._id == expected._id == 7
+        assert result.name == expected.name == "Bob"
+        assert result.age == expected.age == 33
+        assert result.born is expected.born is None
+        assert result.color == expected.color == "RED"
+        assert result.nick == expected.nick == ["a", "b"]
+        assert result.address.street == expected.address.street == "Main"
+
+    def test_reply_derived_type(self):
+        module = _generated(testutils.client_from_wsdl(wsdl))
+        client = testutils.client_from_wsdl(wsdl, nosend=True,
+            codecs=module["OPERATIONS"])
+        result = client.service.getPerson(1).process_reply(suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xmlns:x="my-xsd-namespace">
+  <env:Body>
+    <x:GetPersonResponse>
+      <x:result xsi:type="x:Manager">
+        <x:name>Boss</x:name>
+        <x:born>2000-01-02</x:born>
+        <x:reports><x:name>Bob</x:name></x:reports>
+        <x:reports><x:name>Ann</x:name></x:reports>
+      </x:result>
+    </x:GetPersonResponse>
+  </env:Body>
+</env:Envelope>"""))
+        assert result.__class__ is module["Manager"]
+        assert result.born == Date("2000-01-02").value
+        assert [r.name for r in result.reports] == ["Bob", "Ann"]
+        assert result.reports[0].__class__ is module["Person"]
+
+    def test_unknown_reply_element(self):
+        module = _generated(testutils.client_from_wsdl(wsdl))
+        client = testutils.client_from_wsdl(wsdl, nosend=True,
+            codecs=module["OPERATIONS"])
+        request = client.service.getPerson(1)
+        pytest.raises(suds.TypeNotFound, request.process_reply,
+            suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:x="my-xsd-namespace">
+  <env:Body>
+    <x:GetPersonResponse>
+      <x:result><x:name>Bob</x:name><x:bad>1</x:bad></x:result>
+    </x:GetPersonResponse>
+  </env:Body>
+</env:Envelope>"""))
+
+    def test_renamed_fields(self):
+        renamed = testutils.wsdl("""\
+      <xsd:complexType name="Item">
+        <xsd:sequence>
+          <xsd:element name="class" type="xsd:string"/>
+          <xsd:element name="my-field" type="xsd:int"/>
+        </xsd:sequence>
+        <xsd:attribute name="item-id" type="xsd:long"/>
+      </xsd:complexType>
+      <xsd:element name="Echo">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="item" type="my_xsd:Item"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", input="Echo", output="Echo", operation_name="echo")
+        module = _generated(testutils.client_from_wsdl(renamed))
+        Item = module["Item"]
+        assert Item.__fields__ == ("cls", "my_field", "_item_id")
+        assert Item.__names__ == {"cls": "class", "my_field": "my-field",
+            "_item_id": "_item-id"}
+
+        generic = testutils.client_from_wsdl(renamed, nosend=True)
+        item = generic.factory.create("{my-xsd-namespace}Item")
+        setattr(item, "class", "c")
+        setattr(item, "my-field", 3)
+        setattr(item, "_item-id", 7)
+        expected = generic.service.echo(item).envelope
+
+        client = testutils.client_from_wsdl(renamed, nosend=True,
+            codecs=module["OPERATIONS"])
+        request = client.service.echo(Item(cls="c", my_field=3, _item_id=7))
+        _assert_request_content(request, expected.decode("utf-8"))
+
+        # The request envelope doubles as an echoed reply.
+        result = request.process_reply(expected)
+        assert result.__class__ is Item
+        assert (result.cls, result.my_field, result._item_id) == ("c", 3, 7)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds Python library memory usage accounting & WSDL loading profiling unit
+tests.
+
+Implemented using the 'pytest' testing framework.
+
+"""
+
+import testutils
+if __name__ == "__main__":
+    testutils.run_using_pytest(globals())
+
+import suds
+import suds.diagnostics
+from suds.diagnostics import CATEGORIES, LoadProfiler, memory
+
+import sys
+
+
+wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Person">
+        <xsd:sequence>
+          <xsd:element name="name" type="xsd:string"/>
+          <xsd:element name="age" type="xsd:int"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="People">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="person" type="my_xsd:Person"
+                maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", input="People", output="People",
+    operation_name="f")
+
+
+def reply(count):
+    return suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <People xmlns="my-xsd-namespace">%s</People>
+  </env:Body>
+</env:Envelope>""" % ("".join("<person><name>P%d</name><age>%d</age></person>" %
+        (i, i) for i in range(count)),))
+
+
+def test_client_memory_report():
+    client = testutils.client_from_wsdl(wsdl, nosend=True, retention="last")
+    report = client.memory_report()
+    assert sorted(report.categories) == sorted(CATEGORIES)
+    for name in ("wsdl", "schema", "xml"):
+        count, size = report.categories[name]
+        assert count > 0 and size > 0
+    assert report.categories["objects"] == [0, 0]
+    total = report.total()
+    assert total == (sum(c for c, s in report.categories.values()),
+        sum(s for c, s in report.categories.values()))
+    assert sum(c for c, s in report.types.values()) == total[0]
+    assert report.top(1)[0][2] == max(s for c, s in report.types.values())
+    text = str(report)
+    assert "schema" in text and "Element" in text
+
+    # Invocation processing engines get cached per binding & the last sent
+    # request kept.
+    caches = report.categories["caches"][0]
+    documents = report.types.get("Document", [0])[0]
+    client.service.f([dict(name="Bob", age=42)])
+    report = client.memory_report()
+    assert report.categories["caches"][0] > caches
+    assert report.types["Document"][0] == documents + 1
+
+    # Unless only kept as raw XML content.
+    client.set_options(retention="bytes")
+    client.service.f([dict(name="Bob", age=42)])
+    report = client.memory_report()
+    assert report.types.get("Document", [0])[0] == documents
+
+
+def test_memory_report_excluding_shared_objects():
+    client = testutils.client_from_wsdl(wsdl, nosend=True)
+    request = client.service.f([])
+    one = memory(request.process_reply(reply(1)), exclude=[client.wsdl])
+    ten = memory(request.process_reply(reply(10)), exclude=[client.wsdl])
+    for report in (one, ten):
+        assert report.categories["wsdl"] == [0, 0]
+        assert report.categories["schema"] == [0, 0]
+    assert one.types["Person"][0] == 1
+    assert ten.types["Person"][0] == 10
+    assert ten.categories["objects"][1] > 5 * one.categories["objects"][1]
+    assert ten.categories["xml"][0] == 10
+
+
+def test_memory_counting_each_object_once():
+    class X:
+        pass
+    shared = [1.5] * 10
+    x = X()
+    x.a = shared
+    x.b = shared
+    report = memory(x, [shared, x])
+    assert report.types["X"] == [1, sys.getsizeof(x) + sys.getsizeof(
+        x.__dict__)]
+    assert report.types["float"][0] == 1
+    assert report.types["list"][0] == 2
+    assert report.categories["other"][0] == report.total()[0]
+
+
+def test_load_profiler():
+    profiler = LoadProfiler(memory=True)
+    testutils.client_from_wsdl(wsdl, tracer=profiler)
+    url = "suds://whatchamacallit"
+    assert list(profiler.documents) == [url]
+    document = profiler.documents[url]
+    assert set(document.phases) == set(profiler.phases)
+    for name in ("suds.document.fetch", "suds.document.parse",
+            "suds.schema.dereference", "suds.wsdl.resolve",
+            "suds.wsdl.set_wrapped", "suds.wsdl.add_methods"):
+        assert profiler.phases[name].count == 1
+    assert document.count == sum(x.count for x in profiler.phases.values())
+    assert document.time == sum(x.time for x in profiler.phases.values())
+    assert document.memory > 0
+    assert sorted(profiler.types) == ["Complex {my-xsd-namespace}Person",
+        "Element {my-xsd-namespace}People"]
+    assert "Binding dummy" in profiler.objects
+    top = profiler.top(profiler.types, 1)
+    assert len(top) == 1
+    assert top[0][1].time == max(x.time for x in profiler.types.values())
+    report = profiler.report()
+    assert report.splitlines()[0].startswith("phase")
+    assert "Complex {my-xsd-namespace}Person" in report
+    profiler.reset()
+    assert not profiler.documents and profiler.report() == ""
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds Python library web service operation invocation metrics unit tests.
+
+Implemented using the 'pytest' testing framework.
+
+"""
+
+import testutils
+if __name__ == "__main__":
+    testutils.run_using_pytest(globals())
+
+import suds
+import suds.client
+import suds.metrics
+import suds.plugin
+from suds.metrics import (Aggregator, Histogram, Measurement, PHASES, Sink,
+    prometheus)
+
+import pytest
+
+import http.client
+import logging
+
+
+wsdl = testutils.wsdl("""\
+      <xsd:element name="Data" type="xsd:string"/>
+      <xsd:element name="Result" type="xsd:int"/>""", input="Data",
+    output="Result", operation_name="f")
+
+reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <Result xmlns="my-xsd-namespace">42</Result>
+  </env:Body>
+</env:Envelope>""")
+
+
+class RecordingSink(Sink):
+    def __init__(self):
+        self.measurements = []
+
+    def record(self, measurement):
+        self.measurements.append(measurement)
+
+
+def test_histogram():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 10, 50, 500, 1000):
+        histogram.observe(value)
+    assert histogram.buckets == [2, 2, 1, 2]
+    assert histogram.count == 7
+    assert histogram.sum == 1566.5
+    assert histogram.cumulative() == [(1, 2), (10, 4), (100, 5),
+        (float("inf"), 7)]
+
+
+def test_measured_invocation():
+    sink = RecordingSink()
+    transport = testutils.MockTransport(send_data=reply)
+    client = testutils.client_from_wsdl(wsdl, transport=transport,
+        metrics=[sink])
+    assert client.service.f("x") == 42
+    assert len(sink.measurements) == 1
+    measurement = sink.measurements[0]
+    assert measurement.operation == "f"
+    assert measurement.endpoint == "protocol://unga-bunga-location"
+    assert set(measurement.phases) == set(("arguments", "marshal",
+        "serialize", "network", "parse", "faults", "unmarshal"))
+    for phase, elapsed in measurement.phases.items():
+        assert phase in PHASES
+        assert elapsed >= 0
+    assert measurement.request_bytes == len(
+        transport.mock_requests[0].message)
+    assert measurement.reply_bytes == len(reply)
+
+
+def test_measured_plugins():
+    class MyPlugin(suds.plugin.MessagePlugin):
+        def received(self, context):
+            pass
+
+    sink = RecordingSink()
+    client = testutils.client_from_wsdl(wsdl,
+        transport=testutils.MockTransport(send_data=reply), metrics=[sink],
+        plugins=[MyPlugin()])
+    client.service.f("x")
+    assert "plugins" in sink.measurements[0].phases
+
+
+def test_measured_nosend_invocation():
+    sink = RecordingSink()
+    client = testutils.client_from_wsdl(wsdl, nosend=True, metrics=[sink])
+    request = client.service.f("x")
+    assert len(sink.measurements) == 1
+    assert "network" not in sink.measurements[0].phases
+    assert sink.measurements[0].request_bytes is None
+    assert request.process_reply(reply) == 42
+    assert len(sink.measurements) == 2
+    measurement = sink.measurements[1]
+    assert set(measurement.phases) == set(("parse", "faults", "unmarshal"))
+    assert measurement.reply_bytes == len(reply)
+
+
+def test_measured_fault():
+    fault = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <env:Fault>
+      <faultcode>env:Server</faultcode>
+      <faultstring>failed</faultstring>
+    </env:Fault>
+  </env:Body>
+</env:Envelope>""")
+    sink = RecordingSink()
+    client = testutils.client_from_wsdl(wsdl, metrics=[sink])
+    pytest.raises(suds.WebFault, client.service.f, __inject=dict(
+        reply=fault, status=http.client.INTERNAL_SERVER_ERROR))
+    assert len(sink.measurements) == 1
+    assert "faults" in sink.measurements[0].phases
+    assert "unmarshal" not in sink.measurements[0].phases
+
+
+def test_unmeasured_invocation(monkeypatch):
+    def fail(*args, **kwargs):
+        pytest.fail("unexpected measurement")
+    monkeypatch.setattr(suds.metrics, "Measurement", fail)
+    client = testutils.client_from_wsdl(wsdl,
+        transport=testutils.MockTransport(send_data=reply))
+    assert client.service.f("x") == 42
+
+
+def test_aggregator():
+    aggregator = Aggregator(duration_bounds=(0.001, 0.01),
+        size_bounds=(100,))
+    for elapsed in (500000, 5000000):
+        measurement = Measurement("f", "http://x")
+        measurement.phases["network"] = elapsed
+        measurement.request_bytes = 50
+        aggregator.record(measurement)
+    measurement = Measurement("g", "http://x")
+    measurement.phases["parse"] = 20000000
+    aggregator.record(measurement)
+    histogram = aggregator.get("f", "http://x", "network")
+    assert histogram.buckets == [1, 1, 0]
+    assert histogram.sum == pytest.approx(0.0055)
+    assert aggregator.get("f", "http://x", "request_bytes").count == 2
+    assert aggregator.get("f", "http://x", "reply_bytes") is None
+    assert [key for key, histogram in aggregator.items()] == [
+        ("f", "http://x", "network"), ("f", "http://x", "request_bytes"),
+        ("g", "http://x", "parse")]
+    aggregator.reset()
+    assert aggregator.items() == []
+
+
+def test_aggregating_client_metrics():
+    aggregator = Aggregator()
+    client = testutils.client_from_wsdl(wsdl,
+        transport=testutils.MockTransport(send_data=[reply] * 3),
+        metrics=[aggregator])
+    for i in range(3):
+        client.service.f("x")
+    for phase in ("arguments", "marshal", "network", "unmarshal"):
+        histogram = aggregator.get("f", "protocol://unga-bunga-location",
+            phase)
+        assert histogram.count == 3
+
+
+def test_prometheus():
+    aggregator = Aggregator(duration_bounds=(0.001, 0.01),
+        size_bounds=(100,))
+    measurement = Measurement("f", 'http://x/"a"\\b')
+    measurement.phases["network"] = 5000000
+    measurement.reply_bytes = 150
+    aggregator.record(measurement)
+    assert prometheus(aggregator, prefix="my") == """\
+# HELP my_phase_seconds Web service operation invocation phase durations.
+# TYPE my_phase_seconds histogram
+my_phase_seconds_bucket{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+phase="network",le="0.001"} 0
+my_phase_seconds_bucket{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+phase="network",le="0.01"} 1
+my_phase_seconds_bucket{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+phase="network",le="+Inf"} 1
+my_phase_seconds_sum{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+phase="network"} 0.005
+my_phase_seconds_count{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+phase="network"} 1
+# HELP my_message_bytes Web service operation request & reply sizes.
+# TYPE my_message_bytes histogram
+my_message_bytes_bucket{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+direction="reply",le="100"} 0
+my_message_bytes_bucket{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+direction="reply",le="+Inf"} 1
+my_message_bytes_sum{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+direction="reply"} 150
+my_message_bytes_count{operation="f",endpoint="http://x/\\"a\\"\\\\b",\
+direction="reply"} 1
+"""
+    assert prometheus(Aggregator()) == ""
+
+
+def test_profiled_invocation():
+    profiles = []
+    transport = testutils.MockTransport(send_data=[reply] * 2)
+    client = testutils.client_from_wsdl(wsdl, transport=transport)
+    assert client.service.f("x", __profile=profiles.append) == 42
+    assert len(profiles) == 1
+    profile = profiles[0]
+    assert profile.error is None
+    measurement = profile.measurement
+    assert measurement.operation == "f"
+    assert set(measurement.phases) == set(("arguments", "marshal",
+        "serialize", "network", "parse", "faults", "unmarshal"))
+    assert measurement.request_bytes == len(
+        transport.mock_requests[0].message)
+    assert measurement.reply_bytes == len(reply)
+    top = profile.top(5)
+    assert 0 < len(top) <= 5
+    functions = [function for function, calls, total, cumulative in
+        profile.top(1000)]
+    assert any(f.endswith("(get_reply)") for f in functions)
+    assert top == sorted(top, key=lambda x: -x[3])
+    assert str(profile).startswith("profiled 'f'")
+    assert top[0][0] in str(profile)
+
+    # Not profiled unless requested.
+    client.service.f("x")
+    assert len(profiles) == 1
+
+
+def test_profiled_invocations_option(caplog):
+    sink = RecordingSink()
+    client = testutils.client_from_wsdl(wsdl,
+        transport=testutils.MockTransport(send_data=[reply] * 2),
+        profile=True, metrics=[sink])
+    with caplog.at_level(logging.INFO, logger="suds.metrics"):
+        client.service.f("x")
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage().startswith("profiled 'f'")
+        client.service.f("x", __profile=False)
+        assert len(caplog.records) == 1
+    assert len(sink.measurements) == 2
+
+
+def test_profiled_fault():
+    fault = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <env:Fault>
+      <faultcode>env:Server</faultcode>
+      <faultstring>failed</faultstring>
+    </env:Fault>
+  </env:Body>
+</env:Envelope>""")
+    profiles = []
+    client = testutils.client_from_wsdl(wsdl, profile=profiles.append)
+    e = pytest.raises(suds.WebFault, client.service.f, __inject=dict(
+        reply=fault, status=http.client.INTERNAL_SERVER_ERROR)).value
+    try:
+        assert len(profiles) == 1
+        assert profiles[0].error is e
+        assert "faults" in profiles[0].measurement.phases
+    finally:
+        del e
+
+
+def test_profile_callback_error_not_masking_invocation_error(caplog):
+    fault = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <env:Fault>
+      <faultcode>env:Server</faultcode>
+      <faultstring>failed</faultstring>
+    </env:Fault>
+  </env:Body>
+</env:Envelope>""")
+
+    def callback(profile):
+        raise ValueError("callback failed")
+
+    client = testutils.client_from_wsdl(wsdl, profile=callback)
+    with caplog.at_level(logging.ERROR, logger="suds.metrics"):
+        pytest.raises(suds.WebFault, client.service.f, __inject=dict(
+            reply=fault, status=http.client.INTERNAL_SERVER_ERROR))
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().startswith(
+        "profile callback failed")
@@ -109,6 +109,39 @@ def test_collecting_plugins_per_domain(domain, plugin_class):
     assert result == expected_plugins
 
 
+def test_compiling_overridden_hooks_only():
+    class SendingPlugin(MessagePlugin):
+        def sending(self, context):
+            context.envelope += b"!"
+
+    plugins = [MessagePlugin(), SendingPlugin(), MyMessagePlugin(),
+        SendingPlugin()]
+    container = PluginContainer(plugins)
+    message = container.message
+    for hook in ("marshalled", "received", "parsed", "unmarshalled"):
+        method = getattr(message, hook)
+        assert not method
+        assert method.methods == []
+        assert method(reply=1).reply == 1
+    assert message.sending
+    assert message.sending.methods == [plugins[1].sending,
+        plugins[3].sending]
+    assert message.sending(envelope=b"x").envelope == b"x!!"
+    assert not container.document.loaded
+    assert not container.init.initialized
+
+
+def test_compiled_container_reuse():
+    plugins = [MyMessagePlugin(), MyDocumentPlugin()]
+    container = PluginContainer.compiled(plugins)
+    assert PluginContainer.compiled(list(plugins)) is container
+    assert container.plugins == plugins
+    plugins.append(MyInitPlugin())
+    container2 = PluginContainer.compiled(plugins)
+    assert container2 is not container
+    assert container2.init.plugins == plugins[2:]
+
+
 def test_exception_passing():
     class FailingPluginException(Exception):
         pass
@@ -27,10 +27,86 @@ if __name__ == "__main__":
     testutils.run_using_pytest(globals())
 
 import suds
+import suds.cache
 import suds.options
 import suds.reader
 
 
+class MockCache(suds.cache.Cache):
+    """Dictionary based cache reporting all of its entries as expiring."""
+
+    def __init__(self):
+        self.data = {}
+
+    def expiring(self, id):
+        return True
+
+    def get(self, id):
+        return self.data.get(id)
+
+    def put(self, id, object):
+        self.data[id] = object
+        return object
+
+
+class MockDefinitions:
+    """Dummy WSDL Definitions used with suds.reader.DefinitionsReader."""
+
+    def __init__(self, url, options):
+        self.url = url
+        self.options = options
+        self.imports = []
+
+
+class TestDefinitionsReaderRefresh:
+    """Tests refreshing expiring suds.reader.DefinitionsReader cache entries."""
+
+    def test_stale_definitions_returned_and_refreshed(self, monkeypatch):
+        threads = []
+        class SyncThread:
+            def __init__(self, target, name):
+                self.target = target
+                threads.append(self)
+            def start(self):
+                self.target()
+        monkeypatch.setattr(suds.reader, "Thread", SyncThread)
+        cache = MockCache()
+        options = suds.options.Options(cache=cache, cachingpolicy=1)
+        reader = suds.reader.DefinitionsReader(options, MockDefinitions)
+        id = reader.mangle("x://wsdl", "wsdl")
+        stale = MockDefinitions("x://wsdl", None)
+        cache.put(id, stale)
+        wsdl = reader.open("x://wsdl")
+        assert wsdl is stale
+        assert wsdl.options is options
+        assert len(threads) == 1
+        refreshed = cache.get(id)
+        assert refreshed is not stale
+        assert refreshed.__class__ is MockDefinitions
+        assert refreshed.url == "x://wsdl"
+
+    def test_single_refresh_per_entry(self, monkeypatch):
+        started = []
+        class IdleThread:
+            def __init__(self, target, name):
+                self.target = target
+            def start(self):
+                started.append(self)
+        monkeypatch.setattr(suds.reader, "Thread", IdleThread)
+        cache = MockCache()
+        options = suds.options.Options(cache=cache, cachingpolicy=1)
+        reader = suds.reader.DefinitionsReader(options, MockDefinitions)
+        id = reader.mangle("x://wsdl", "wsdl")
+        cache.put(id, MockDefinitions("x://wsdl", None))
+        reader.open("x://wsdl")
+        reader.open("x://wsdl")
+        assert len(started) == 1
+        started[0].target()
+        reader.open("x://wsdl")
+        assert len(started) == 2
+        started[1].target()
+
+
 class TestCacheItemNameMangling:
     """Tests suds.reader.Reader classes' cache item name mangling."""
 
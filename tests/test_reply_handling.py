@@ -27,9 +27,11 @@ if __name__ == "__main__":
     testutils.run_using_pytest(globals())
 
 import suds
+import suds.umx.core
 
 import pytest
 
+import datetime
 import http.client
 import xml.sax
 
@@ -373,6 +375,382 @@ def test_reply_error_without_detail_without_fault():
     assert fault == "kung-fu-fui"
 
 
+def test_reply_model_columns():
+    wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Row">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:long"/>
+          <xsd:element name="ratio" type="xsd:double"/>
+          <xsd:element name="ok" type="xsd:boolean"/>
+          <xsd:element name="when" type="xsd:date"/>
+          <xsd:element name="note" type="xsd:string" minOccurs="0"/>
+        </xsd:sequence>
+        <xsd:attribute name="class" type="xsd:int"/>
+      </xsd:complexType>
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="row" type="my_xsd:Row" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+      <row class="7"><id>1</id><ratio>0.5</ratio><ok>true</ok>
+        <when>2020-02-03</when><note>x</note></row>
+      <row><id>2</id><ratio>1.5</ratio><ok>false</ok>
+        <when>2021-12-31</when></row>
+    </Wrapper>
+  </Body>
+</Envelope>""")
+    client = testutils.client_from_wsdl(wsdl)
+    rows = client.service.f(__inject=dict(reply=reply))
+
+    client = testutils.client_from_wsdl(wsdl, reply_model="columns")
+    columns = client.service.f(__inject=dict(reply=reply))
+    assert list(columns) == ["id", "ratio", "ok", "when", "note", "_cls"]
+    for key in ("id", "ratio", "ok", "when", "note"):
+        assert list(columns[key]) == [getattr(r, key, None) for r in rows]
+    assert list(columns["_cls"]) == [7, None]
+    assert not isinstance(columns["id"], list)
+    assert not isinstance(columns["ratio"], list)
+    assert columns["when"] == [datetime.date(2020, 2, 3),
+        datetime.date(2021, 12, 31)]
+    assert columns["note"] == ["x", None]
+
+
+def test_reply_model_columns_not_flat():
+    wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Row">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:int" maxOccurs="unbounded"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="row" type="my_xsd:Row" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    client = testutils.client_from_wsdl(wsdl, reply_model="columns")
+    rows = client.service.f(__inject=dict(reply=suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+      <row><id>1</id><id>2</id></row>
+    </Wrapper>
+  </Body>
+</Envelope>""")))
+    assert len(rows) == 1
+    assert rows[0].id == [1, 2]
+
+
+def test_reply_model_dict():
+    wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Item">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:int"/>
+          <xsd:element name="when" type="xsd:date" nillable="true"/>
+          <xsd:element name="price">
+            <xsd:complexType>
+              <xsd:simpleContent>
+                <xsd:extension base="xsd:decimal">
+                  <xsd:attribute name="currency" type="xsd:string"/>
+                </xsd:extension>
+              </xsd:simpleContent>
+            </xsd:complexType>
+          </xsd:element>
+          <xsd:element name="tag" type="xsd:string" maxOccurs="unbounded"/>
+        </xsd:sequence>
+        <xsd:attribute name="class" type="xsd:string"/>
+      </xsd:complexType>
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="item" type="my_xsd:Item" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+      <item class="A">
+        <id>1</id>
+        <when>2020-02-03</when>
+        <price currency="EUR">1.5</price>
+        <tag>x</tag>
+        <tag>y</tag>
+      </item>
+      <item>
+        <id>2</id>
+        <when xsi:nil="true"/>
+        <price>2</price>
+        <tag>z</tag>
+      </item>
+    </Wrapper>
+  </Body>
+</Envelope>""")
+    client = testutils.client_from_wsdl(wsdl)
+    expected = [suds.sudsobject.recursive_asdict(x) for x in
+        client.service.f(__inject=dict(reply=reply))]
+
+    client = testutils.client_from_wsdl(wsdl, reply_model="dict")
+    response = client.service.f(__inject=dict(reply=reply))
+    assert response.__class__ is list
+    assert response == expected
+    first, second = response
+    assert first.__class__ is dict
+    assert list(first) == ["_cls", "id", "when", "price", "tag"]
+    assert first["id"] == 1
+    assert first["when"] == datetime.date(2020, 2, 3)
+    assert first["price"] == {"value": "1.5", "_currency": "EUR"}
+    assert first["tag"] == ["x", "y"]
+    assert second["when"] is None
+    assert second["price"] == "2"
+    assert second["tag"] == ["z"]
+
+
+def test_reply_model_dict_composite():
+    wsdl = testutils.wsdl("""\
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result1" type="xsd:string"/>
+            <xsd:element name="result2" type="xsd:int"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper")
+    client = testutils.client_from_wsdl(wsdl, reply_model="dict")
+    response = client.service.f(__inject=dict(reply=suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+        <result1>Uno</result1>
+        <result2>2</result2>
+    </Wrapper>
+  </Body>
+</Envelope>""")))
+    assert response == {"result1": "Uno", "result2": 2}
+
+
+def test_reply_model_unknown():
+    e = pytest.raises(ValueError, testutils.client_from_wsdl,
+        _wsdl__simple_f, reply_model="tuple").value
+    assert "'tuple'" in str(e)
+    client = testutils.client_from_wsdl(_wsdl__simple_f, reply_model="dict")
+    pytest.raises(ValueError, client.set_options, reply_model="dicts")
+    assert client.options.reply_model == "dict"
+
+
+def test_reply_projection():
+    wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Item">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:int"/>
+          <xsd:element name="price" type="xsd:double"/>
+          <xsd:element name="count" type="xsd:int"/>
+          <xsd:element name="detail">
+            <xsd:complexType>
+              <xsd:sequence>
+                <xsd:element name="a" type="xsd:int"/>
+                <xsd:element name="b" type="xsd:int"/>
+              </xsd:sequence>
+            </xsd:complexType>
+          </xsd:element>
+        </xsd:sequence>
+        <xsd:attribute name="code" type="xsd:int"/>
+      </xsd:complexType>
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="items" type="my_xsd:Item" maxOccurs="unbounded"/>
+            <xsd:element name="total" type="xsd:int"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    # Skipped content containing invalid values must not get translated.
+    reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+      <items code="x"><id>1</id><price>0.5</price><count>?</count>
+        <detail><a>1</a><b>?</b></detail></items>
+      <items code="y"><id>2</id><price>1.5</price><count>?</count>
+        <detail><a>2</a><b>?</b></detail></items>
+      <total>?</total>
+    </Wrapper>
+  </Body>
+</Envelope>""")
+    client = testutils.client_from_wsdl(wsdl)
+    pytest.raises(ValueError, client.service.f, __inject=dict(reply=reply))
+
+    result = client.service.f(__inject=dict(reply=reply),
+        __fields=["items.id", "items.price", "items.detail.a"])
+    assert result.__keylist__ == ["items"]
+    assert [i.__keylist__ for i in result.items] == [["id", "price",
+        "detail"]] * 2
+    assert [i.id for i in result.items] == [1, 2]
+    assert [i.price for i in result.items] == [0.5, 1.5]
+    assert [i.detail.a for i in result.items] == [1, 2]
+    assert result.items[0].detail.__keylist__ == ["a"]
+
+    client = testutils.client_from_wsdl(wsdl, projections=dict(f=["items.id",
+        "items.price", "items.detail"]))
+    pytest.raises(ValueError, client.service.f, __inject=dict(reply=reply))
+    result = client.service.f(__inject=dict(reply=reply),
+        __fields=["items.id"])
+    assert [i.__keylist__ for i in result.items] == [["id"]] * 2
+
+    reply = reply.replace(suds.byte_str('code="x"'), suds.byte_str(
+        'code="7"')).replace(suds.byte_str('code="y"'), suds.byte_str(
+        'code="8"')).replace(suds.byte_str("<b>?</b>"), suds.byte_str(
+        "<b>0</b>"))
+    result = client.service.f(__inject=dict(reply=reply),
+        __fields=["items._code", "items.detail"])
+    assert [i.__keylist__ for i in result.items] == [["_code", "detail"]] * 2
+    assert [i._code for i in result.items] == [7, 8]
+    assert result.items[1].detail.b == 0
+
+
+def test_reply_projection_columns():
+    wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Row">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:long"/>
+          <xsd:element name="ratio" type="xsd:double"/>
+        </xsd:sequence>
+        <xsd:attribute name="code" type="xsd:int"/>
+      </xsd:complexType>
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="row" type="my_xsd:Row" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+      <row code="?"><id>1</id><ratio>?</ratio></row>
+      <row><id>2</id><ratio>?</ratio></row>
+    </Wrapper>
+  </Body>
+</Envelope>""")
+    client = testutils.client_from_wsdl(wsdl, reply_model="columns")
+    columns = client.service.f(__inject=dict(reply=reply), __fields=["id"])
+    assert list(columns) == ["id"]
+    assert list(columns["id"]) == [1, 2]
+
+
+@pytest.mark.parametrize(("paths", "expected"), (
+    (None, None),
+    ([], {}),
+    ("a", {"a": None}),
+    (["a.b", "a.c", "d"], {"a": {"b": None, "c": None}, "d": None}),
+    (["a.b", "a"], {"a": None}),
+    (["a", "a.b"], {"a": None})))
+def test_reply_projection_tree(paths, expected):
+    assert suds.umx.core.projection(paths) == expected
+
+
+def test_reply_model_lazy():
+    wsdl = testutils.wsdl("""\
+      <xsd:complexType name="Item">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:int"/>
+          <xsd:element name="detail">
+            <xsd:complexType>
+              <xsd:sequence>
+                <xsd:element name="a" type="xsd:int"/>
+                <xsd:element name="b" type="xsd:int" maxOccurs="unbounded"/>
+              </xsd:sequence>
+            </xsd:complexType>
+          </xsd:element>
+        </xsd:sequence>
+        <xsd:attribute name="code" type="xsd:int"/>
+      </xsd:complexType>
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="item" type="my_xsd:Item" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace">
+      <item code="1"><id>1</id><detail><a>1</a><b>2</b></detail></item>
+      <item code="2"><id>2</id><detail><a>2</a><b>3</b><b>4</b></detail></item>
+    </Wrapper>
+  </Body>
+</Envelope>""")
+    expected = testutils.client_from_wsdl(wsdl).service.f(
+        __inject=dict(reply=reply))
+    client = testutils.client_from_wsdl(wsdl, reply_model="lazy")
+    items = client.service.f(__inject=dict(reply=reply))
+    assert [i.__class__.__name__ for i in items] == ["Item", "Item"]
+    assert isinstance(items[0], suds.sudsobject.Object)
+    item = items[1]
+    assert item.__keylist__ == ["_code", "id", "detail"]
+    assert len(item) == 3
+    assert "detail" in item
+    assert "detail" not in item.__dict__
+    assert item.detail.b == [3, 4]
+    assert item.detail is item.detail
+    assert "detail" in item.__dict__
+    assert "id" not in item.__dict__
+    assert "detail" not in items[0].__dict__
+    assert client.dict(items[0]).keys() == client.dict(expected[0]).keys()
+    assert "b" in items[0].__dict__["detail"].__dict__
+    assert str(items) == str(expected)
+    item.id = 7
+    assert item.id == 7
+    del item.detail
+    assert item.__keylist__ == ["_code", "id"]
+
+
+def test_reply_model_lazy_skips_untouched_content():
+    wsdl = testutils.wsdl("""\
+      <xsd:element name="Wrapper">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="a" type="xsd:int"/>
+            <xsd:element name="b" type="xsd:int"/>
+          </xsd:sequence>
+          <xsd:attribute name="c" type="xsd:int"/>
+        </xsd:complexType>
+      </xsd:element>""", output="Wrapper", xsd_target_namespace="my-namespace")
+    reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/">
+  <Body>
+    <Wrapper xmlns="my-namespace" c="3"><a>1</a><b>?</b></Wrapper>
+  </Body>
+</Envelope>""")
+    client = testutils.client_from_wsdl(wsdl, reply_model="lazy",
+        unwrap=False)
+    response = client.service.f(__inject=dict(reply=reply))
+    assert response._c == 3
+    assert response.a == 1
+    pytest.raises(ValueError, getattr, response, "b")
+    pytest.raises(ValueError, str, response)
+    pytest.raises(AttributeError, getattr, response, "d")
+
+
 def test_simple_bare_and_wrapped_output():
     # Prepare web service proxies.
     client_bare = testutils.client_from_wsdl(testutils.wsdl("""\
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the (LGPL) GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Library Lesser General Public License
+# for more details at ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Suds Python library tracing span hook unit tests.
+
+Implemented using the 'pytest' testing framework.
+
+"""
+
+import testutils
+if __name__ == "__main__":
+    testutils.run_using_pytest(globals())
+
+import suds
+import suds.client
+import suds.plugin
+import suds.tracing
+from suds.tracing import MemoryTracer, Tracer
+
+import pytest
+
+import http.client
+
+
+wsdl = testutils.wsdl("""\
+      <xsd:element name="Data" type="xsd:string"/>
+      <xsd:element name="Result" type="xsd:int"/>""", input="Data",
+    output="Result", operation_name="f")
+
+reply = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <Result xmlns="my-xsd-namespace">42</Result>
+  </env:Body>
+</env:Envelope>""")
+
+
+class MyPlugin(suds.plugin.MessagePlugin):
+    def sending(self, context):
+        pass
+
+    def parsed(self, context):
+        pass
+
+
+def test_invocation_spans():
+    client = testutils.client_from_wsdl(wsdl,
+        transport=testutils.MockTransport(send_data=reply),
+        plugins=[MyPlugin()])
+    tracer = MemoryTracer()
+    client.set_options(tracer=tracer)
+    assert client.service.f("x") == 42
+    assert len(tracer.spans) == 1
+    span = tracer.spans[0]
+    assert span.tree() == ("suds.invoke", [
+        ("suds.get_message", []),
+        ("suds.plugin.sending", []),
+        ("suds.transport.send", []),
+        ("suds.parse", []),
+        ("suds.plugin.parsed", []),
+        ("suds.get_reply", [])])
+    assert span.attributes == {"operation": "f",
+        "endpoint": "protocol://unga-bunga-location"}
+    assert span.error is None
+    assert span.parent is None
+    assert span.children[0].parent is span
+    for s in [span] + span.children:
+        assert s.duration() >= 0
+    assert sum(s.duration() for s in span.children) <= span.duration()
+
+
+def test_failed_invocation_span():
+    fault = suds.byte_str("""\
+<?xml version="1.0"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <env:Fault>
+      <faultcode>env:Server</faultcode>
+      <faultstring>failed</faultstring>
+    </env:Fault>
+  </env:Body>
+</env:Envelope>""")
+    tracer = MemoryTracer()
+    client = testutils.client_from_wsdl(wsdl, tracer=tracer)
+    tracer.reset()
+    e = pytest.raises(suds.WebFault, client.service.f, __inject=dict(
+        reply=fault, status=http.client.INTERNAL_SERVER_ERROR)).value
+    try:
+        span = tracer.spans[0]
+        assert span.name == "suds.invoke"
+        assert span.error is e
+        assert [s.name for s in span.children] == ["suds.get_message",
+            "suds.parse"]
+        assert span.children[1].error is None
+    finally:
+        del e
+
+
+def test_nosend_reply_span():
+    tracer = MemoryTracer()
+    client = testutils.client_from_wsdl(wsdl, nosend=True, tracer=tracer)
+    tracer.reset()
+    request = client.service.f("x")
+    assert request.process_reply(reply) == 42
+    assert [s.tree() for s in tracer.spans] == [
+        ("suds.invoke", [("suds.get_message", [])]),
+        ("suds.process_reply", [("suds.parse", []), ("suds.get_reply", [])])]
+
+
+def test_wsdl_loading_spans():
+    tracer = MemoryTracer()
+    testutils.client_from_wsdl(wsdl, tracer=tracer)
+    names = [s.name for s in tracer.spans]
+    assert names == ["suds.document.open", "suds.wsdl.imports",
+        "suds.wsdl.resolve", "suds.wsdl.build_schema", "suds.wsdl.set_wrapped",
+        "suds.wsdl.add_methods"]
+    for span in tracer.spans:
+        assert span.attributes == {"url": "suds://whatchamacallit"}
+        assert span.duration() >= 0
+    assert tracer.spans[0].tree()[1] == [("suds.document.fetch", []),
+        ("suds.document.parse", [])]
+    names = [s.name for s in tracer.spans[3].children]
+    assert names[:3] == ["suds.schema.build", "suds.schema.imports",
+        "suds.schema.dereference"]
+    assert set(names[3:]) == set(["suds.schema.merge"])
+    dereference = tracer.spans[3].children[2]
+    assert [(s.name, s.attributes) for s in dereference.children] == [
+        ("suds.schema.type", {"type": "Element {my-xsd-namespace}Data"}),
+        ("suds.schema.type", {"type": "Element {my-xsd-namespace}Result"}),
+        ("suds.schema.dependency_sort", {})]
+    resolved = [s.attributes["object"] for s in tracer.spans[2].children]
+    assert "Binding dummy" in resolved
+
+
+def test_custom_tracer():
+    class MyTracer(Tracer):
+        def __init__(self):
+            self.events = []
+
+        def start(self, name, attributes):
+            self.events.append(("start", name))
+            return name
+
+        def end(self, span, error):
+            self.events.append(("end", span))
+
+    tracer = MyTracer()
+    client = testutils.client_from_wsdl(wsdl, nosend=True)
+    client.set_options(tracer=tracer)
+    client.service.f("x")
+    assert tracer.events == [("start", "suds.invoke"),
+        ("start", "suds.get_message"), ("end", "suds.get_message"),
+        ("end", "suds.invoke")]
+
+
+def test_no_tracer():
+    assert suds.tracing.span(None, "a") is suds.tracing.span(None, "b", {})
+    assert suds.tracing.loading(None, "a", "x") is suds.tracing.span(None,
+        "b")
+    with suds.tracing.span(None, "a") as span:
+        assert span is None
@@ -3,8 +3,8 @@ if __name__ == "__main__":
     import testutils
     testutils.run_using_pytest(globals())
 
-from suds.sudsobject import Object
-from suds.sudsobject import asdict, recursive_asdict
+from suds.sudsobject import Factory, Object
+from suds.sudsobject import asdict, metadata, recursive_asdict
 
 
 # test_suds_functions.py
@@ -70,3 +70,85 @@ def test_recursive_asdict():
     }
     assert result == expected
 
+
+def test_object_keys():
+    sobject = Object()
+    sobject.b = 1
+    sobject.a = 2
+    sobject.c = 3
+    sobject.b = 4
+    assert sobject.__keylist__ == ["b", "a", "c"]
+    assert list(sobject) == [("b", 4), ("a", 2), ("c", 3)]
+    assert len(sobject) == 3
+    assert "a" in sobject
+    assert "__metadata__" not in sobject
+    assert sobject[1] == 2
+    del sobject.a
+    assert sobject.__keylist__ == ["b", "c"]
+    assert "a" not in sobject
+    with pytest.raises(AttributeError):
+        del sobject.a
+    with pytest.raises(AttributeError):
+        sobject.a
+
+
+def test_object_keys_cached():
+    sobject = Object()
+    sobject.a = 1
+    sobject.b = 2
+    keylist = sobject.__keylist__
+    assert sobject.__keylist__ is keylist
+    assert len(sobject) == 2
+    sobject.a = 3
+    assert sobject.__keylist__ is keylist
+    sobject.c = 4
+    assert sobject.__keylist__ == ["a", "b", "c"]
+    assert len(sobject) == 3
+    del sobject.a
+    sobject.d = 5
+    assert sobject.__keylist__ == ["b", "c", "d"]
+    sobject.__metadata__.ordering = ["d", "c", "b"]
+    assert len(sobject) == 3
+    assert list(sobject) == [("d", 5), ("c", 4), ("b", 2)]
+
+
+def test_object_metadata_constructed_on_first_use():
+    sobject = Factory.object("Person")
+    sobject.name = "Bob"
+    assert metadata(sobject) is None
+    str(sobject)
+    list(sobject)
+    assert metadata(sobject) is None
+    sobject.__metadata__.ordering = ["x", "name", "y"]
+    assert metadata(sobject) is sobject.__metadata__
+    assert len(sobject) == 1
+    assert sobject.__keylist__ == ["name"]
+
+
+def test_object_ordering():
+    sobject = Factory.object("Person")
+    sobject.b = 1
+    sobject.a = 2
+    sobject.__metadata__.ordering = ["a", "x", "b"]
+    assert list(sobject) == [("a", 2), ("b", 1)]
+    sobject.c = 3
+    assert list(sobject) == [("b", 1), ("a", 2), ("c", 3)]
+
+
+def test_object_printer():
+    sobject = Factory.object("Person")
+    sobject.name = "Bob"
+    sobject.age = 3
+    sobject.tags = ["a"]
+    sobject.child = Factory.object("Child")
+    sobject.child.x = None
+    assert sobject.__printer__ is Object().__printer__
+    assert str(sobject) == """\
+(Person){
+   name = "Bob"
+   age = 3
+   tags[] = \n      "a",
+   child = \n      (Child){
+         x = None
+      }
+ }"""
@@ -20,9 +20,12 @@ Package containing different utilities used for suds project testing.
 
 """
 
+import suds
 import suds.client
 import suds.store
+import suds.transport
 
+import http.client
 import os
 import subprocess
 import sys
@@ -65,17 +68,82 @@ def client_from_wsdl(wsdl_content, *args, **kwargs):
     return suds.client.Client("suds://" + test_file_id, *args, **kwargs)
 
 
-def run_test_process(script):
+class MockTransport(suds.transport.Transport):
+    """
+    Mock Transport used by different suds.client.Client related tests.
+
+    Allows the tests to check which transport operations got triggered and to
+    control what each of them returns.
+
+    open/send output data may be given either as a single value or a list of
+    values to be used in order. Specifying a single value is a shortcut with
+    the same semantics as specifying a single element list containing that
+    value. Each of the value items may be either a simple byte string to be
+    returned or an Exception subclass or instance indicating an exception to be
+    raised from a particular operation call.
+
+    """
+
+    def __init__(self, open_data=None, send_data=None):
+        if open_data is None:
+            open_data = []
+        elif open_data.__class__ is not list:
+            open_data = [open_data]
+        if send_data is None:
+            send_data = []
+        elif send_data.__class__ is not list:
+            send_data = [send_data]
+        self.mock_log = []
+        self.mock_requests = []
+        self.mock_open_data = open_data
+        self.mock_send_data = send_data
+        super(MockTransport, self).__init__()
+
+    def open(self, request):
+        self.mock_log.append(("open", [request.url]))
+        self.mock_requests.append(request)
+        if not self.mock_open_data:
+            import pytest
+            pytest.fail("Unexpected MockTransport.open() operation call.")
+        result = self.__next_operation_result(self.mock_open_data)
+        return suds.BytesIO(result)
+
+    def send(self, request):
+        self.mock_log.append(("send", [request.url, request.message]))
+        self.mock_requests.append(request)
+        if not self.mock_send_data:
+            import pytest
+            pytest.fail("Unexpected MockTransport.send() operation call.")
+        status = http.client.OK
+        headers = {}
+        data = self.__next_operation_result(self.mock_send_data)
+        return suds.transport.Reply(status, headers, data)
+
+    @staticmethod
+    def __next_operation_result(data_list):
+        value = data_list.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        if value.__class__ is type and issubclass(value, Exception):
+            raise value()
+        assert value.__class__ is bytes, "bad test data"
+        return value
+
+
+def run_test_process(script, env=None):
     """
     Runs the given Python test script as a separate process.
 
     Expects the script to return an exit code 0 and output nothing on either
-    stdout or stderr output streams.
+    stdout or stderr output streams. Any given environment variables are
+    added to the ones inherited from the current process.
 
     """
+    if env is not None:
+        env = dict(os.environ, **env)
     popen = subprocess.Popen([sys.executable], stdin=subprocess.PIPE,
         stderr=subprocess.PIPE, stdout=subprocess.PIPE, cwd=script.dirname,
-        universal_newlines=True)
+        universal_newlines=True, env=env)
     sys_path = sys.path
     for i in range(len(sys_path)):
         if not sys_path[i]: